@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Collision benchmark: brute-force checks vs the sweep-and-prune broadphase
+
+Fills a world with hundreds of entities and runs the per-frame collision
+pass both ways, reporting colliderect checks and time per frame.
+
+Usage: python benchmarks/bench_collisions.py [--enemies 200] [--coins 300]
+"""
+
+import os
+import sys
+import argparse
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+
+from game import (Simulation, Wall, Enemy, Coin, FireballCollectible,
+                  FireballProjectile, load_config)
+
+
+def build_world(args):
+    """Create a simulation crowded with entities across the screen"""
+    config = load_config(os.path.join(GAME_DIR, 'config.json'))
+    sim = Simulation(config)
+    sim.reset(0)
+    width, height = sim.screen_width, sim.screen_height
+    random.seed(args.seed)
+
+    for i in range(args.walls):
+        wall = Wall(i * width / args.walls, height, 250, config['wall_width'], 2, 95)
+        sim.walls.append(wall)
+    # Evenly spaced along x (as spawning produces), random heights
+    for i in range(args.enemies):
+        sim.enemies.append(Enemy(i * width / args.enemies, random.uniform(0, height), 40, 1.5, width))
+    for i in range(args.coins):
+        sim.coins.append(Coin(i * width / args.coins, random.uniform(0, height), 35, 2, width))
+    for i in range(args.collectibles):
+        sim.fireball_collectibles.append(
+            FireballCollectible(i * width / args.collectibles, random.uniform(0, height), 40, 2, width))
+    for _ in range(args.projectiles):
+        sim.fireball_projectiles.append(
+            FireballProjectile(random.uniform(0, width), random.uniform(0, height), 40, 8, width))
+    return sim
+
+
+def move_world(sim):
+    """Scroll every entity; ones leaving the left edge re-enter on the right
+
+    Re-entering entities go to the end of their list, the same order the
+    game produces by spawning at the right edge, and density stays constant.
+    """
+    width = sim.screen_width
+    for wall in sim.walls:
+        wall.update()
+    while sim.walls and sim.walls[0].is_off_screen():
+        wall = sim.walls.pop(0)
+        wall.x += width + wall.wall_width
+        wall.rect.x = wall.x
+        sim.walls.append(wall)
+    for group in (sim.enemies, sim.coins, sim.fireball_collectibles):
+        for entity in group:
+            entity.x -= entity.speed
+            entity.rect.center = (entity.x, entity.y)
+        while group and group[0].is_off_screen():
+            entity = group.pop(0)
+            entity.x += width + entity.size
+            entity.rect.center = (entity.x, entity.y)
+            group.append(entity)
+    for fireball in sim.fireball_projectiles:
+        fireball.x = (fireball.x + fireball.speed) % width
+        fireball.rect.center = (fireball.x, fireball.y)
+
+
+def brute_force_pass(sim):
+    """Collision pass as Game.update used to do it; returns checks made"""
+    bird_rect = sim.bird.rect
+    checks = 0
+    for wall in sim.walls:
+        top_rect, bottom_rect = wall.get_rects()
+        top_rect.colliderect(bird_rect)
+        bottom_rect.colliderect(bird_rect)
+        checks += 2
+    for group in (sim.enemies, sim.fireball_collectibles, sim.coins):
+        for entity in group:
+            bird_rect.colliderect(entity.rect)
+            checks += 1
+    for fireball in sim.fireball_projectiles:
+        for enemy in sim.enemies:
+            checks += 1
+            if fireball.rect.colliderect(enemy.rect):
+                break
+    return checks
+
+
+def broadphase_pass(sim):
+    """Collision pass through the simulation's broadphase; returns checks made"""
+    broadphase = sim.broadphase
+    before = broadphase.checks
+    bird_rect = sim.bird.rect
+    for kind in ('wall', 'enemy', 'fireball', 'coin'):
+        broadphase.query(bird_rect, kind)
+    for fireball in sim.fireball_projectiles:
+        broadphase.query(fireball.rect, 'enemy')
+    return broadphase.checks - before
+
+
+def measure(sim, collision_pass, frames):
+    """Run the collision pass for a number of frames"""
+    total_checks = 0
+    elapsed = 0.0
+    for _ in range(frames):
+        move_world(sim)
+        start = time.perf_counter()
+        total_checks += collision_pass(sim)
+        elapsed += time.perf_counter() - start
+    return total_checks / frames, elapsed / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark collision checks per frame")
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--walls', type=int, default=8)
+    parser.add_argument('--enemies', type=int, default=200)
+    parser.add_argument('--coins', type=int, default=300)
+    parser.add_argument('--collectibles', type=int, default=50)
+    parser.add_argument('--projectiles', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    entity_count = args.walls + args.enemies + args.coins + args.collectibles + args.projectiles
+    print(f"Entities: {entity_count} ({args.walls} walls, {args.enemies} enemies, {args.coins} coins, "
+          f"{args.collectibles} fireball pickups, {args.projectiles} projectiles)")
+
+    for name, collision_pass in (("Brute force", brute_force_pass), ("Broadphase", broadphase_pass)):
+        checks, ms = measure(build_world(args), collision_pass, args.frames)
+        print(f"{name:12} {checks:10.1f} checks/frame {ms:8.3f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
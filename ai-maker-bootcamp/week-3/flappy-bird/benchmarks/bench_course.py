@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Course generation benchmark: spawn spikes in the frame loop
+
+Plays seeded runs at real-time pace (the frame loop idles between steps
+like the game does) and records how long each Simulation.step() takes,
+once with the course generated in the frame loop (a chunk of frames at a
+time) and once on the worker thread the game uses. Reports step time
+percentiles; spawn work shows up in the tail.
+
+Usage: python benchmarks/bench_course.py [--frames 3000] [--runs 6] [--level 3] [--idle-ms 2]
+"""
+
+import os
+import sys
+import argparse
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+
+from game import make_simulation, load_config, percentile
+from headless import heuristic_agent
+
+
+def step_times(sim, level_index, frames, runs, idle):
+    """Step time of every frame (microseconds) over seeded runs"""
+    times = []
+    for seed in range(runs):
+        sim.reset(level_index, seed)
+        while sim.alive and sim.frame < frames:
+            flap, shoot = heuristic_agent(sim)
+            if shoot:
+                sim.shoot_fireball()
+            elif flap:
+                sim.flap()
+            start = time.perf_counter()
+            sim.step()
+            times.append((time.perf_counter() - start) * 1e6)
+            time.sleep(idle)  # Rest of the frame: drawing and waiting for the display
+    sim.close()
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark spawn spikes with and without the course thread")
+    parser.add_argument('--frames', type=int, default=3000, help="Frame limit per run")
+    parser.add_argument('--runs', type=int, default=6)
+    parser.add_argument('--level', type=int, default=3, help="Level number from config.json (1 = Easy)")
+    parser.add_argument('--idle-ms', type=float, default=2.0, help="Idle time between steps")
+    args = parser.parse_args()
+
+    config = load_config(os.path.join(GAME_DIR, 'config.json'))
+    print(f"{'Course':18} {'steps':>6} {'p50 us':>8} {'p99 us':>8} {'p99.9 us':>9} {'max us':>8}")
+    for name, background in (("In frame loop", False), ("Worker thread", True)):
+        sim = make_simulation(config, background_course=background)
+        times = step_times(sim, args.level - 1, args.frames, args.runs, args.idle_ms / 1000)
+        print(f"{name:18} {len(times):6} {percentile(times, 0.5):8.1f} {percentile(times, 0.99):8.1f} "
+              f"{percentile(times, 0.999):9.1f} {max(times):8.1f}")
+
+
+if __name__ == "__main__":
+    main()
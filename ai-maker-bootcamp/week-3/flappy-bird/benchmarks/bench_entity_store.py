@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Entity store benchmark: per-object updates vs the NumPy structure-of-arrays store
+
+Fills a level with hundreds of enemies and coins (away from the bird so
+the run doesn't end) and times Simulation.step() with each entity store,
+checking that both end in the same world state.
+
+Usage: python benchmarks/bench_entity_store.py [--counts 50 200 500 1000] [--frames 300]
+"""
+
+import os
+import sys
+import argparse
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+
+from game import Simulation, VectorizedSimulation, load_config, np
+
+
+def crowded_world(sim_class, count, seed):
+    """A run with count enemies and count coins spread over two screen widths"""
+    config = load_config(os.path.join(GAME_DIR, 'config.json'))
+    # Only the pre-placed entities: no timed spawns
+    config['levels'][0].update(enemy_spawn_rate=10 ** 9, coin_spawn_rate=10 ** 9,
+                               coin_cluster_spawn_rate=10 ** 9, fireball_collectible_spawn_rate=10 ** 9)
+    sim = sim_class(config)
+    sim.reset(0)
+
+    width, height = sim.screen_width, sim.screen_height
+    rng = random.Random(seed)
+    # Stay clear of the bird's height band; the bird hovers until its first flap
+    heights = lambda: rng.choice((rng.uniform(30, 200), rng.uniform(400, height - 30)))
+    for i in range(count):
+        sim.add_enemy(i * 2 * width / count, heights())
+        sim.add_coin(i * 2 * width / count, heights(), config.get('coin_size', 30))
+    return sim
+
+
+def measure(sim, frames):
+    """Time step() over a number of frames, without walls"""
+    elapsed = 0.0
+    for _ in range(frames):
+        sim.walls.clear()  # Walls would end the run; they cost the same in both stores
+        start = time.perf_counter()
+        sim.step()
+        elapsed += time.perf_counter() - start
+    return elapsed / frames * 1000
+
+
+def world_state(sim):
+    return (sim.alive, sim.score,
+            [(enemy.x, enemy.y) for enemy in sim.enemies],
+            [(coin.x, coin.y) for coin in sim.coins])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the entity stores")
+    parser.add_argument('--counts', type=int, nargs='+', default=[50, 200, 500, 1000],
+                        help="Enemies (and as many coins) per run")
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    if np is None:
+        print("NumPy is not installed; the numpy entity store is unavailable")
+        return
+
+    print(f"{'Entities':>8} {'Objects':>12} {'NumPy':>12} {'Speedup':>8}  Same state")
+    for count in args.counts:
+        objects = crowded_world(Simulation, count, args.seed)
+        vectorized = crowded_world(VectorizedSimulation, count, args.seed)
+        objects_ms = measure(objects, args.frames)
+        vectorized_ms = measure(vectorized, args.frames)
+        same = world_state(objects) == world_state(vectorized)
+        print(f"{count * 2:8} {objects_ms:9.3f} ms {vectorized_ms:9.3f} ms "
+              f"{objects_ms / vectorized_ms:7.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Environment throughput: steps per second for the RL environments
+
+Steps FlappyEnv and VectorFlappyEnv with random actions (biased towards
+not flapping so episodes last a while) and reports environment steps per
+second, including observation building and automatic resets.
+
+Usage: python benchmarks/bench_env.py [--steps 20000] [--num-envs 1 16 64] [--frame-skip 1]
+"""
+
+import os
+import sys
+import argparse
+import random
+import time
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+
+from env import FlappyEnv, VectorFlappyEnv, NOOP, FLAP, SHOOT, OBSERVATION_SIZE
+from game import np
+
+ACTIONS = [NOOP] * 8 + [FLAP, SHOOT]
+
+
+def measure_single(args, rng):
+    env = FlappyEnv(args.level, frame_skip=args.frame_skip)
+    env.reset(args.seed)
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        _, _, terminated, truncated, _ = env.step(rng.choice(ACTIONS))
+        if terminated or truncated:
+            env.reset()
+    return args.steps / (time.perf_counter() - start)
+
+
+def measure_vector(args, rng, num_envs):
+    env = VectorFlappyEnv(num_envs, args.level, frame_skip=args.frame_skip)
+    env.reset(args.seed)
+    batches = max(1, args.steps // num_envs)
+    start = time.perf_counter()
+    for _ in range(batches):
+        env.step([rng.choice(ACTIONS) for _ in range(num_envs)])
+    return batches * num_envs / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RL environment steps per second")
+    parser.add_argument('--steps', type=int, default=20000, help="Environment steps per measurement")
+    parser.add_argument('--num-envs', type=int, nargs='+', default=[1, 16, 64])
+    parser.add_argument('--level', type=int, default=1)
+    parser.add_argument('--frame-skip', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"Observation size {OBSERVATION_SIZE}, frame skip {args.frame_skip}")
+    print(f"{'FlappyEnv':22} {measure_single(args, rng):9.0f} steps/sec")
+    if np is None:
+        print("NumPy is not installed; VectorFlappyEnv is unavailable")
+        return
+    for num_envs in args.num_envs:
+        print(f"{f'VectorFlappyEnv x{num_envs}':22} {measure_vector(args, rng, num_envs):9.0f} steps/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Pipe drawing benchmark: direct pygame.draw calls vs the pipe sprite cache
+
+Draws a screen's worth of scrolling walls each frame both ways and
+reports milliseconds per frame.
+
+Usage: python benchmarks/bench_pipes.py [--frames 600] [--walls 3]
+"""
+
+import os
+import sys
+import argparse
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+
+import pygame
+from game import Wall, load_config
+
+
+def draw_direct(wall, screen):
+    """Draw both pipes with pygame.draw calls, as Wall.draw used to"""
+    wall._draw_pipe(screen, wall.x, 0, wall.top_height, True)
+    wall._draw_pipe(screen, wall.x, wall.bottom_y, wall.bottom_height, False)
+
+
+def draw_cached(wall, screen):
+    """Draw both pipes from the sprite cache"""
+    wall.draw(screen)
+
+
+def measure(screen, draw_wall, walls, frames):
+    """Scroll the walls across the screen, timing only the wall drawing"""
+    width = screen.get_width()
+    elapsed = 0.0
+    for _ in range(frames):
+        screen.fill((135, 206, 235))
+        start = time.perf_counter()
+        for wall in walls:
+            draw_wall(wall, screen)
+        elapsed += time.perf_counter() - start
+        for wall in walls:
+            wall.update()
+            if wall.is_off_screen():
+                wall.x += width + wall.wall_width
+    return elapsed / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipe drawing")
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--walls', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    config = load_config(os.path.join(GAME_DIR, 'config.json'))
+    screen = pygame.display.set_mode((config['screen_width'], config['screen_height']))
+    level = config['levels'][0]
+
+    results = {}
+    for name, draw_wall in (("Direct", draw_direct), ("Cached", draw_cached)):
+        random.seed(args.seed)
+        spacing = config['screen_width'] / args.walls
+        walls = [Wall(i * spacing, config['screen_height'], level['wall_gap_size'],
+                      config['wall_width'], level['wall_speed'], config['bird_size'] + 20)
+                 for i in range(args.walls)]
+        results[name] = measure(screen, draw_wall, walls, args.frames)
+        print(f"{name:8} {results[name]:8.3f} ms/frame")
+
+    cache = Wall.pipe_sprites
+    print(f"Speedup: {results['Direct'] / results['Cached']:.1f}x "
+          f"(cache hits {cache.hits}, misses {cache.misses})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Entity churn stress test: pooled vs freshly allocated entities
+
+Runs the headless simulation with every spawn rate multiplied (10x by
+default), restarting whenever the scripted player dies, once with the
+entity pools and once with pooling disabled. Reports time per frame
+and how many entities were constructed vs reused.
+
+Usage: python benchmarks/bench_pool.py [--scale 10] [--frames 20000] [--level 3]
+"""
+
+import os
+import sys
+import argparse
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+
+from game import Simulation, load_config, SPAWN_DEFAULTS
+from headless import heuristic_agent
+
+
+def build_sim(scale, pooled):
+    """Simulation with all spawn intervals divided by scale"""
+    config = load_config(os.path.join(GAME_DIR, 'config.json'))
+    for level in config['levels']:
+        level['enemy_spawn_rate'] = max(1, level['enemy_spawn_rate'] // scale)
+    spawning = dict(SPAWN_DEFAULTS, **config.get('spawning', {}))
+    config['spawning'] = dict(config.get('spawning', {}), **{
+        name: max(1, spawning[name] // scale)
+        for name in ('coin_spawn_rate', 'coin_cluster_spawn_rate', 'fireball_collectible_spawn_rate')})
+    sim = Simulation(config)
+    if not pooled:
+        for pool in pools(sim):
+            pool.capacity = 0
+    return sim
+
+
+def pools(sim):
+    return [sim.enemy_pool, sim.coin_pool, sim.fireball_collectible_pool, sim.fireball_projectile_pool]
+
+
+def run(sim, level_index, frames, seed):
+    """Step the world for a number of frames, restarting after each death"""
+    sim.reset(level_index, seed)
+    runs = 1
+    peak_entities = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        if not sim.alive:
+            sim.reset(level_index, seed + runs)
+            runs += 1
+        flap, shoot = heuristic_agent(sim)
+        # Keep fireballs flying so projectiles churn too
+        sim.fireball_ammo = max(sim.fireball_ammo, 1)
+        if shoot:
+            sim.shoot_fireball()
+        elif flap:
+            sim.flap()
+        sim.step()
+        live = (len(sim.enemies) + len(sim.coins) +
+                len(sim.fireball_collectibles) + len(sim.fireball_projectiles))
+        peak_entities = max(peak_entities, live)
+    elapsed = time.perf_counter() - start
+    return {
+        'ms_per_frame': elapsed / frames * 1000,
+        'runs': runs,
+        'peak_entities': peak_entities,
+        'created': sum(pool.created for pool in pools(sim)),
+        'reused': sum(pool.reused for pool in pools(sim)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress entity spawning and removal")
+    parser.add_argument('--scale', type=int, default=10, help="Spawn rate multiplier")
+    parser.add_argument('--frames', type=int, default=20000)
+    parser.add_argument('--level', type=int, default=3, help="Level number from config.json (1 = Easy)")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"Spawn rates x{args.scale}, {args.frames} frames on level {args.level}")
+    results = {}
+    for name, pooled in (("Unpooled", False), ("Pooled", True)):
+        sim = build_sim(args.scale, pooled)
+        result = run(sim, args.level - 1, args.frames, args.seed)
+        results[name] = result
+        print(f"{name:9} {result['ms_per_frame']:7.3f} ms/frame   "
+              f"constructed {result['created']:6}   reused {result['reused']:6}   "
+              f"peak live entities {result['peak_entities']}, runs {result['runs']}")
+
+    print(f"Speedup: {results['Unpooled']['ms_per_frame'] / results['Pooled']['ms_per_frame']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
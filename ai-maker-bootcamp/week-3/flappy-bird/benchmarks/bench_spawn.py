@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Spawn latency benchmark: per-entity image loading vs the shared sprite atlas
+
+Spawns enemies, coins and fireballs the way Game.attach_sprite does and
+reports how long giving each new entity its sprite takes, in microseconds.
+
+Usage: python benchmarks/bench_spawn.py [--spawns 2000]
+"""
+
+import os
+import sys
+import argparse
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+
+import pygame
+from game import Enemy, Coin, FireballCollectible, FireballProjectile, SpriteAtlas, load_config
+
+
+def spawn_kinds(config):
+    """(entity class, size, image path) for everything spawned mid-game"""
+    images = os.path.join(GAME_DIR, "asssets", "images")
+    fireball_size = config.get('fireball_size', 40)
+    return [
+        (Enemy, config['enemy_size'], os.path.join(images, "enemy.png")),
+        (Coin, config.get('coin_size', 30), os.path.join(images, "coin.png")),
+        (FireballCollectible, fireball_size, os.path.join(images, "fireball.png")),
+        (FireballProjectile, fireball_size, os.path.join(images, "fireball.png")),
+    ]
+
+
+def measure(kinds, spawns, attach, screen_width):
+    """Time attach() for each spawn, returns latencies in microseconds"""
+    latencies = []
+    for i in range(spawns):
+        kind, size, path = kinds[i % len(kinds)]
+        entity = kind(screen_width, 300, size, 2, screen_width)
+        start = time.perf_counter()
+        attach(entity, path)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    mean = sum(latencies) / len(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{name:8} mean {mean:8.1f} us   p99 {p99:8.1f} us   max {latencies[-1]:8.1f} us")
+    return mean
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sprite loading at spawn time")
+    parser.add_argument('--spawns', type=int, default=2000)
+    args = parser.parse_args()
+
+    config = load_config(os.path.join(GAME_DIR, 'config.json'))
+    pygame.display.set_mode((config['screen_width'], config['screen_height']))
+    kinds = spawn_kinds(config)
+
+    def load_each(entity, path):
+        entity.load_image(path)
+
+    atlas = SpriteAtlas()
+    before = report("Per-load", measure(kinds, args.spawns, load_each, config['screen_width']))
+    after = report("Atlas", measure(kinds, args.spawns, atlas.apply, config['screen_width']))
+    print(f"Speedup: {before / after:.0f}x (atlas decoded {atlas.loads} images)")
+
+
+if __name__ == "__main__":
+    main()
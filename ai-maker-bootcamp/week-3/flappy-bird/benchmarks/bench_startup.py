@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: time to first frame and resident memory
+
+Starts the game in fresh Python processes (SDL dummy video and audio
+drivers), draws the first frame and reports the median time from process
+launch to that frame, split into importing game.py, Game() and the first
+draw(), plus resident memory once the frame is up.
+
+Usage: python benchmarks/bench_startup.py [--runs 5]
+"""
+
+import os
+import sys
+import argparse
+import json
+import statistics
+import subprocess
+import time
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child process; CLOCK_MONOTONIC is shared with the parent
+CHILD = """
+import json, os, time
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+marks = {'start': time.monotonic()}
+import game
+marks['imported'] = time.monotonic()
+instance = game.Game()
+marks['constructed'] = time.monotonic()
+instance.draw()
+marks['first_frame'] = time.monotonic()
+rss_kb = 0
+with open('/proc/self/status') as f:
+    for line in f:
+        if line.startswith('VmRSS:'):
+            rss_kb = int(line.split()[1])
+print(json.dumps({'marks': marks, 'rss_kb': rss_kb}))
+"""
+
+
+def cold_start():
+    """Launch one game process, returns its timings in ms and RSS in MB"""
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy')
+    launched = time.monotonic()
+    output = subprocess.run([sys.executable, '-c', CHILD], cwd=GAME_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    marks = result['marks']
+    return {
+        'interpreter_ms': (marks['start'] - launched) * 1000,
+        'import_ms': (marks['imported'] - marks['start']) * 1000,
+        'game_init_ms': (marks['constructed'] - marks['imported']) * 1000,
+        'first_draw_ms': (marks['first_frame'] - marks['constructed']) * 1000,
+        'first_frame_ms': (marks['first_frame'] - launched) * 1000,
+        'rss_mb': result['rss_kb'] / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold start to first frame")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    cold_start()  # Warm the OS file cache so runs compare code, not disk
+    runs = [cold_start() for _ in range(args.runs)]
+    for key in runs[0]:
+        unit = 'MB' if key == 'rss_mb' else 'ms'
+        label = key.rsplit('_', 1)[0].replace('_', ' ')
+        print(f"{label:15} {statistics.median(run[key] for run in runs):8.1f} {unit}")
+
+
+if __name__ == "__main__":
+    main()
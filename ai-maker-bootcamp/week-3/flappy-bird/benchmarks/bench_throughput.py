@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark: frames/sec for update, draw and the full game loop
+
+Drives the real Game (SDL dummy video and audio drivers) with the scripted
+player from headless.py on each config.json level plus a synthetic "Swarm"
+level, and measures frames/sec for update() alone, draw() alone and the
+whole loop (events, update, draw). The runs are seeded, so results are
+comparable across changes to game.py; each invocation appends one JSON
+line to the results file for tracking regressions.
+
+Usage: python benchmarks/bench_throughput.py [--frames 1200] [--render-mode dirty] [--output FILE]
+"""
+
+import os
+import sys
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+os.chdir(GAME_DIR)  # Game loads its assets relative to the game folder
+
+import pygame
+from game import Game, load_config
+from headless import heuristic_agent
+
+DEFAULT_OUTPUT = os.path.join(GAME_DIR, 'benchmarks', 'results', 'throughput.jsonl')
+
+
+def swarm_level(config):
+    """The hardest level with an enemy every other frame, and pickups 10x as often"""
+    level = dict(config['levels'][-1], name="Swarm", enemy_spawn_rate=2, coin_spawn_rate=12,
+                 coin_cluster_spawn_rate=30, fireball_collectible_spawn_rate=40)
+    level['level'] = len(config['levels']) + 1
+    return level
+
+
+def new_game(args):
+    config = load_config()
+    config['levels'].append(swarm_level(config))
+    config['render_mode'] = args.render_mode
+    if args.entity_store:
+        config['entity_store'] = args.entity_store
+    config['replay_dir'] = None
+    game = Game(config)
+    game.save_high_score = lambda: None  # Don't touch the player's high score
+    return game
+
+
+def start(game, level_index):
+    game.current_level = level_index
+    game.start_game()
+    if game.config['levels'][game.sim.level_index]['name'] == "Swarm":
+        # Keep the swarm building up instead of ending the run on the first hit
+        game.sim.die = lambda: None
+
+
+def act(game):
+    """One scripted player input, restarting the level after a death"""
+    if game.state != "playing":
+        start(game, game.current_level)
+    flap, shoot = heuristic_agent(game.sim)
+    if shoot:
+        game.shoot_fireball()
+    elif flap:
+        game.sim.flap()
+
+
+def measure_level(game, level_index, frames, seed):
+    """Frames/sec for update alone, draw alone and the full loop on one level"""
+    random.seed(seed)
+    start(game, level_index)
+    update_time = 0.0
+    for _ in range(frames):
+        act(game)
+        begin = time.perf_counter()
+        game.update()
+        update_time += time.perf_counter() - begin
+
+    random.seed(seed)
+    start(game, level_index)
+    draw_time = 0.0
+    loop_time = 0.0
+    for _ in range(frames):
+        act(game)
+        begin = time.perf_counter()
+        game.handle_events()
+        game.update()
+        drawn = time.perf_counter()
+        game.draw()
+        end = time.perf_counter()
+        draw_time += end - drawn
+        loop_time += end - begin
+
+    return {
+        'level': game.config['levels'][game.sim.level_index]['name'],
+        'frames': frames,
+        'update_fps': frames / update_time,
+        'draw_fps': frames / draw_time,
+        'loop_fps': frames / loop_time,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=GAME_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark update/draw/loop frames per second")
+    parser.add_argument('--frames', type=int, default=1200, help="Frames per level and pass")
+    parser.add_argument('--render-mode', choices=['full', 'dirty'], default='full')
+    parser.add_argument('--entity-store', choices=['objects', 'numpy'],
+                        help="Override config.json's entity_store")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                        help="JSON-lines file to append the results to")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'Level':8} {'update fps':>11} {'draw fps':>10} {'loop fps':>10}")
+    for level_index in range(len(load_config()['levels']) + 1):
+        game = new_game(args)  # Fresh game per level so caches and pools start cold each time
+        result = measure_level(game, level_index, args.frames, args.seed)
+        results.append(result)
+        print(f"{result['level']:8} {result['update_fps']:11.0f} {result['draw_fps']:10.0f} "
+              f"{result['loop_fps']:10.0f}")
+
+    record = {
+        'benchmark': 'throughput',
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'render_mode': game.render_mode,
+        'entity_store': type(game.sim).__name__,
+        'seed': args.seed,
+        'results': results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'a') as f:
+        f.write(json.dumps(record) + "\n")
+    print(f"Results appended to {args.output}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Flappy Bird - Mario Kart Edition
+Reinforcement learning environments: a gym-style reset/step API over the
+headless simulation, plus a batched variant stepping many worlds per call
+"""
+
+import os
+import bisect
+from operator import attrgetter
+
+# Use SDL's dummy drivers so no window or audio device is needed
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from game import make_simulation, load_config, np
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+
+# Actions
+NOOP, FLAP, SHOOT = 0, 1, 2
+ACTION_COUNT = 3
+
+# Observation layout: bird, then the next walls, enemies and coins ahead of
+# the bird in order of x, then ammo. Missing walls/entities read as far away.
+WALLS_SEEN = 2
+ENEMIES_SEEN = 3
+COINS_SEEN = 2
+MAX_AMMO_SEEN = 5
+OBSERVATION_SIZE = 2 + 3 * WALLS_SEEN + 2 * ENEMIES_SEEN + 2 * COINS_SEEN + 1
+
+_rect_right = attrgetter('rect.right')
+
+
+def observe(sim):
+    """Observation vector for a simulation, as a list of floats roughly in [-1, 1]
+
+    [bird y, bird velocity,
+     per wall: x distance, gap top, gap bottom,
+     per enemy: x distance, y distance,
+     per coin: x distance, y distance,
+     fireball ammo]
+    Positions are divided by the screen size and velocity by 10.
+    """
+    width, height = sim.screen_width, sim.screen_height
+    bird = sim.bird
+    observation = [bird.y / height, bird.velocity / 10]
+
+    seen = 0
+    for wall in sim.walls:
+        if wall.x + wall.wall_width > bird.x - bird.size // 2:
+            gap_top, gap_bottom = wall.get_gap_area()
+            observation += [(wall.x - bird.x) / width, gap_top / height, gap_bottom / height]
+            seen += 1
+            if seen == WALLS_SEEN:
+                break
+    observation += [1.0, 0.0, 1.0] * (WALLS_SEEN - seen)
+
+    # Entity lists are kept in x order, so the ones ahead start at a bisection
+    left = bird.rect.left
+    for entities, count in ((sim.enemies, ENEMIES_SEEN), (sim.coins, COINS_SEEN)):
+        first = bisect.bisect_right(entities, left, key=_rect_right)
+        ahead = entities[first:first + count]
+        for entity in ahead:
+            observation += [(entity.x - bird.x) / width, (entity.y - bird.y) / height]
+        observation += [1.0, 0.0] * (count - len(ahead))
+
+    observation.append(min(sim.fireball_ammo, MAX_AMMO_SEEN) / MAX_AMMO_SEEN)
+    return observation
+
+
+def apply_action(sim, action):
+    if action == FLAP:
+        sim.flap()
+    elif action == SHOOT:
+        sim.shoot_fireball()
+
+
+class FlappyEnv:
+    """One game world behind a gym-style API (no rendering, no audio)
+
+    reset(seed) -> (observation, info)
+    step(action) -> (observation, reward, terminated, truncated, info)
+
+    Actions are NOOP, FLAP and SHOOT. The reward is the score gained during
+    the step (walls, coins, enemies shot) plus ALIVE_REWARD per frame, and
+    DEATH_REWARD when the bird dies. Each action is held for frame_skip
+    frames; episodes are truncated after max_frames frames.
+    """
+
+    ALIVE_REWARD = 0.01
+    DEATH_REWARD = -1.0
+
+    def __init__(self, level=1, config=None, frame_skip=1, max_frames=10000):
+        self.config = config if config is not None else load_config(CONFIG_PATH)
+        self.level_index = level - 1
+        self.frame_skip = frame_skip
+        self.max_frames = max_frames
+        self.sim = make_simulation(self.config)
+
+    def reset(self, seed=None):
+        self.sim.reset(self.level_index, seed)
+        return observe(self.sim), {'seed': self.sim.seed}
+
+    def step(self, action):
+        sim = self.sim
+        score = sim.score
+        frames = 0
+        for frames in range(1, self.frame_skip + 1):
+            apply_action(sim, action)
+            sim.step()
+            if not sim.alive:
+                break
+            action = NOOP  # A flap or shot happens once, then the bird coasts
+        reward = sim.score - score + self.ALIVE_REWARD * frames
+        terminated = not sim.alive
+        if terminated:
+            reward += self.DEATH_REWARD
+        truncated = not terminated and sim.frame >= self.max_frames
+        info = {'score': sim.score, 'frame': sim.frame}
+        return observe(sim), reward, terminated, truncated, info
+
+
+class VectorFlappyEnv:
+    """Many independent game worlds stepped together in one call
+
+    Observations, rewards and done flags come back as NumPy arrays with
+    one row per world. A world that finishes its episode is reset straight
+    away; its final observation is in infos[i]['final_observation'] and the
+    returned row is the new episode's first observation. Seeds count up
+    from the seed given to reset(), so a batch of runs is reproducible.
+    Requires NumPy.
+    """
+
+    def __init__(self, num_envs, level=1, config=None, frame_skip=1, max_frames=10000):
+        if np is None:
+            raise ImportError("VectorFlappyEnv needs NumPy: pip install numpy")
+        config = config if config is not None else load_config(CONFIG_PATH)
+        self.num_envs = num_envs
+        self.envs = [FlappyEnv(level, config, frame_skip, max_frames) for _ in range(num_envs)]
+        self.observations = np.zeros((num_envs, OBSERVATION_SIZE), dtype=np.float32)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+        self.next_seed = None
+
+    def reset(self, seed=None):
+        infos = []
+        for index, env in enumerate(self.envs):
+            observation, info = env.reset(None if seed is None else seed + index)
+            self.observations[index] = observation
+            infos.append(info)
+        self.next_seed = None if seed is None else seed + self.num_envs
+        return self.observations.copy(), infos
+
+    def step(self, actions):
+        infos = []
+        for index, (env, action) in enumerate(zip(self.envs, actions)):
+            observation, reward, terminated, truncated, info = env.step(action)
+            if terminated or truncated:
+                info['final_observation'] = observation
+                observation, _ = env.reset(self.next_seed)
+                if self.next_seed is not None:
+                    self.next_seed += 1
+            self.observations[index] = observation
+            self.rewards[index] = reward
+            self.terminated[index] = terminated
+            self.truncated[index] = truncated
+            infos.append(info)
+        return (self.observations.copy(), self.rewards.copy(),
+                self.terminated.copy(), self.truncated.copy(), infos)
@@ -1,12 +1,209 @@
+import time
+IMPORT_STARTED = time.perf_counter()  # For --measure-startup
+
 import pygame
+import argparse
 import json
 import os
 import random
 import math
+import bisect
+import threading
+import itertools
+from collections import OrderedDict, deque
+from functools import partial
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Optional: only the vectorized entity store needs NumPy
+
+# Minimum volume for effects that should stand out over the music
+SOUND_MIN_VOLUMES = {
+    'coin': 0.5,
+    'fireball_collect': 0.6,
+    'fireball_shoot': 0.6,
+    'enemy_die': 0.6
+}
+
+# Mixer channels are reserved per category so one kind of sound can't starve the others
+# (background music streams through pygame.mixer.music instead)
+SOUND_CATEGORIES = {
+    'flap': 'player',
+    'gameover': 'player',
+    'coin': 'pickup',
+    'fireball_collect': 'pickup',
+    'fireball_shoot': 'combat',
+    'enemy': 'combat',
+    'enemy_die': 'combat'
+}
+SOUND_VOICES = {'player': 2, 'pickup': 3, 'combat': 3}
+
+def init_pygame():
+    """Initialize Pygame; Game() calls this so importing the module has no side effects"""
+    pygame.init()
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        # No audio device (e.g. headless servers) - sounds are skipped
+        pass
+
+# config.json schema: key -> (type, smallest allowed value or None)
+NUMBER = (int, float)
+SCREEN_SCHEMA = {
+    'screen_width': (int, 100),
+    'screen_height': (int, 100),
+    'bird_size': (int, 1),
+    'wall_width': (int, 1),
+    'enemy_size': (int, 1),
+    'coin_size': (int, 1),
+    'fireball_size': (int, 1),
+}
+LEVEL_SCHEMA = {
+    'name': (str, None),
+    'wall_speed': (NUMBER, 0),
+    'enemy_speed': (NUMBER, 0),
+    'wall_spawn_rate': (int, 1),
+    'enemy_spawn_rate': (int, 1),
+    'wall_gap_size': (int, 1),
+    'wall_spacing': (NUMBER, 0),
+    'gravity': (NUMBER, 0),
+    'flap_strength': (NUMBER, None),
+}
+# Spawn tuning: config.json's "spawning" section overrides these for every
+# level, and a level can override them again for itself
+SPAWN_DEFAULTS = {
+    'coin_spawn_rate': 120,  # Frames between single coins
+    'coin_cluster_spawn_rate': 300,  # Frames between coin clusters
+    'fireball_collectible_spawn_rate': 400,  # Frames between fireball pickups
+    'coin_cluster_min': 3,  # Coins per cluster
+    'coin_cluster_max': 5,
+    'coin_cluster_spacing': 15,  # Gap between coins in a cluster
+    'enemy_safe_margin': 40,  # Pickups spawn at least this far from enemies
+    'min_gap_padding': 20,  # Wall gaps are at least bird_size plus this
+    'fireball_speed': 8,
+    # Padding kept from wall gap edges: [smallest gap height, padding], largest gaps first
+    'gap_clearance': [[250, 25], [230, 20], [0, 15]],
+}
+SPAWN_SCHEMA = {name: (int, 0) for name in SPAWN_DEFAULTS if name != 'gap_clearance'}
+SPAWN_SCHEMA.update(coin_spawn_rate=(int, 1), coin_cluster_spawn_rate=(int, 1),
+                    fireball_collectible_spawn_rate=(int, 1), coin_cluster_min=(int, 1),
+                    fireball_speed=(NUMBER, 0), gap_clearance=(list, None))
+# Speeds must be above their minimum: at 0 nothing ever leaves the screen
+EXCLUSIVE_MINIMUM = {'wall_speed', 'enemy_speed', 'fireball_speed'}
+
+class ConfigError(ValueError):
+    """config.json is missing settings or has invalid values"""
+
+def check_fields(section, schema, where, errors, required=True):
+    for key, (kind, minimum) in schema.items():
+        if key not in section:
+            if required:
+                errors.append(f"{where}: missing '{key}'")
+            continue
+        value = section[key]
+        if isinstance(value, bool) or not isinstance(value, kind):
+            errors.append(f"{where}.{key}: wrong type {type(value).__name__} ({value!r})")
+        elif key in EXCLUSIVE_MINIMUM and value <= minimum:
+            errors.append(f"{where}.{key}: must be greater than {minimum}, got {value!r}")
+        elif minimum is not None and value < minimum:
+            errors.append(f"{where}.{key}: must be at least {minimum}, got {value!r}")
 
-# Initialize Pygame
-pygame.init()
-pygame.mixer.init()
+def is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def check_spawning(section, where, errors):
+    check_fields(section, SPAWN_SCHEMA, where, errors, required=False)
+    for key in section:
+        if key not in SPAWN_SCHEMA:
+            errors.append(f"{where}: unknown spawn setting '{key}'")
+    clearance = section.get('gap_clearance')
+    if isinstance(clearance, list):
+        # Every step is [min gap, padding] in whole pixels, largest gap first
+        valid = bool(clearance) and all(isinstance(step, list) and len(step) == 2 and
+                                        all(is_int(value) and value >= 0 for value in step) for step in clearance)
+        thresholds = [step[0] for step in clearance] if valid else []
+        if not valid or thresholds != sorted(thresholds, reverse=True):
+            errors.append(f"{where}.gap_clearance: expected [[min gap, padding], ...] of whole numbers "
+                          f"from the largest gap down, got {clearance!r}")
+
+def validate_config(config):
+    """Check config.json's structure and values, raising ConfigError listing every problem"""
+    if not isinstance(config, dict):
+        raise ConfigError(f"Invalid config:\n  config: expected an object, got {type(config).__name__}")
+    errors = []
+    check_fields(config, {key: SCREEN_SCHEMA[key] for key in SCREEN_SCHEMA
+                          if key not in ('coin_size', 'fireball_size')}, "config", errors)
+    check_fields(config, {'coin_size': SCREEN_SCHEMA['coin_size'],
+                          'fireball_size': SCREEN_SCHEMA['fireball_size']}, "config", errors, required=False)
+    spawning_section = config.get('spawning', {})
+    if not isinstance(spawning_section, dict):
+        errors.append(f"spawning: expected an object, got {type(spawning_section).__name__}")
+        spawning_section = {}
+    check_spawning(spawning_section, "spawning", errors)
+    levels = config.get('levels')
+    if not isinstance(levels, list) or not levels:
+        errors.append("config: 'levels' must be a non-empty list")
+        levels = []
+    for index, level in enumerate(levels):
+        where = f"levels[{index}]"
+        if not isinstance(level, dict):
+            errors.append(f"{where}: expected an object")
+            continue
+        check_fields(level, LEVEL_SCHEMA, where, errors)
+        if isinstance(level.get('flap_strength'), NUMBER) and level['flap_strength'] >= 0:
+            errors.append(f"{where}.flap_strength: must be negative (upwards), got {level['flap_strength']!r}")
+        overrides = {key: value for key, value in level.items() if key in SPAWN_DEFAULTS}
+        check_spawning(overrides, where, errors)
+        spawning = dict(SPAWN_DEFAULTS, **spawning_section)
+        spawning.update(overrides)
+        
+        # Checks across fields, only once each field has the right type (its own error is already listed)
+        if (is_int(spawning['coin_cluster_min']) and is_int(spawning['coin_cluster_max']) and
+                spawning['coin_cluster_min'] > spawning['coin_cluster_max']):
+            errors.append(f"{where}: coin_cluster_min is larger than coin_cluster_max")
+        sizes = (config.get('screen_height'), config.get('bird_size'), level.get('wall_gap_size'),
+                 spawning['min_gap_padding'])
+        if all(is_int(size) for size in sizes):
+            screen_height, bird_size, gap_size, padding = sizes
+            # Walls widen small gaps for the bird, then pick the gap center between gap and height - gap
+            gap_size = max(gap_size, bird_size + padding + 20)
+            if 2 * gap_size > screen_height:
+                errors.append(f"{where}: wall gaps of {gap_size}px (wall_gap_size, or bird_size + min_gap_padding "
+                              f"+ 20) need a screen_height of at least {2 * gap_size}, got {screen_height}")
+    if errors:
+        raise ConfigError("Invalid config:\n  " + "\n  ".join(errors))
+
+def load_config(path='config.json'):
+    """Load and validate game configuration (levels, screen and entity sizes)"""
+    with open(path, 'r') as f:
+        config = json.load(f)
+    validate_config(config)
+    return config
+
+class LevelSettings:
+    """Everything the simulation needs about one level, resolved once
+
+    Built from the level, the screen and entity sizes and the spawn
+    settings (defaults, then config.json's "spawning", then the level's
+    own overrides), so the per-frame code reads plain attributes instead
+    of looking keys up in nested config dicts.
+    """
+
+    __slots__ = tuple(LEVEL_SCHEMA) + tuple(SCREEN_SCHEMA) + tuple(SPAWN_DEFAULTS)
+
+    def __init__(self, config, level_index):
+        level = config['levels'][level_index]
+        spawning = dict(SPAWN_DEFAULTS, **config.get('spawning', {}))
+        spawning.update((key, value) for key, value in level.items() if key in SPAWN_DEFAULTS)
+        sizes = dict(config, coin_size=config.get('coin_size', 30), fireball_size=config.get('fireball_size', 40))
+        for key in LEVEL_SCHEMA:
+            setattr(self, key, level[key])
+        for key in SCREEN_SCHEMA:
+            setattr(self, key, sizes[key])
+        for key in SPAWN_DEFAULTS:
+            setattr(self, key, spawning[key])
+        self.gap_clearance = tuple(tuple(step) for step in spawning['gap_clearance'])
 
 class Bird:
     def __init__(self, x, y, size, gravity, flap_strength):
@@ -16,14 +213,17 @@ class Bird:
         self.velocity = 0
         self.gravity = gravity
         self.flap_strength = flap_strength
+        self.previous_y = y  # Before the last update, to draw between simulation steps
         self.image = None
-        self.rect = None
+        # Collision rect exists without an image so the world can run headless
+        self.rect = pygame.Rect(0, 0, size, size)
+        self.rect.center = (x, y)
         self.has_flapped = False  # Track if bird has flapped yet
         
-    def load_image(self, path):
-        """Load and scale bird image"""
+    def load_image(self, path, decoded=None):
+        """Load (unless already decoded) and scale bird image"""
         try:
-            img = pygame.image.load(path).convert_alpha()
+            img = (decoded if decoded is not None else pygame.image.load(path)).convert_alpha()
             self.image = pygame.transform.scale(img, (self.size, self.size))
             self.rect = self.image.get_rect(center=(self.x, self.y))
         except:
@@ -32,6 +232,12 @@ class Bird:
             self.image.fill((255, 200, 0))
             self.rect = self.image.get_rect(center=(self.x, self.y))
     
+    def set_image(self, image):
+        """Use an image that is already loaded and scaled (shared between entities)"""
+        self.image = image
+        self.rect.size = image.get_size()
+        self.rect.center = (self.x, self.y)
+    
     def flap(self):
         """Make the bird flap upward"""
         self.has_flapped = True  # Enable gravity after first flap
@@ -42,19 +248,513 @@ class Bird:
         # Only apply gravity after first flap
         if self.has_flapped:
             self.velocity += self.gravity
+        self.previous_y = self.y
         self.y += self.velocity
         if self.rect:
             self.rect.center = (self.x, self.y)
     
-    def draw(self, screen):
-        """Draw the bird on screen"""
+    def draw(self, screen, offset=(0, 0)):
+        """Draw the bird on screen, shifted by offset pixels"""
         if self.image and self.rect:
-            screen.blit(self.image, self.rect)
+            screen.blit(self.image, self.rect.move(offset))
+        else:
+            pygame.draw.circle(screen, (255, 200, 0), (int(self.x) + offset[0], int(self.y) + offset[1]), self.size // 2)
+    
+    def get_draw_rect(self, offset=(0, 0)):
+        """Screen area covered by draw()"""
+        return self.rect.move(offset).inflate(4, 4)
+    
+    def draw_offset(self, lag):
+        """Where the bird was lag steps (0-1) ago relative to now, in whole pixels"""
+        return (0, round((self.previous_y - self.y) * lag))
+
+class PipeSpriteCache:
+    """LRU cache of pre-rendered pipe surfaces
+
+    A pipe's look only depends on the wall width, its height and whether
+    it hangs from the top, so each variant is drawn once and then blitted.
+    Sprites have a 2px margin for the rounded rim that overhangs the pipe.
+    """
+
+    def __init__(self, capacity=32):
+        self.capacity = capacity
+        self.sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, wall, height, is_top):
+        """Return the sprite for one pipe of a wall, rendering it on a miss"""
+        key = (wall.wall_width, height, is_top)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+        
+        self.misses += 1
+        sprite = pygame.Surface((wall.wall_width + 4, height + 4), pygame.SRCALPHA)
+        wall._draw_pipe(sprite, 2, 2, height, is_top)
+        if pygame.display.get_surface():
+            sprite = sprite.convert_alpha()
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.capacity:
+            self.sprites.popitem(last=False)  # Evict least recently used
+        return sprite
+
+class TextCache:
+    """LRU cache of rendered text shared by all draw_* methods
+
+    Surfaces are keyed by font, string and color, so static labels render
+    once and changing values (score, coins) only render when they change.
+    Text with drop shadows is composited into a single surface.
+    """
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+    
+    def _lookup(self, key):
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+        return surface
+    
+    def _store(self, key, surface):
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)  # Evict least recently used
+        return surface
+    
+    def render(self, font, text, color):
+        """Antialiased text surface, as font.render(text, True, color)"""
+        key = (font, text, color)
+        surface = self._lookup(key)
+        if surface is None:
+            surface = self._store(key, font.render(text, True, color))
+        return surface
+    
+    def shadowed(self, font, text, color, shadow_color, shadow_offsets):
+        """Text drawn over its shadows; the text itself sits at the top-left"""
+        key = (font, text, color, shadow_color, shadow_offsets)
+        surface = self._lookup(key)
+        if surface is None:
+            text_surf = self.render(font, text, color)
+            shadow_surf = self.render(font, text, shadow_color)
+            width = text_surf.get_width() + max(dx for dx, dy in shadow_offsets)
+            height = text_surf.get_height() + max(dy for dx, dy in shadow_offsets)
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            for offset in shadow_offsets:
+                surface.blit(shadow_surf, offset)
+            surface.blit(text_surf, (0, 0))
+            surface = self._store(key, surface)
+        return surface
+
+class SpriteAtlas:
+    """Shared, pre-scaled entity images
+
+    Each image is decoded and scaled once per entity kind and size, then
+    every entity of that kind shares the surface. Failed loads are cached
+    too, so a missing file only costs one attempt and every entity gets the
+    same fallback image. Files can be decoded ahead on another thread with
+    decode(); converting them for the display stays on the main thread.
+    """
+
+    def __init__(self):
+        self.images = {}
+        self.decoded = {}  # path -> decoded surface, not yet converted
+        self.loads = 0
+    
+    def decode(self, path):
+        """Read and decode an image file for apply() to use (safe off the main thread)"""
+        try:
+            self.decoded[path] = pygame.image.load(path)
+        except pygame.error:
+            pass  # apply() builds the fallback
+    
+    def apply(self, entity, path):
+        """Give entity its shared image, loading it on first use"""
+        # Keyed by the base entity class, so array-backed views (EnemyView...) share the plain entities' images
+        key = (type(entity).__mro__[-2], path, entity.size)
+        image = self.images.get(key)
+        if image is None:
+            entity.load_image(path, self.decoded.get(path))  # Converts and scales, or builds the fallback
+            self.images[key] = entity.image
+            self.loads += 1
+        else:
+            entity.set_image(image)
+
+class DirtyRectRenderer:
+    """Repaints only the screen areas that changed since the last frame
+
+    Each frame the background is restored under last frame's rects and
+    this frame's entity rects, then everything is drawn on top and only
+    those rects are pushed to the display with pygame.display.update().
+    """
+
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+        self.previous_rects = []
+        self.frame_rects = []
+        self.static_rects = []  # Drawn this frame but not restored next frame
+        self.full_redraw = True
+    
+    def invalidate(self):
+        """Repaint the whole screen next frame (e.g. after a screen change)"""
+        self.full_redraw = True
+    
+    def begin_frame(self, entity_rects):
+        """Restore the background under everything that moved"""
+        if self.full_redraw:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self.previous_rects + entity_rects:
+                self.screen.blit(self.background, rect, rect)
+        self.frame_rects = list(entity_rects)
+    
+    def add(self, rect):
+        """Mark an area drawn this frame (HUD, overlays)"""
+        self.frame_rects.append(rect)
+    
+    def add_static(self, rect):
+        """Mark an area redrawn this frame that stays on screen afterwards (UI controls)"""
+        self.static_rects.append(rect)
+    
+    def painted_rects(self):
+        """Areas restored or drawn so far this frame, None when the whole screen was repainted"""
+        if self.full_redraw:
+            return None
+        return self.previous_rects + self.frame_rects
+    
+    def end_frame(self):
+        """Push changed areas to the display, returns the pixel count updated"""
+        screen_rect = self.screen.get_rect()
+        if self.full_redraw:
+            pygame.display.flip()
+            self.full_redraw = False
+            updated = [screen_rect]
+        else:
+            updated = [rect.clip(screen_rect) for rect in self.previous_rects + self.frame_rects + self.static_rects]
+            pygame.display.update(updated)
+        self.previous_rects = self.frame_rects
+        self.static_rects = []
+        return sum(rect.width * rect.height for rect in updated)
+
+class Widget:
+    """UI control drawn from a cached surface
+
+    Subclasses render(state) the control into a surface covering
+    self.rect (transparent where the screen shows through) and may move
+    self.rect while doing so. set_state() only re-renders when the state
+    differs from the last one. targets() lists the click areas of the
+    control as (rect, name, value).
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.state = None
+        self.surface = None
+        self.drawn_rect = None  # Screen area of the last draw, None until drawn
+        self.drawn_surface = None
+    
+    def set_state(self, state):
+        """Re-render if the state changed"""
+        if self.surface is None or state != self.state:
+            self.state = state
+            self.surface = self.render(state)
+    
+    def changed(self):
+        """Whether the screen shows an older surface (or none) than the current one"""
+        return self.drawn_rect is None or self.drawn_surface is not self.surface
+    
+    def draw(self, screen):
+        """Blit the cached surface, returns the rect drawn"""
+        self.drawn_surface = self.surface
+        self.drawn_rect = screen.blit(self.surface, self.rect)
+        return self.drawn_rect
+    
+    def targets(self):
+        """Click areas as (rect, name, value)"""
+        return [(self.rect, self.name, None)]
+
+class MuteButton(Widget):
+    """Mute toggle with a speaker icon, state is muted"""
+
+    def __init__(self, rect):
+        super().__init__('mute')
+        self.rect = rect
+    
+    def render(self, muted):
+        """Button with a speaker icon, crossed out when muted"""
+        surface = pygame.Surface(self.rect.size)
+        button_size = self.rect.width
+        button_rect = surface.get_rect()
+        
+        # Draw mute button background
+        button_color = (200, 50, 50) if muted else (100, 150, 100)
+        pygame.draw.rect(surface, button_color, button_rect)
+        pygame.draw.rect(surface, (0, 0, 0), button_rect, 3)
+        
+        # Draw mute/unmute icon (standard speaker icon)
+        icon_x = button_size // 2
+        icon_y = button_size // 2
+        icon_color = (255, 255, 255)
+        
+        # Speaker cone (triangle pointing right)
+        speaker_base_left = icon_x - 10
+        speaker_base_top = icon_y - 6
+        speaker_base_bottom = icon_y + 6
+        speaker_apex_x = icon_x - 2
+        speaker_apex_y = icon_y
+        
+        # Draw speaker cone
+        speaker_points = [
+            (speaker_base_left, speaker_base_top),
+            (speaker_base_left, speaker_base_bottom),
+            (speaker_apex_x, speaker_apex_y)
+        ]
+        pygame.draw.polygon(surface, icon_color, speaker_points)
+        
+        # Draw small circle at apex (speaker center)
+        pygame.draw.circle(surface, icon_color, (speaker_apex_x, speaker_apex_y), 2)
+        
+        if muted:
+            # Draw X symbol (diagonal lines)
+            x_start_x = icon_x + 2
+            x_start_y = icon_y - 5
+            x_end_x = icon_x + 8
+            x_end_y = icon_y + 5
+            
+            # First diagonal line
+            pygame.draw.line(surface, icon_color, 
+                           (x_start_x, x_start_y), (x_end_x, x_end_y), 3)
+            # Second diagonal line
+            pygame.draw.line(surface, icon_color, 
+                           (x_start_x, x_end_y), (x_end_x, x_start_y), 3)
+        else:
+            # Draw sound waves (curved lines emanating from speaker) - smaller for balance
+            wave_start_x = icon_x
+            wave_center_y = icon_y
+            
+            # First wave (smallest)
+            wave1_rect = pygame.Rect(wave_start_x - 1, wave_center_y - 2, 4, 4)
+            pygame.draw.arc(surface, icon_color, wave1_rect, -math.pi/4, math.pi/4, 2)
+            
+            # Second wave (medium)
+            wave2_rect = pygame.Rect(wave_start_x + 1, wave_center_y - 3, 5, 6)
+            pygame.draw.arc(surface, icon_color, wave2_rect, -math.pi/3, math.pi/3, 2)
+            
+            # Third wave (largest)
+            wave3_rect = pygame.Rect(wave_start_x + 3, wave_center_y - 4, 6, 8)
+            pygame.draw.arc(surface, icon_color, wave3_rect, -math.pi/2.5, math.pi/2.5, 2)
+        return surface
+
+class VolumeSlider(Widget):
+    """Volume track with a round handle, state is (volume, muted)
+
+    Clicks hit the track only; rect also covers where the handle overhangs it.
+    """
+
+    HANDLE_RADIUS = 8
+
+    def __init__(self, track):
+        super().__init__('volume')
+        self.track = track
+        radius = self.HANDLE_RADIUS
+        self.rect = pygame.Rect(track.x - radius - 1, track.centery - radius - 1,
+                                track.width + radius * 2 + 2, radius * 2 + 2)
+    
+    def value_at(self, x):
+        """Volume for a mouse x position, clamped to 0-1"""
+        return max(0.0, min(1.0, (x - self.track.x) / self.track.width))
+    
+    def render(self, state):
+        """Track filled up to the volume with the handle there, greyed out when muted"""
+        volume, muted = state
+        surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        track = self.track.move(-self.rect.x, -self.rect.y)
+        
+        # Draw slider track
+        pygame.draw.rect(surface, (100, 100, 100), track)
+        pygame.draw.rect(surface, (0, 0, 0), track, 2)
+        
+        # Draw filled portion based on volume
+        fill_width = int(track.width * volume)
+        if fill_width > 0:
+            fill_rect = pygame.Rect(track.x, track.y, fill_width, track.height)
+            fill_color = (100, 200, 100) if not muted else (150, 150, 150)
+            pygame.draw.rect(surface, fill_color, fill_rect)
+        
+        # Draw slider handle
+        handle_x = track.x + int(track.width * volume)
+        handle_y = track.y + track.height // 2
+        handle_color = (200, 200, 200) if not muted else (100, 100, 100)
+        pygame.draw.circle(surface, handle_color, (handle_x, handle_y), self.HANDLE_RADIUS)
+        pygame.draw.circle(surface, (0, 0, 0), (handle_x, handle_y), self.HANDLE_RADIUS, 2)
+        return surface
+    
+    def targets(self):
+        """Only the track is clickable"""
+        return [(self.track, self.name, None)]
+
+class LevelDropdown(Widget):
+    """Level selection button, with the list of levels below it when open
+
+    State is (y, level names, current level index, open); the button is
+    centered horizontally and sized to its text. Clicking an option
+    reports ('level', index).
+    """
+
+    LEFT_PADDING = 15  # Padding on left side
+    ARROW_SPACING = 15  # Equal space before and after arrow
+    ARROW_SIZE = 8
+    HEIGHT = 40
+    OPTION_HEIGHT = 35
+
+    def __init__(self, screen_width, font, text_cache):
+        super().__init__('level_dropdown')
+        self.screen_width = screen_width
+        self.font = font
+        self.text_cache = text_cache
+        self.button_rect = self.rect
+        self.option_rects = []
+    
+    def render(self, state):
+        """Lay out the button and options for a state and draw them"""
+        y_position, names, current, is_open = state
+        level_text = self.text_cache.render(self.font, f"Level: {names[current]}", (255, 255, 255))
+        text_width = level_text.get_width()
+        
+        # Dropdown width fits the current text + arrow space
+        # Total space needed: left padding + text + arrow spacing + arrow + arrow spacing
+        total_right_space = self.ARROW_SPACING + self.ARROW_SIZE + self.ARROW_SPACING
+        dropdown_width = text_width + self.LEFT_PADDING + total_right_space
+        if is_open:
+            # Open, the button widens to the longest level name
+            for name in names:
+                option_text = self.text_cache.render(self.font, name, (255, 255, 255))
+                dropdown_width = max(dropdown_width, option_text.get_width() + self.LEFT_PADDING + total_right_space)
+        dropdown_x = self.screen_width // 2 - dropdown_width // 2
+        
+        # Main dropdown button, with the options below it when open
+        self.button_rect = pygame.Rect(dropdown_x, y_position, dropdown_width, self.HEIGHT)
+        self.option_rects = []
+        if is_open:
+            for i in range(len(names)):
+                option_y = y_position + self.HEIGHT + (i * self.OPTION_HEIGHT)
+                self.option_rects.append(pygame.Rect(dropdown_x, option_y, dropdown_width, self.OPTION_HEIGHT))
+        self.rect = self.button_rect.unionall(self.option_rects)
+        
+        surface = pygame.Surface(self.rect.size)
+        origin = (-self.rect.x, -self.rect.y)
+        button_rect = self.button_rect.move(origin)
+        
+        # Button background
+        button_color = (60, 60, 60) if not is_open else (80, 80, 80)
+        pygame.draw.rect(surface, button_color, button_rect)
+        pygame.draw.rect(surface, (255, 255, 255), button_rect, 2)
+        
+        # Current level text - positioned with left padding
+        text_start_x = button_rect.x + self.LEFT_PADDING
+        level_text_rect = level_text.get_rect(left=text_start_x, centery=button_rect.centery)
+        surface.blit(level_text, level_text_rect)
+        
+        # Dropdown arrow - positioned with equal space before and after the text
+        arrow_size = self.ARROW_SIZE
+        arrow_x = text_start_x + text_width + self.ARROW_SPACING + arrow_size // 2
+        arrow_y = button_rect.y + self.HEIGHT // 2
+        if is_open:
+            # Arrow pointing up (v)
+            arrow_points = [
+                (arrow_x, arrow_y - arrow_size // 2),
+                (arrow_x - arrow_size, arrow_y + arrow_size // 2),
+                (arrow_x + arrow_size, arrow_y + arrow_size // 2)
+            ]
         else:
-            pygame.draw.circle(screen, (255, 200, 0), (int(self.x), int(self.y)), self.size // 2)
+            # Arrow pointing down (^)
+            arrow_points = [
+                (arrow_x, arrow_y + arrow_size // 2),
+                (arrow_x - arrow_size, arrow_y - arrow_size // 2),
+                (arrow_x + arrow_size, arrow_y - arrow_size // 2)
+            ]
+        pygame.draw.polygon(surface, (255, 255, 255), arrow_points)
+        
+        for i, (name, option_rect) in enumerate(zip(names, self.option_rects)):
+            option_rect = option_rect.move(origin)
+            
+            # Highlight selected level
+            if i == current:
+                pygame.draw.rect(surface, (100, 150, 200), option_rect)
+            else:
+                pygame.draw.rect(surface, (40, 40, 40), option_rect)
+            
+            pygame.draw.rect(surface, (200, 200, 200), option_rect, 1)
+            
+            # Level name text - centered
+            option_text = self.text_cache.render(self.font, name, (255, 255, 255))
+            option_text_rect = option_text.get_rect(centerx=option_rect.centerx, centery=option_rect.centery)
+            surface.blit(option_text, option_text_rect)
+        return surface
+    
+    def targets(self):
+        """The button, then one area per option"""
+        return ([(self.button_rect, self.name, None)] +
+                [(rect, 'level', i) for i, rect in enumerate(self.option_rects)])
+
+class WidgetLayer:
+    """The UI controls of the current screen, with one hit-test index
+
+    hit() looks a mouse position up in the click areas of every control,
+    topmost (last shown) first, instead of each event handler testing
+    rects by hand; the index is rebuilt when a control's state changes.
+    draw() serves the dirty renderer: it redraws only controls that
+    changed or were painted over, so dragging the volume slider repaints
+    just the slider.
+    """
+
+    def __init__(self):
+        self.widgets = []
+        self.targets = []
+        self.indexed_states = None
+    
+    def show(self, widgets):
+        """Set the controls on screen, in draw order"""
+        if widgets != self.widgets:
+            self.widgets = widgets
+            self.indexed_states = None
+    
+    def hit(self, pos):
+        """(name, value) of the click area under pos, (None, None) if there is none"""
+        states = [widget.state for widget in self.widgets]
+        if states != self.indexed_states:
+            self.targets = [target for widget in reversed(self.widgets) for target in widget.targets()]
+            self.indexed_states = states
+        for rect, name, value in self.targets:
+            if rect.collidepoint(pos):
+                return name, value
+        return None, None
+    
+    def changed_rects(self):
+        """Screen areas of controls whose surface changed since they were drawn, old and new"""
+        rects = []
+        for widget in self.widgets:
+            if widget.changed():
+                rects.append(widget.rect if widget.drawn_rect is None else widget.rect.union(widget.drawn_rect))
+        return rects
+    
+    def draw(self, screen, repainted=None):
+        """Draw controls that changed or overlap the repainted rects (all if None), returns the rects drawn"""
+        drawn = []
+        for widget in self.widgets:
+            if repainted is None or widget.changed() or widget.rect.collidelist(repainted + drawn) >= 0:
+                drawn.append(widget.draw(screen))
+        return drawn
 
 class Wall:
-    def __init__(self, x, screen_height, gap_size, wall_width, speed, min_gap_size):
+    pipe_sprites = PipeSpriteCache()
+    
+    def __init__(self, x, screen_height, gap_size, wall_width, speed, min_gap_size, rng=random, gap_y=None):
         self.x = x
         self.screen_height = screen_height
         # Ensure gap is always larger than minimum required
@@ -62,8 +762,10 @@ class Wall:
         self.wall_width = wall_width
         self.speed = speed
         
-        # Calculate gap position (random but ensuring gap is visible)
-        gap_y = random.randint(self.gap_size, screen_height - self.gap_size)
+        # Calculate gap position (random but ensuring gap is visible), unless already decided
+        if gap_y is None:
+            gap_y = rng.randint(self.gap_size, screen_height - self.gap_size)
+        self.gap_y = gap_y
         self.top_height = gap_y - self.gap_size // 2
         self.bottom_y = gap_y + self.gap_size // 2
         self.bottom_height = screen_height - self.bottom_y
@@ -78,19 +780,28 @@ class Wall:
         self.pipe_border = (0, 80, 0)  # Dark border
         self.pipe_top_height = 30  # Height of the top section
         
+        # Full-height column around both pipes, used by the broadphase
+        self.rect = pygame.Rect(x, 0, wall_width, screen_height)
+        
         self.passed = False
     
     def update(self):
         """Move wall to the left"""
         self.x -= self.speed
+        self.rect.x = self.x
     
-    def draw(self, screen):
-        """Draw Mario-style green pipes"""
+    def draw(self, screen, offset=(0, 0)):
+        """Draw Mario-style green pipes from the shared sprite cache, shifted by offset pixels"""
+        # Truncate like pygame.Rect does so sprites land where drawn pipes would
+        x = int(self.x) - 2 + offset[0]
+        
         # Top pipe
-        self._draw_pipe(screen, self.x, 0, self.top_height, True)
+        top_sprite = Wall.pipe_sprites.get(self, self.top_height, True)
+        screen.blit(top_sprite, (x, -2))
         
         # Bottom pipe
-        self._draw_pipe(screen, self.x, self.bottom_y, self.bottom_height, False)
+        bottom_sprite = Wall.pipe_sprites.get(self, self.bottom_height, False)
+        screen.blit(bottom_sprite, (x, self.bottom_y - 2))
     
     def _draw_pipe(self, screen, x, y, height, is_top):
         """Draw a Mario-style green pipe with cylindrical 3D effect"""
@@ -204,6 +915,14 @@ class Wall:
         bottom_rect = pygame.Rect(self.x, self.bottom_y, self.wall_width, self.bottom_height)
         return top_rect, bottom_rect
     
+    def get_draw_rect(self, offset=(0, 0)):
+        """Screen area covered by draw(), including the 2px pipe rims"""
+        return pygame.Rect(int(self.x) - 2 + offset[0], 0, self.wall_width + 4, self.screen_height)
+    
+    def draw_offset(self, lag):
+        """Where the wall was lag steps (0-1) ago relative to now, in whole pixels"""
+        return (round(self.speed * lag), 0)
+    
     def get_gap_area(self):
         """Get the safe gap area between top and bottom pipes"""
         gap_top = self.top_height
@@ -214,21 +933,89 @@ class Wall:
         """Check if wall has moved off screen"""
         return self.x + self.wall_width < 0
 
+class BobTable:
+    """Precomputed bobbing offsets, shared by every entity of one kind
+
+    Bobbing entities used to add sin(phase) * amplitude to y every frame,
+    summing the rounding error into their height as they went. Now each
+    one keeps its spawn height as base_y and counts frames since spawning
+    in animation_frame, and y is base_y plus the offset for that frame:
+    the same running sum, worked out once per kind instead of once per
+    entity per frame. offsets() looks up a whole array of frames at once.
+    The table grows when an entity lives longer than it covers; growing
+    takes a lock, as the course worker thread moves entities too.
+    """
+
+    SIZE = 1024  # Frames covered up front, enough to cross the screen at the slowest speeds
+
+    def __init__(self, step, amplitude):
+        self.step = step
+        self.amplitude = amplitude
+        self.phase = 0.0
+        self.table = [0.0]
+        self.table_array = None
+        self.lock = threading.Lock()
+        self.grow(self.SIZE)
+    
+    def grow(self, size):
+        """Extend the table to at least size frames"""
+        with self.lock:
+            # Entries are only ever appended, so readers without the lock see complete values
+            offset = self.table[-1]
+            while len(self.table) < size:
+                self.phase += self.step
+                offset += math.sin(self.phase) * self.amplitude
+                self.table.append(offset)
+            if np is not None and (self.table_array is None or len(self.table_array) < len(self.table)):
+                self.table_array = np.array(self.table)
+    
+    def offset(self, frame):
+        """Height offset from base_y after frame frames"""
+        if frame >= len(self.table):
+            self.grow(2 * frame)
+        return self.table[frame]
+    
+    def offsets(self, frames):
+        """offset() for a NumPy array of frame counts"""
+        if len(frames) and frames.max() >= len(self.table):
+            self.grow(2 * int(frames.max()))
+        return self.table_array[frames]
+    
+    def last_move(self, frame):
+        """Height change of the step that reached frame"""
+        return self.offset(frame) - self.offset(frame - 1) if frame else 0.0
+
 class Enemy:
+    # Fixed attributes keep pooled instances small and attribute access fast
+    __slots__ = ('x', 'y', 'base_y', 'size', 'speed', 'screen_width', 'image', 'rect', 'animation_frame')
+    
+    # Flying wobble: animation phase step and vertical drift per frame
+    BOB_STEP = 0.1
+    BOB_AMPLITUDE = 0.5
+    BOB = BobTable(BOB_STEP, BOB_AMPLITUDE)
+    
     def __init__(self, x, y, size, speed, screen_width):
+        self.image = None
+        # Collision rect exists without an image so the world can run headless
+        self.rect = pygame.Rect(0, 0, size, size)
+        self.respawn(x, y, size, speed, screen_width)
+    
+    def respawn(self, x, y, size, speed, screen_width):
+        """Reset for a new spawn; the pool reuses retired enemies this way"""
         self.x = x
         self.y = y
+        self.base_y = y
         self.size = size
         self.speed = speed
         self.screen_width = screen_width
-        self.image = None
-        self.rect = None
+        self.rect.size = (size, size)
+        self.rect.center = (x, y)
         self.animation_frame = 0
         
-    def load_image(self, path):
-        """Load and scale enemy image"""
+    def load_image(self, path, decoded=None):
+        """Load (unless already decoded) and scale enemy image"""
         try:
-            img = pygame.image.load(path).convert_alpha()
+            img = (decoded if decoded is not None else pygame.image.load(path)).convert_alpha()
             self.image = pygame.transform.scale(img, (self.size, self.size))
             self.rect = self.image.get_rect(center=(self.x, self.y))
         except:
@@ -237,45 +1024,77 @@ class Enemy:
             self.image.fill((255, 0, 0))
             self.rect = self.image.get_rect(center=(self.x, self.y))
     
+    def set_image(self, image):
+        """Use an image that is already loaded and scaled (shared between entities)"""
+        self.image = image
+        self.rect.size = image.get_size()
+        self.rect.center = (self.x, self.y)
+    
     def update(self, bird_y):
         """Move enemy toward player (bird)"""
         # Move horizontally toward player
         self.x -= self.speed
         
         # Add slight vertical movement to make it look like flying
-        self.animation_frame += 0.1
-        self.y += math.sin(self.animation_frame) * 0.5
+        self.animation_frame += 1
+        try:
+            self.y = self.base_y + self.BOB.table[self.animation_frame]
+        except IndexError:
+            self.y = self.base_y + self.BOB.offset(self.animation_frame)
         
         if self.rect:
             self.rect.center = (self.x, self.y)
     
-    def draw(self, screen):
-        """Draw enemy on screen"""
+    def draw(self, screen, offset=(0, 0)):
+        """Draw enemy on screen, shifted by offset pixels"""
         if self.image and self.rect:
-            screen.blit(self.image, self.rect)
+            screen.blit(self.image, self.rect.move(offset))
         else:
-            pygame.draw.circle(screen, (255, 0, 0), (int(self.x), int(self.y)), self.size // 2)
+            pygame.draw.circle(screen, (255, 0, 0), (int(self.x) + offset[0], int(self.y) + offset[1]), self.size // 2)
+    
+    def get_draw_rect(self, offset=(0, 0)):
+        """Screen area covered by draw()"""
+        return self.rect.move(offset).inflate(4, 4)
+    
+    def draw_offset(self, lag):
+        """Where the enemy was lag steps (0-1) ago relative to now, in whole pixels"""
+        return (round(self.speed * lag), -round(self.BOB.last_move(self.animation_frame) * lag))
     
     def is_off_screen(self):
         """Check if enemy has moved off screen"""
         return self.x + self.size < 0
 
 class Coin:
+    __slots__ = ('x', 'y', 'base_y', 'size', 'speed', 'screen_width', 'image', 'rect', 'animation_frame', 'collected')
+    
+    # Floating animation: phase step and vertical drift per frame
+    BOB_STEP = 0.15
+    BOB_AMPLITUDE = 1.5
+    BOB = BobTable(BOB_STEP, BOB_AMPLITUDE)
+    
     def __init__(self, x, y, size, speed, screen_width):
+        self.image = None
+        # Collision rect exists without an image so the world can run headless
+        self.rect = pygame.Rect(0, 0, size, size)
+        self.respawn(x, y, size, speed, screen_width)
+    
+    def respawn(self, x, y, size, speed, screen_width):
+        """Reset for a new spawn; the pool reuses retired coins this way"""
         self.x = x
         self.y = y
+        self.base_y = y
         self.size = size
         self.speed = speed
         self.screen_width = screen_width
-        self.image = None
-        self.rect = None
+        self.rect.size = (size, size)
+        self.rect.center = (x, y)
         self.animation_frame = 0
         self.collected = False
         
-    def load_image(self, path):
-        """Load and scale coin image"""
+    def load_image(self, path, decoded=None):
+        """Load (unless already decoded) and scale coin image"""
         try:
-            img = pygame.image.load(path).convert_alpha()
+            img = (decoded if decoded is not None else pygame.image.load(path)).convert_alpha()
             self.image = pygame.transform.scale(img, (self.size, self.size))
             self.rect = self.image.get_rect(center=(self.x, self.y))
         except:
@@ -284,48 +1103,81 @@ class Coin:
             pygame.draw.circle(self.image, (255, 215, 0), (self.size // 2, self.size // 2), self.size // 2)
             self.rect = self.image.get_rect(center=(self.x, self.y))
     
+    def set_image(self, image):
+        """Use an image that is already loaded and scaled (shared between entities)"""
+        self.image = image
+        self.rect.size = image.get_size()
+        self.rect.center = (self.x, self.y)
+    
     def update(self):
         """Move coin to the left and animate"""
         # Move horizontally
         self.x -= self.speed
         
         # Add floating animation (up and down)
-        self.animation_frame += 0.15
-        self.y += math.sin(self.animation_frame) * 1.5
+        self.animation_frame += 1
+        try:
+            self.y = self.base_y + self.BOB.table[self.animation_frame]
+        except IndexError:
+            self.y = self.base_y + self.BOB.offset(self.animation_frame)
         
         if self.rect:
             self.rect.center = (self.x, self.y)
     
-    def draw(self, screen):
-        """Draw coin on screen"""
+    def draw(self, screen, offset=(0, 0)):
+        """Draw coin on screen, shifted by offset pixels"""
         if self.image and self.rect:
             # Add rotation effect for visual appeal
-            rotated_image = pygame.transform.rotate(self.image, self.animation_frame * 10)
-            rotated_rect = rotated_image.get_rect(center=self.rect.center)
+            rotated_image = pygame.transform.rotate(self.image, self.animation_frame * self.BOB_STEP * 10)
+            rotated_rect = rotated_image.get_rect(center=self.rect.move(offset).center)
             screen.blit(rotated_image, rotated_rect)
         else:
-            pygame.draw.circle(screen, (255, 215, 0), (int(self.x), int(self.y)), self.size // 2)
+            pygame.draw.circle(screen, (255, 215, 0), (int(self.x) + offset[0], int(self.y) + offset[1]), self.size // 2)
+    
+    def get_draw_rect(self, offset=(0, 0)):
+        """Screen area covered by draw(); the rotated sprite is up to sqrt(2) times wider"""
+        margin = self.size // 2 + 4
+        return self.rect.move(offset).inflate(margin, margin)
+    
+    def draw_offset(self, lag):
+        """Where the coin was lag steps (0-1) ago relative to now, in whole pixels"""
+        return (round(self.speed * lag), -round(self.BOB.last_move(self.animation_frame) * lag))
     
     def is_off_screen(self):
         """Check if coin has moved off screen"""
         return self.x + self.size < 0
 
 class FireballCollectible:
+    __slots__ = ('x', 'y', 'base_y', 'size', 'speed', 'screen_width', 'image', 'rect', 'animation_frame', 'collected')
+    
+    # Floating animation: phase step and vertical drift per frame
+    BOB_STEP = 0.15
+    BOB_AMPLITUDE = 1.5
+    BOB = BobTable(BOB_STEP, BOB_AMPLITUDE)
+    
     def __init__(self, x, y, size, speed, screen_width):
+        self.image = None
+        # Collision rect exists without an image so the world can run headless
+        self.rect = pygame.Rect(0, 0, size, size)
+        self.respawn(x, y, size, speed, screen_width)
+    
+    def respawn(self, x, y, size, speed, screen_width):
+        """Reset for a new spawn; the pool reuses retired fireball collectibles this way"""
         self.x = x
         self.y = y
+        self.base_y = y
         self.size = size
         self.speed = speed
         self.screen_width = screen_width
-        self.image = None
-        self.rect = None
+        self.rect.size = (size, size)
+        self.rect.center = (x, y)
         self.animation_frame = 0
         self.collected = False
         
-    def load_image(self, path):
-        """Load and scale fireball image"""
+    def load_image(self, path, decoded=None):
+        """Load (unless already decoded) and scale fireball image"""
         try:
-            img = pygame.image.load(path).convert_alpha()
+            img = (decoded if decoded is not None else pygame.image.load(path)).convert_alpha()
             self.image = pygame.transform.scale(img, (self.size, self.size))
             self.rect = self.image.get_rect(center=(self.x, self.y))
         except:
@@ -334,46 +1186,73 @@ class FireballCollectible:
             pygame.draw.circle(self.image, (255, 100, 0), (self.size // 2, self.size // 2), self.size // 2)
             self.rect = self.image.get_rect(center=(self.x, self.y))
     
+    def set_image(self, image):
+        """Use an image that is already loaded and scaled (shared between entities)"""
+        self.image = image
+        self.rect.size = image.get_size()
+        self.rect.center = (self.x, self.y)
+    
     def update(self):
         """Move fireball collectible to the left and animate"""
         # Move horizontally
         self.x -= self.speed
         
         # Add floating animation (up and down)
-        self.animation_frame += 0.15
-        self.y += math.sin(self.animation_frame) * 1.5
+        self.animation_frame += 1
+        try:
+            self.y = self.base_y + self.BOB.table[self.animation_frame]
+        except IndexError:
+            self.y = self.base_y + self.BOB.offset(self.animation_frame)
         
         if self.rect:
             self.rect.center = (self.x, self.y)
     
-    def draw(self, screen):
-        """Draw fireball collectible on screen"""
+    def draw(self, screen, offset=(0, 0)):
+        """Draw fireball collectible on screen, shifted by offset pixels"""
         if self.image and self.rect:
             # Add rotation effect for visual appeal
-            rotated_image = pygame.transform.rotate(self.image, self.animation_frame * 15)
-            rotated_rect = rotated_image.get_rect(center=self.rect.center)
+            rotated_image = pygame.transform.rotate(self.image, self.animation_frame * self.BOB_STEP * 15)
+            rotated_rect = rotated_image.get_rect(center=self.rect.move(offset).center)
             screen.blit(rotated_image, rotated_rect)
         else:
-            pygame.draw.circle(screen, (255, 100, 0), (int(self.x), int(self.y)), self.size // 2)
+            pygame.draw.circle(screen, (255, 100, 0), (int(self.x) + offset[0], int(self.y) + offset[1]), self.size // 2)
+    
+    def get_draw_rect(self, offset=(0, 0)):
+        """Screen area covered by draw(); the rotated sprite is up to sqrt(2) times wider"""
+        margin = self.size // 2 + 4
+        return self.rect.move(offset).inflate(margin, margin)
+    
+    def draw_offset(self, lag):
+        """Where the fireball collectible was lag steps (0-1) ago relative to now, in whole pixels"""
+        return (round(self.speed * lag), -round(self.BOB.last_move(self.animation_frame) * lag))
     
     def is_off_screen(self):
         """Check if fireball collectible has moved off screen"""
         return self.x + self.size < 0
 
 class FireballProjectile:
+    __slots__ = ('x', 'y', 'size', 'speed', 'screen_width', 'image', 'rect')
+    
     def __init__(self, x, y, size, speed, screen_width):
+        self.image = None
+        # Collision rect exists without an image so the world can run headless
+        self.rect = pygame.Rect(0, 0, size, size)
+        self.respawn(x, y, size, speed, screen_width)
+    
+    def respawn(self, x, y, size, speed, screen_width):
+        """Reset for a new spawn; the pool reuses retired fireball projectiles this way"""
         self.x = x
         self.y = y
         self.size = size
         self.speed = speed
         self.screen_width = screen_width
-        self.image = None
-        self.rect = None
+        self.rect.size = (size, size)
+        self.rect.center = (x, y)
         
-    def load_image(self, path):
-        """Load and scale fireball projectile image"""
+    def load_image(self, path, decoded=None):
+        """Load (unless already decoded) and scale fireball projectile image"""
         try:
-            img = pygame.image.load(path).convert_alpha()
+            img = (decoded if decoded is not None else pygame.image.load(path)).convert_alpha()
             self.image = pygame.transform.scale(img, (self.size, self.size))
             self.rect = self.image.get_rect(center=(self.x, self.y))
         except:
@@ -382,102 +1261,1851 @@ class FireballProjectile:
             pygame.draw.circle(self.image, (255, 100, 0), (self.size // 2, self.size // 2), self.size // 2)
             self.rect = self.image.get_rect(center=(self.x, self.y))
     
+    def set_image(self, image):
+        """Use an image that is already loaded and scaled (shared between entities)"""
+        self.image = image
+        self.rect.size = image.get_size()
+        self.rect.center = (self.x, self.y)
+    
     def update(self):
         """Move fireball projectile to the right"""
         self.x += self.speed
         if self.rect:
             self.rect.center = (self.x, self.y)
     
-    def draw(self, screen):
-        """Draw fireball projectile on screen"""
+    def draw(self, screen, offset=(0, 0)):
+        """Draw fireball projectile on screen, shifted by offset pixels"""
         if self.image and self.rect:
-            screen.blit(self.image, self.rect)
+            screen.blit(self.image, self.rect.move(offset))
         else:
-            pygame.draw.circle(screen, (255, 100, 0), (int(self.x), int(self.y)), self.size // 2)
+            pygame.draw.circle(screen, (255, 100, 0), (int(self.x) + offset[0], int(self.y) + offset[1]), self.size // 2)
+    
+    def get_draw_rect(self, offset=(0, 0)):
+        """Screen area covered by draw()"""
+        return self.rect.move(offset).inflate(4, 4)
+    
+    def draw_offset(self, lag):
+        """Where the fireball was lag steps (0-1) ago relative to now, in whole pixels"""
+        return (-round(self.speed * lag), 0)
     
     def is_off_screen(self):
         """Check if fireball projectile has moved off screen"""
         return self.x - self.size > self.screen_width
 
-class Game:
+class EntityPool:
+    """Free list of retired entities of one class
+
+    acquire() hands back a retired entity re-initialized through its
+    respawn() method and only constructs a new one when the free list is
+    empty, so steady entity churn allocates nothing.
+    """
+
+    def __init__(self, kind, capacity=256):
+        self.kind = kind
+        self.capacity = capacity  # Most retired entities kept for reuse
+        self.free = []
+        self.created = 0
+        self.reused = 0
+    
+    def acquire(self, *args):
+        """Get an entity initialized with the constructor arguments"""
+        if self.free:
+            entity = self.free.pop()
+            entity.respawn(*args)
+            self.reused += 1
+        else:
+            entity = self.kind(*args)
+            self.created += 1
+        return entity
+    
+    def release(self, entity):
+        """Retire an entity that has left the world"""
+        if len(self.free) < self.capacity:
+            self.free.append(entity)
+    
+    def release_all(self, entities):
+        """Retire every entity in a list"""
+        for entity in entities:
+            self.release(entity)
+
+class SweepAndPrune:
+    """Sweep-and-prune broadphase along the scroll (x) axis
+
+    Entity lists register once per run. Every entity of a kind spawns at
+    the right edge and moves at the same speed, so each list stays ordered
+    by x without re-sorting. A query bisects to the entities overlapping
+    the probe horizontally and only runs colliderect on those.
+    """
+
     def __init__(self):
-        # Load configuration
-        with open('config.json', 'r') as f:
-            self.config = json.load(f)
-        
-        # Screen setup
-        self.screen_width = self.config['screen_width']
-        self.screen_height = self.config['screen_height']
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
-        pygame.display.set_caption("Flappy Bird - Mario Kart Edition")
-        
-        # Game state
-        self.state = "start"  # start, playing, gameover
-        self.clock = pygame.time.Clock()
-        self.score = 0
-        self.coins_collected = 0  # Track coins collected
-        self.high_score = self.load_high_score()
-        self.current_level = 0
-        self.level_config = self.config['levels'][self.current_level]
-        
-        # Game objects
-        self.bird = None
-        self.walls = []
-        self.enemies = []
-        self.coins = []
-        self.fireball_collectibles = []
-        self.fireball_projectiles = []
-        self.fireball_ammo = 0  # Number of fireballs available
-        
-        # Timing
-        self.wall_timer = 0
-        self.enemy_timer = 0
-        self.coin_timer = 0
-        self.coin_cluster_timer = 0  # Timer for coin clusters
-        self.fireball_collectible_timer = 0
-        self.last_wall_x = self.screen_width  # Track last wall position for spacing
-        
-        # Load assets
-        self.assets_path = "asssets"  # Using existing folder name
-        self.load_assets()
-        
-        # Background
-        self.bg_image = None
-        self.load_background()
-        
-        # Fonts - try to use bold fonts for Mario Kart style
-        try:
-            # Try to use a bold system font
-            self.font_large = pygame.font.Font(None, 96)
-            self.font_large.set_bold(True)
-            self.font_medium = pygame.font.Font(None, 56)
-            self.font_medium.set_bold(True)
-            self.font_small = pygame.font.Font(None, 36)
-        except:
-            # Fallback to default fonts
-            self.font_large = pygame.font.Font(None, 96)
-            self.font_medium = pygame.font.Font(None, 56)
-            self.font_small = pygame.font.Font(None, 36)
-        
-        # Animation timer for start screen effects
-        self.start_screen_timer = 0
+        self.groups = {}  # kind -> (entity list, rects function or None)
+        self.checks = 0  # Narrow-phase colliderect calls, for benchmarks
+    
+    def register(self, kind, entities, get_rects=None):
+        """Register a live entity list; get_rects maps an entity to its hit rects"""
+        self.groups[kind] = (entities, get_rects)
+    
+    def query(self, rect, kind):
+        """Return entities of a kind that collide with rect, in list order"""
+        entities, get_rects = self.groups[kind]
+        start = bisect.bisect_right(entities, rect.left, key=_rect_right)
+        end = bisect.bisect_left(entities, rect.right, lo=start, key=_rect_left)
+        if start == end:
+            return []
+        candidates = entities[start:end]
+        if get_rects is None:
+            self.checks += len(candidates)
+            hit_indices = rect.collidelistall([entity.rect for entity in candidates])
+            return [candidates[index] for index in hit_indices]
+        
+        hits = []
+        for entity in candidates:
+            for hit_rect in get_rects(entity):
+                self.checks += 1
+                if hit_rect.colliderect(rect):
+                    hits.append(entity)
+                    break
+        return hits
+
+def _rect_left(entity):
+    return entity.rect.left
+
+def _rect_right(entity):
+    return entity.rect.right
+
+class FreeCorridorIndex:
+    """Unsafe spawn heights, merged into sorted disjoint intervals
+
+    Built once per spawn from the walls and enemies on screen, so each
+    candidate height is checked with one bisect instead of sweeping
+    rects along the spawn's path.
+    """
+
+    def __init__(self, blocked):
+        self.starts = []
+        self.ends = []
+        for low, high in sorted(blocked):
+            if low > high:
+                continue
+            if self.ends and low <= self.ends[-1] + 1:
+                self.ends[-1] = max(self.ends[-1], high)
+            else:
+                self.starts.append(low)
+                self.ends.append(high)
+    
+    def is_free(self, y):
+        """Check whether a spawn height is outside every blocked interval"""
+        index = bisect.bisect_right(self.starts, y) - 1
+        return index < 0 or y > self.ends[index]
+
+class EntityArrays:
+    """Structure-of-arrays storage for one kind of entity (needs NumPy)
+
+    Index i of each column holds the position, spawn height, size, speed
+    and frames since spawning of entities[i], in spawn order like the
+    entity lists. Moving, culling and overlap tests against a rect run as
+    one vectorized pass.
+    Entities keep a row number offset by first_row, so culling the oldest
+    entities (the usual case, they leave the screen first) renumbers nothing.
+    """
+
+    def __init__(self, direction, bob=None, capacity=64):
+        self.direction = direction  # -1 scrolls left with the walls, 1 flies right
+        self.bob = bob  # BobTable of the kind, None if it doesn't bob
+        self.entities = []
+        self.count = 0
+        self.first_row = 0  # Row number of entities[0]
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.base_y = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.animation_frame = np.zeros(capacity, dtype=np.int64)
+        self.size = np.zeros(capacity, dtype=np.int64)
+    
+    def reset(self, entities):
+        """Start over with an empty live list"""
+        self.entities = entities
+        self.count = 0
+        self.first_row = 0
+    
+    def add(self, x, y, size, speed):
+        """Append a row for a new entity and return its row number"""
+        if self.count == len(self.x):
+            for name in ('x', 'y', 'base_y', 'speed', 'animation_frame', 'size'):
+                column = getattr(self, name)
+                setattr(self, name, np.concatenate((column, np.zeros_like(column))))
+        index = self.count
+        self.x[index] = x
+        self.y[index] = y
+        self.base_y[index] = y
+        self.size[index] = size
+        self.speed[index] = speed
+        self.animation_frame[index] = 0
+        self.count += 1
+        return self.first_row + index
+    
+    def move(self):
+        """Scroll every row and advance its bobbing animation"""
+        n = self.count
+        if self.direction < 0:
+            self.x[:n] -= self.speed[:n]
+        else:
+            self.x[:n] += self.speed[:n]
+        if self.bob:
+            self.animation_frame[:n] += 1
+            self.y[:n] = self.base_y[:n] + self.bob.offsets(self.animation_frame[:n])
+    
+    def off_screen(self, screen_width):
+        """Mask of rows that have left the screen"""
+        n = self.count
+        if self.direction < 0:
+            return self.x[:n] + self.size[:n] < 0
+        return self.x[:n] - self.size[:n] > screen_width
+    
+    def overlapping(self, rect):
+        """Indices into entities whose collision rect collides with rect, in spawn order"""
+        n = self.count
+        half = self.size[:n] // 2
+        # pygame.Rect.center rounds half away from zero
+        left = _round_half_away(self.x[:n]) - half
+        top = _round_half_away(self.y[:n]) - half
+        hits = ((left < rect.right) & (left + self.size[:n] > rect.left) &
+                (top < rect.bottom) & (top + self.size[:n] > rect.top))
+        return np.flatnonzero(hits)
+    
+    def compact(self, keep):
+        """Drop the rows (and entities) where keep is False, preserving order"""
+        if keep.all():
+            return
+        n = self.count
+        kept = int(keep.sum())
+        for name in ('x', 'y', 'base_y', 'speed', 'animation_frame', 'size'):
+            column = getattr(self, name)
+            column[:kept] = column[:n][keep]
+        self.count = kept
+        
+        first_gone = int(np.argmin(keep))
+        if first_gone == 0 and keep[n - kept:].all():
+            # Only the oldest entities left: shift the row numbering instead of renumbering
+            del self.entities[:n - kept]
+            self.first_row += n - kept
+            return
+        survivors = [entity for entity, alive in zip(self.entities[first_gone:], keep[first_gone:].tolist()) if alive]
+        self.entities[first_gone:] = survivors
+        for index in range(first_gone, kept):
+            self.entities[index].row = self.first_row + index
+    
+    def index(self, entity):
+        """Position of an entity in entities (and in the columns)"""
+        return entity.row - self.first_row
+    
+    def remove(self, entity):
+        """Drop a single entity right away"""
+        keep = np.ones(self.count, dtype=bool)
+        keep[self.index(entity)] = False
+        self.compact(keep)
+
+def _round_half_away(values):
+    truncated = np.trunc(values)
+    return (truncated + np.where(np.abs(values - truncated) >= 0.5, np.sign(values), 0)).astype(np.int64)
+
+def _array_field(name):
+    """Property reading and writing an entity's value in one EntityArrays column"""
+    def get(self):
+        return getattr(self.arrays, name)[self.row - self.arrays.first_row].item()
+    
+    def set(self, value):
+        getattr(self.arrays, name)[self.row - self.arrays.first_row] = value
+    
+    return property(get, set)
+
+class ArrayView:
+    """Mixin making an entity a thin view over its EntityArrays row
+
+    Drawing, sprites and spawn checks keep using the entity as before;
+    position and animation phase are read from the arrays, and the
+    collision rect is re-centered from them on access.
+    """
+
+    __slots__ = ()
+    x = _array_field('x')
+    y = _array_field('y')
+    base_y = _array_field('base_y')
+    animation_frame = _array_field('animation_frame')
+    
+    def __init__(self, arrays, x, y, size, speed, screen_width):
+        self.arrays = arrays
+        super().__init__(x, y, size, speed, screen_width)
+    
+    def respawn(self, x, y, size, speed, screen_width):
+        """Take a new row at the end of the arrays, then reset as usual"""
+        self.row = self.arrays.add(x, y, size, speed)
+        super().respawn(x, y, size, speed, screen_width)
+    
+    @property
+    def rect(self):
+        self._rect.center = (self.x, self.y)
+        return self._rect
+    
+    @rect.setter
+    def rect(self, rect):
+        self._rect = rect
+
+class EnemyView(ArrayView, Enemy):
+    __slots__ = ('arrays', 'row', '_rect')
+
+class CoinView(ArrayView, Coin):
+    __slots__ = ('arrays', 'row', '_rect')
+
+class FireballCollectibleView(ArrayView, FireballCollectible):
+    __slots__ = ('arrays', 'row', '_rect')
+
+class FireballProjectileView(ArrayView, FireballProjectile):
+    __slots__ = ('arrays', 'row', '_rect')
+
+# The course is handed to the simulation in chunks of this many frames,
+# and generated up to this many screen widths ahead of the game
+COURSE_CHUNK = 60
+COURSE_SCREENS_AHEAD = 3
+COURSE_PAUSE = 0.0005  # Seconds the worker thread sleeps between frames
+NO_SPAWNS = (None, None, ())
+
+class CourseGenerator:
+    """Decides a run's walls, enemies and pickups ahead of the game
+
+    Runs the spawn timers and safety checks over its own copy of the walls
+    and enemies, which move exactly as they do in the game, and hands the
+    spawns to the simulation COURSE_CHUNK frames at a time as
+    {frame: (wall args, enemy args, [(kind, pickup args), ...])}. Spawn
+    checks only look at walls and enemies, so this is the course the game
+    would have spawned frame by frame, except that enemies the player
+    shoots down still count as obstacles.
+
+    With background set, chunks are generated on a worker thread (mostly
+    while the game waits for the next frame), up to COURSE_SCREENS_AHEAD
+    screens ahead, and the frame loop only pops ready chunks (finishing
+    one itself if the worker ever falls behind). The course
+    depends only on the config, level and seed, so it is the same with or
+    without the thread and replays stay exact.
+    """
+
+    def __init__(self, config, level_index, seed, background=False):
+        self.level = LevelSettings(config, level_index)
+        self.screen_width = config['screen_width']
+        self.screen_height = config['screen_height']
+        # Every random choice in a run comes from this generator
+        self.rng = random.Random(seed)
+        self.frame = 0  # Last frame generated
+        self.walls = []
+        self.enemies = []
+        self.enemy_pool = EntityPool(Enemy)
+        self.spawns = None  # [wall, enemy, pickups] of the frame being generated
+        
+        # Timing
+        self.enemy_timer = 0
+        self.coin_timer = 0
+        self.coin_cluster_timer = 0
+        self.fireball_collectible_timer = 0
+        
+        # Decided frames, handed over in chunks
+        self.ready = deque()
+        # Frames for the walls to cross the screens ahead (validation rejects a speed of 0, but stay safe)
+        frames_ahead = 0
+        if self.level.wall_speed > 0:
+            frames_ahead = COURSE_SCREENS_AHEAD * self.screen_width / self.level.wall_speed
+        self.chunks_ahead = max(2, math.ceil(frames_ahead / COURSE_CHUNK))
+        self.pending = {}  # Chunk being filled
+        self.condition = threading.Condition()  # Guards everything above
+        self.closed = False
+        self.error = None
+        self.thread = None
+        if background:
+            self.thread = threading.Thread(target=self.run, name="course", daemon=True)
+            self.thread.start()
+    
+    def next_chunk(self):
+        """Spawns for the next COURSE_CHUNK frames, keyed by frame (frames without spawns left out)"""
+        with self.condition:
+            if self.error is not None:
+                raise self.error
+            # Without a worker, or if it fell behind, finish the chunk here
+            while not self.ready:
+                self.generate_frame()
+            chunk = self.ready.popleft()
+            self.condition.notify()
+        return chunk
+    
+    def run(self):
+        """Worker thread: keep chunks_ahead chunks ready until closed, one frame at a time"""
+        try:
+            while True:
+                with self.condition:
+                    while len(self.ready) >= self.chunks_ahead and not self.closed:
+                        self.condition.wait()
+                    if self.closed:
+                        return
+                    self.generate_frame()
+                    # Yield to the frame loop unless it is about to run out of course
+                    pause = len(self.ready) > 1
+                # Really block for a moment: a frame loop waiting for the GIL gets it straight
+                # away, instead of after up to the interpreter's 5 ms switch interval
+                time.sleep(COURSE_PAUSE if pause else 0)
+        except Exception as e:
+            # Hand the error to the game thread instead of leaving it waiting
+            with self.condition:
+                self.error = e
+    
+    def close(self):
+        """Stop the worker thread (the course of a finished run is thrown away)"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+    
+    def generate_frame(self):
+        """Decide the next frame, moving the pending chunk to ready once it is complete"""
+        self.frame += 1
+        self.spawns = [None, None, []]
+        self.step()
+        wall, enemy, pickups = self.spawns
+        if wall or enemy or pickups:
+            self.pending[self.frame] = (wall, enemy, pickups)
+        if self.frame % COURSE_CHUNK == 0:
+            self.ready.append(self.pending)
+            self.pending = {}
+    
+    def step(self):
+        """Decide one frame, in the order Simulation.step() spawns and moves things"""
+        self.spawn_wall()
+        kept = 0
+        for wall in self.walls:
+            wall.update()
+            if not wall.is_off_screen():
+                self.walls[kept] = wall
+                kept += 1
+        del self.walls[kept:]
+        
+        self.spawn_enemy()
+        kept = 0
+        for enemy in self.enemies:
+            enemy.update(None)
+            if enemy.is_off_screen():
+                self.enemy_pool.release(enemy)
+            else:
+                self.enemies[kept] = enemy
+                kept += 1
+        del self.enemies[kept:]
+        
+        self.spawn_pickups()
+    
+    def spawn_wall(self):
+        """Spawn a wall once the last one is wall_spacing in from the right edge"""
+        if self.walls:
+            last_wall = max(self.walls, key=lambda w: w.x)
+            if last_wall.x >= self.screen_width - self.level.wall_spacing:
+                return
+        level = self.level
+        args = (self.screen_width, self.screen_height,
+                level.wall_gap_size,
+                level.wall_width,
+                level.wall_speed,
+                level.bird_size + level.min_gap_padding)  # Ensure gap > bird size
+        wall = Wall(*args, rng=self.rng)
+        self.walls.append(wall)
+        # The game builds its own wall with the same gap (no rng needed)
+        self.spawns[0] = args + (None, wall.gap_y)
+    
+    def spawn_enemy(self):
+        """Spawn an enemy at the right edge when the level's enemy timer runs out"""
+        self.enemy_timer += 1
+        if self.enemy_timer >= self.level.enemy_spawn_rate:
+            self.enemy_timer = 0
+            # Spawn enemy from right side, random Y position
+            enemy_y = self.rng.randint(50, self.screen_height - 50)
+            args = (self.screen_width, enemy_y, self.level.enemy_size, self.level.enemy_speed, self.screen_width)
+            self.enemies.append(self.enemy_pool.acquire(*args))
+            self.spawns[1] = args
+    
+    def spawn_pickups(self):
+        """Run the coin, coin cluster and fireball collectible spawn timers"""
+        # Update coins - spawn single coins more frequently
+        self.coin_timer += 1
+        if self.coin_timer >= self.level.coin_spawn_rate:  # Spawn coins more frequently
+            self.coin_timer = 0
+            self.spawn_coin()
+        
+        # Update coin clusters - spawn clusters less frequently than single coins
+        self.coin_cluster_timer += 1
+        if self.coin_cluster_timer >= self.level.coin_cluster_spawn_rate:  # Clusters less often than single coins
+            self.coin_cluster_timer = 0
+            self.spawn_coin_cluster()
+        
+        # Update fireball collectibles
+        self.fireball_collectible_timer += 1
+        if self.fireball_collectible_timer >= self.level.fireball_collectible_spawn_rate:  # Spawn fireball collectibles less frequently
+            self.fireball_collectible_timer = 0
+            self.spawn_fireball_collectible()
+    
+    def gap_clearance(self, gap_height):
+        """Adaptive clearance padding - smaller gaps need less padding"""
+        for min_gap_height, padding in self.level.gap_clearance:
+            if gap_height >= min_gap_height:
+                return padding
+        return self.level.gap_clearance[-1][1]
+    
+    def upcoming_gaps(self):
+        """Gap areas of walls that are coming soon, with their clearance padding"""
+        gaps = []
+        for wall in self.walls:
+            if wall.x > self.screen_width - 300:
+                gap_top, gap_bottom = wall.get_gap_area()
+                gaps.append((gap_top, gap_bottom, self.gap_clearance(gap_bottom - gap_top)))
+        return gaps
+    
+    def spawn_corridor(self, width, height, path_window, path_length,
+                       path_clearance=False, entry_checks=False):
+        """Index the spawn heights at the right edge that are unsafe right now
+
+        The object is a width x height rect centered on its spawn height.
+        Walls right of spawn_x - path_window are checked every 20px along
+        path_length of the object's path (plus their gap clearance when
+        path_clearance is set). entry_checks also checks every wall at the
+        spawn point, including room for Mario in the gap. Enemies are
+        always kept enemy_safe_margin away.
+        """
+        spawn_x = self.screen_width
+        spawn_left = spawn_x - width // 2
+        half = height // 2
+        bird_size = self.level.bird_size
+        enemy_safe_margin = self.level.enemy_safe_margin
+        path_lefts = [check_x - width // 2
+                      for check_x in range(int(spawn_x), int(spawn_x - path_length), -20)]
+        blocked = []
+        
+        def overlaps_x(left, rect):
+            return left < rect.right and left + width > rect.left
+        
+        def block_rect(rect):
+            # Heights at which the object's rect overlaps rect vertically
+            if rect.width > 0 and rect.height > 0:
+                blocked.append((rect.top + half - height + 1, rect.bottom + half - 1))
+        
+        def block_gap_edges(gap_top, gap_bottom, lowest_safe, highest_safe):
+            # Heights inside the gap that are too close to its edges
+            blocked.append((gap_top + 1, min(lowest_safe, gap_bottom) - 1))
+            blocked.append((max(highest_safe, gap_top) + 1, gap_bottom - 1))
+        
+        for enemy in self.enemies:
+            enemy_check_rect = enemy.rect.inflate(enemy_safe_margin * 2, enemy_safe_margin * 2)
+            if overlaps_x(spawn_left, enemy_check_rect):
+                block_rect(enemy_check_rect)
+        
+        for wall in self.walls:
+            top_rect, bottom_rect = wall.get_rects()
+            gap_top, gap_bottom = wall.get_gap_area()
+            clearance = self.gap_clearance(gap_bottom - gap_top)
+            
+            if entry_checks:
+                if overlaps_x(spawn_left, top_rect):
+                    block_rect(top_rect)
+                    block_rect(bottom_rect)
+                # Mario needs bird_size of room on each side to collect it
+                room = max(clearance, bird_size)
+                block_gap_edges(gap_top, gap_bottom, gap_top + room + half, gap_bottom - room - half)
+            
+            if wall.x > spawn_x - path_window:
+                if any(overlaps_x(left, top_rect) for left in path_lefts):
+                    block_rect(top_rect)
+                    block_rect(bottom_rect)
+                if path_clearance:
+                    block_gap_edges(gap_top, gap_bottom,
+                                    gap_top + clearance + half, gap_bottom - clearance - half)
+        
+        return FreeCorridorIndex(blocked)
+    
+    def spawn_coin(self):
+        """Spawn a single coin in a safe spot, preferably in a pipe gap"""
+        coin_size = self.level.coin_size
+        bird_size = self.level.bird_size
+        coin_x = self.screen_width
+        gap_corridor = None
+        
+        # First, try to spawn in pipe gaps (safest locations)
+        for gap_top, gap_bottom, clearance_padding in self.upcoming_gaps():
+            # Gap must be large enough for Mario + coin + clearance
+            if gap_bottom - gap_top < bird_size + coin_size + clearance_padding * 2:
+                continue
+            
+            # Spawn in center of safe area (with padding from edges)
+            safe_top = gap_top + clearance_padding
+            safe_bottom = gap_bottom - clearance_padding
+            if safe_bottom - safe_top < coin_size + bird_size:
+                continue
+            coin_y = (safe_top + safe_bottom) // 2
+            coin_top = coin_y - coin_size // 2
+            coin_bottom = coin_y + coin_size // 2
+            if coin_top < safe_top or coin_bottom > safe_bottom:
+                continue  # Coin outside safe area
+            
+            # Need at least bird_size space on each side for Mario to collect
+            if coin_top - gap_top < bird_size or gap_bottom - coin_bottom < bird_size:
+                continue
+            
+            # Must be clear of enemies and not blocked by pipes as it moves
+            if gap_corridor is None:
+                gap_corridor = self.spawn_corridor(coin_size, coin_size, 400, 300)
+            if gap_corridor.is_free(coin_y):
+                self.add_coin(coin_x, coin_y, coin_size)
+                return
+        
+        # If no gap position worked, try random positions with adaptive checks
+        corridor = self.spawn_corridor(coin_size, coin_size, 500, 400,
+                                       path_clearance=True, entry_checks=True)
+        for attempt in range(40):  # More attempts to find a good spot
+            coin_y = self.rng.randint(150, self.screen_height - 150)
+            if corridor.is_free(coin_y):
+                self.add_coin(coin_x, coin_y, coin_size)
+                return
+        
+        # If we couldn't find a safe spot after max attempts, skip this spawn
+        # (Better to skip than spawn in a bad location)
+    
+    def spawn_coin_cluster(self):
+        """Spawn a vertical cluster of coins (3-5 by default) in a safe spot"""
+        coin_size = self.level.coin_size
+        bird_size = self.level.bird_size
+        cluster_size = self.rng.randint(self.level.coin_cluster_min, self.level.coin_cluster_max)
+        coin_spacing = coin_size + self.level.coin_cluster_spacing  # Spacing between coins in cluster
+        cluster_height = (cluster_size - 1) * coin_spacing + coin_size
+        cluster_x = self.screen_width
+        gap_corridor = None
+        
+        # Try to spawn cluster in pipe gaps
+        for gap_top, gap_bottom, clearance_padding in self.upcoming_gaps():
+            # Need enough space for cluster (cluster height + Mario clearance)
+            if gap_bottom - gap_top < bird_size + cluster_height + clearance_padding * 2:
+                continue
+            
+            # Center of safe area
+            safe_top = gap_top + clearance_padding
+            safe_bottom = gap_bottom - clearance_padding
+            if safe_bottom - safe_top < cluster_height + bird_size:
+                continue
+            cluster_y = (safe_top + safe_bottom) // 2
+            cluster_top = cluster_y - cluster_height // 2
+            cluster_bottom = cluster_y + cluster_height // 2
+            if cluster_top < safe_top or cluster_bottom > safe_bottom:
+                continue
+            
+            # Need at least bird_size space on each side
+            if cluster_top - gap_top < bird_size or gap_bottom - cluster_bottom < bird_size:
+                continue
+            
+            # Must be clear of enemies and not blocked by pipes as it moves
+            if gap_corridor is None:
+                gap_corridor = self.spawn_corridor(coin_size, cluster_height, 400, 300)
+            if gap_corridor.is_free(cluster_y):
+                self.add_coin_cluster(cluster_x, cluster_y, cluster_size, coin_size, coin_spacing)
+                return
+        
+        # If no gap position worked, try random positions with adaptive checks
+        corridor = self.spawn_corridor(coin_size, cluster_height, 500, 400,
+                                       path_clearance=True, entry_checks=True)
+        for attempt in range(20):
+            cluster_y = self.rng.randint(200, self.screen_height - 200)
+            if corridor.is_free(cluster_y):
+                self.add_coin_cluster(cluster_x, cluster_y, cluster_size, coin_size, coin_spacing)
+                return
+    
+    def spawn_fireball_collectible(self):
+        """Spawn a fireball collectible in a safe spot, preferably in a pipe gap"""
+        fireball_size = self.level.fireball_size
+        bird_size = self.level.bird_size
+        fireball_x = self.screen_width
+        gap_corridor = None
+        
+        # First, try to spawn in pipe gaps (safest locations)
+        for gap_top, gap_bottom, clearance_padding in self.upcoming_gaps():
+            # Gap must be large enough for Mario + fireball + clearance
+            if gap_bottom - gap_top < bird_size + fireball_size + clearance_padding * 2:
+                continue
+            
+            # Spawn in center of safe area (with padding from edges)
+            safe_top = gap_top + clearance_padding
+            safe_bottom = gap_bottom - clearance_padding
+            if safe_bottom - safe_top < fireball_size + bird_size:
+                continue
+            fireball_y = (safe_top + safe_bottom) // 2
+            fireball_top = fireball_y - fireball_size // 2
+            fireball_bottom = fireball_y + fireball_size // 2
+            if fireball_top < safe_top or fireball_bottom > safe_bottom:
+                continue  # Fireball outside safe area
+            
+            # Need at least bird_size space on each side for Mario to collect
+            if fireball_top - gap_top < bird_size or gap_bottom - fireball_bottom < bird_size:
+                continue
+            
+            # Must be clear of enemies and of pipes (with clearance) as it moves
+            if gap_corridor is None:
+                gap_corridor = self.spawn_corridor(fireball_size, fireball_size, 400, 300,
+                                                   path_clearance=True)
+            if gap_corridor.is_free(fireball_y):
+                self.add_fireball_collectible(fireball_x, fireball_y, fireball_size)
+                return
+        
+        # If no gap position worked, try random positions with adaptive checks
+        corridor = self.spawn_corridor(fireball_size, fireball_size, 500, 400,
+                                       path_clearance=True, entry_checks=True)
+        for attempt in range(40):  # More attempts to find a good spot
+            fireball_y = self.rng.randint(150, self.screen_height - 150)
+            if corridor.is_free(fireball_y):
+                self.add_fireball_collectible(fireball_x, fireball_y, fireball_size)
+                return
+    
+    def add_coin(self, x, y, coin_size):
+        """Place a coin moving with the walls"""
+        self.spawns[2].append(('coin', (x, y, coin_size, self.level.wall_speed, self.screen_width)))
+    
+    def add_coin_cluster(self, x, cluster_y, cluster_size, coin_size, coin_spacing):
+        """Place a vertical cluster of coins centered on cluster_y"""
+        start_y = cluster_y - (cluster_size - 1) * coin_spacing // 2
+        for i in range(cluster_size):
+            self.add_coin(x, start_y + i * coin_spacing, coin_size)
+    
+    def add_fireball_collectible(self, x, y, fireball_size):
+        """Place a fireball collectible moving with the walls"""
+        self.spawns[2].append(('fireball', (x, y, fireball_size, self.level.wall_speed, self.screen_width)))
+
+class Simulation:
+    """Headless game world: physics, spawning, collisions and scoring.
+
+    The simulation never touches the display or the mixer. It advances one
+    fixed timestep per call to step() and reports what happened to its
+    observers, so the interactive game can attach sprites and play sounds
+    while tools can run it at full speed without pygame rendering.
+    """
+
+    def __init__(self, config, background_course=False):
+        self.config = config
+        self.screen_width = config['screen_width']
+        self.screen_height = config['screen_height']
+        self.level = LevelSettings(config, 0)
+        self.level_index = 0
+        self.observers = []
+        self.broadphase = SweepAndPrune()
+        
+        # Walls, enemies and pickups come from the run's course, decided ahead
+        # (on a worker thread with background_course) from the seed given to reset()
+        self.background_course = background_course
+        self.course = None
+        self.course_frames = {}
+        self.course_end = 0  # Last frame of the current course chunk
+        self.spawns = NO_SPAWNS
+        self.seed = None
+        
+        # World state
+        self.alive = False
+        self.frame = 0
+        self.score = 0
+        self.coins_collected = 0
+        self.bird = None
+        self.walls = []
+        self.enemies = []
+        self.coins = []
+        self.fireball_collectibles = []
+        self.fireball_projectiles = []
+        self.fireball_ammo = 0
+        
+        # Short-lived entities are recycled instead of reallocated
+        self.enemy_pool = EntityPool(Enemy)
+        self.coin_pool = EntityPool(Coin)
+        self.fireball_collectible_pool = EntityPool(FireballCollectible)
+        self.fireball_projectile_pool = EntityPool(FireballProjectile)
+    
+    def profile_phases(self):
+        """(phase name, object, method name) for each part of step() worth timing"""
+        return [
+            ('bird', self, 'step_bird'),
+            ('course', self, 'course_spawns'),
+            ('walls', self, 'step_walls'),
+            ('enemy spawn', self, 'spawn_enemies'),
+            ('enemies', self, 'step_enemies'),
+            ('pickup spawn', self, 'spawn_pickups'),
+            ('fireballs', self, 'step_fireball_collectibles'),
+            ('fireballs', self, 'step_fireball_projectiles'),
+            ('coins', self, 'step_coins'),
+            ('collisions', self.broadphase, 'query'),
+        ]
+    
+    def add_observer(self, observer):
+        """Register a callable invoked as observer(event, payload)"""
+        self.observers.append(observer)
+    
+    def emit(self, event, payload=None):
+        """Notify observers of a world event (spawn, flap, coin, gameover, ...)"""
+        for observer in self.observers:
+            observer(event, payload)
+    
+    def reset(self, level_index=0, seed=None):
+        """Start a fresh run on the given level; the same seed replays the same world"""
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        if self.course:
+            self.course.close()
+        self.course = CourseGenerator(self.config, level_index, seed, self.background_course)
+        self.course_frames = {}
+        self.course_end = 0
+        self.level_index = level_index
+        self.level = LevelSettings(self.config, level_index)
+        self.alive = True
+        self.frame = 0
+        self.score = 0
+        self.coins_collected = 0
+        
+        # Create bird (reset has_flapped flag)
+        bird_x = self.screen_width // 4
+        bird_y = self.screen_height // 2
+        self.bird = Bird(bird_x, bird_y, self.level.bird_size, 
+                        self.level.gravity, 
+                        self.level.flap_strength)
+        self.bird.has_flapped = False  # Bird won't fall until first flap
+        self.emit('spawn', self.bird)
+        
+        # Clear walls, enemies, coins, and fireballs
+        self.enemy_pool.release_all(self.enemies)
+        self.coin_pool.release_all(self.coins)
+        self.fireball_collectible_pool.release_all(self.fireball_collectibles)
+        self.fireball_projectile_pool.release_all(self.fireball_projectiles)
+        self.walls = []
+        self.enemies = []
+        self.coins = []
+        self.fireball_collectibles = []
+        self.fireball_projectiles = []
+        self.fireball_ammo = 0  # Reset fireball ammo
+        
+        # Collision checks go through the broadphase for every entity type
+        self.broadphase.register('wall', self.walls, Wall.get_rects)
+        self.broadphase.register('enemy', self.enemies)
+        self.broadphase.register('coin', self.coins)
+        self.broadphase.register('fireball', self.fireball_collectibles)
+        self.emit('reset')
+    
+    def reload_config(self, config):
+        """Switch to a new config mid-run: bird physics change right away, the course from the next run"""
+        self.config = config
+        self.level = LevelSettings(config, self.level_index)
+        if self.bird:
+            self.bird.gravity = self.level.gravity
+            self.bird.flap_strength = self.level.flap_strength
+        self.emit('config', config)
+    
+    def close(self):
+        """Stop generating the current course"""
+        if self.course:
+            self.course.close()
+    
+    def die(self):
+        """End the run and let observers react (high score, sound)"""
+        self.alive = False
+        self.emit('gameover')
+    
+    def flap(self):
+        """Make the bird flap"""
+        if not self.alive:
+            return
+        self.bird.flap()
+        self.emit('flap')
+    
+    def shoot_fireball(self):
+        """Shoot a fireball projectile if player has ammo"""
+        if self.alive and self.fireball_ammo > 0:
+            # Give Mario a small upward boost when shooting to help stay afloat
+            # Use 60% of flap strength so shooting provides lift but not as much as flapping
+            shoot_boost = self.level.flap_strength * 0.6
+            # Apply boost: if falling (negative velocity), set to boost value; if rising, add boost
+            if self.bird.velocity < 0:
+                self.bird.velocity = shoot_boost
+            else:
+                self.bird.velocity += shoot_boost * 0.3  # Smaller boost if already rising
+            self.bird.has_flapped = True  # Ensure gravity is enabled
+            
+            # Create fireball projectile at bird position
+            self.add_entity(
+                self.fireball_projectiles, self.fireball_projectile_pool,
+                self.bird.x + self.bird.size // 2,
+                self.bird.y,
+                self.level.fireball_size,
+                self.level.fireball_speed,  # Fast projectile speed
+                self.screen_width
+            )
+            self.fireball_ammo -= 1
+            self.emit('fireball_shoot')
+    
+    def add_entity(self, entities, pool, *args):
+        """Spawn an entity from its pool (args as for the constructor) into a live list"""
+        entity = pool.acquire(*args)
+        self.emit('spawn', entity)
+        entities.append(entity)
+        return entity
+    
+    def add_enemy(self, x, y):
+        """Create an enemy flying toward the bird"""
+        self.add_entity(self.enemies, self.enemy_pool, x, y,
+                        self.level.enemy_size,
+                        self.level.enemy_speed,
+                        self.screen_width)
+    
+    def add_coin(self, x, y, coin_size):
+        """Create a coin moving with the walls"""
+        self.add_entity(self.coins, self.coin_pool, x, y,
+                        coin_size,
+                        self.level.wall_speed,
+                        self.screen_width)
+    
+    def add_fireball_collectible(self, x, y, fireball_size):
+        """Create a fireball collectible moving with the walls"""
+        self.add_entity(
+            self.fireball_collectibles, self.fireball_collectible_pool,
+            x, y,
+            fireball_size,
+            self.level.wall_speed,
+            self.screen_width
+        )
+    
+    def course_spawns(self):
+        """This frame's (wall, enemy, pickups) from the course, fetching the next chunk when needed"""
+        if self.frame > self.course_end:
+            self.course_frames = self.course.next_chunk()
+            self.course_end += COURSE_CHUNK
+        return self.course_frames.get(self.frame, NO_SPAWNS)
+    
+    def step(self):
+        """Advance the world by one fixed timestep"""
+        if not self.alive:
+            return
+        self.frame += 1
+        self.spawns = self.course_spawns()
+        # Each phase may end the run (die() clears alive)
+        self.step_bird()
+        if not self.alive:
+            return
+        self.step_walls()
+        if not self.alive:
+            return
+        self.step_enemies()
+        if not self.alive:
+            return
+        self.spawn_pickups()
+        self.step_fireball_collectibles()
+        self.step_fireball_projectiles()
+        self.step_coins()
+    
+    def step_bird(self):
+        """Move the bird; leaving the screen ends the run"""
+        self.bird.update()
+        
+        # Check bird boundaries
+        if self.bird.y < 0 or self.bird.y > self.screen_height:
+            self.die()
+    
+    def step_walls(self):
+        """Spawn, move and score walls; hitting one ends the run"""
+        # New walls come from the course (spawned by spacing, not a timer)
+        wall_args = self.spawns[0]
+        if wall_args:
+            self.walls.append(Wall(*wall_args))
+        
+        for wall in self.walls:
+            wall.update()
+        
+        # Check collision
+        if self.broadphase.query(self.bird.rect, 'wall'):
+            self.die()
+            return
+        
+        # Removals compact each list in place, keeping survivors in spawn (x) order
+        # for the broadphase without copying the list or shifting it per removal
+        kept = 0
+        for wall in self.walls:
+            # Check if bird passed wall
+            if not wall.passed and wall.x + wall.wall_width < self.bird.x:
+                wall.passed = True
+                self.score += 1
+            
+            # Remove off-screen walls
+            if not wall.is_off_screen():
+                self.walls[kept] = wall
+                kept += 1
+        del self.walls[kept:]
+    
+    def spawn_enemies(self):
+        """Spawn this frame's enemy from the course, if any"""
+        enemy_args = self.spawns[1]
+        if enemy_args:
+            self.add_entity(self.enemies, self.enemy_pool, *enemy_args)
+    
+    def step_enemies(self):
+        """Spawn and move enemies; touching one ends the run"""
+        self.spawn_enemies()
+        
+        for enemy in self.enemies:
+            enemy.update(self.bird.y)
+        
+        # Check collision
+        if self.broadphase.query(self.bird.rect, 'enemy'):
+            self.die()
+            return
+        
+        kept = 0
+        for enemy in self.enemies:
+            # Recycle off-screen enemies
+            if enemy.is_off_screen():
+                self.enemy_pool.release(enemy)
+            else:
+                self.enemies[kept] = enemy
+                kept += 1
+        del self.enemies[kept:]
+    
+    def spawn_pickups(self):
+        """Spawn this frame's coins and fireball collectibles from the course (already checked safe)"""
+        for kind, args in self.spawns[2]:
+            if kind == 'coin':
+                self.add_entity(self.coins, self.coin_pool, *args)
+            else:
+                self.add_entity(self.fireball_collectibles, self.fireball_collectible_pool, *args)
+    
+    def step_fireball_collectibles(self):
+        """Move fireball collectibles and pick up the ones the bird touches"""
+        for fireball_collectible in self.fireball_collectibles:
+            fireball_collectible.update()
+        
+        touched = self.broadphase.query(self.bird.rect, 'fireball')
+        kept = 0
+        for fireball_collectible in self.fireball_collectibles:
+            # Check collision with bird
+            if fireball_collectible in touched and not fireball_collectible.collected:
+                fireball_collectible.collected = True
+                self.fireball_ammo += 1  # Add fireball ammo
+                # Observers play the fireball collect sound
+                self.emit('fireball_collect')
+                self.fireball_collectible_pool.release(fireball_collectible)
+            
+            # Recycle off-screen fireball collectibles
+            elif fireball_collectible.is_off_screen():
+                self.fireball_collectible_pool.release(fireball_collectible)
+            
+            else:
+                self.fireball_collectibles[kept] = fireball_collectible
+                kept += 1
+        del self.fireball_collectibles[kept:]
+    
+    def step_fireball_projectiles(self):
+        """Move fireball projectiles; each one kills the first enemy it hits"""
+        kept = 0
+        for fireball in self.fireball_projectiles:
+            fireball.update()
+            
+            # Check collision with nearby enemies only
+            hit_enemies = self.broadphase.query(fireball.rect, 'enemy')
+            if hit_enemies:
+                # Enemy hit! Remove both fireball and the earliest-spawned enemy hit
+                enemy = min(hit_enemies, key=self.enemies.index)
+                # Kills are rare, remove right away so later fireballs can't hit it
+                self.enemies.remove(enemy)
+                self.enemy_pool.release(enemy)
+                self.fireball_projectile_pool.release(fireball)
+                self.score += 10  # Bonus points for killing enemy
+                # Observers play the enemy die sound
+                self.emit('enemy_die')
+            
+            # Recycle off-screen fireballs
+            elif fireball.is_off_screen():
+                self.fireball_projectile_pool.release(fireball)
+            
+            else:
+                self.fireball_projectiles[kept] = fireball
+                kept += 1
+        del self.fireball_projectiles[kept:]
+    
+    def step_coins(self):
+        """Move coins and collect the ones the bird touches"""
+        for coin in self.coins:
+            coin.update()
+        
+        touched = self.broadphase.query(self.bird.rect, 'coin')
+        kept = 0
+        for coin in self.coins:
+            # Check collision with bird
+            if coin in touched and not coin.collected:
+                coin.collected = True
+                self.score += 5  # Coins worth 5 points
+                self.coins_collected += 1  # Track coin collection
+                # Observers play the coin collection sound
+                self.emit('coin')
+                self.coin_pool.release(coin)
+            
+            # Recycle off-screen coins
+            elif coin.is_off_screen():
+                self.coin_pool.release(coin)
+            
+            else:
+                self.coins[kept] = coin
+                kept += 1
+        del self.coins[kept:]
+    
+
+
+class VectorizedSimulation(Simulation):
+    """Simulation that moves, culls and collides entities with NumPy
+
+    Enemies, coins and fireballs live in EntityArrays (one per kind) and
+    the entity objects are views over them, so each kind is updated in one
+    vectorized pass per frame instead of a Python loop per entity. Worth it
+    for custom levels with hundreds of entities; walls stay plain objects.
+    """
+
+    def __init__(self, config, background_course=False):
+        super().__init__(config, background_course)
+        self.enemy_arrays = EntityArrays(-1, Enemy.BOB)
+        self.coin_arrays = EntityArrays(-1, Coin.BOB)
+        self.fireball_collectible_arrays = EntityArrays(-1, FireballCollectible.BOB)
+        self.fireball_projectile_arrays = EntityArrays(1)
+        
+        # Pools hand out views bound to this simulation's arrays
+        self.enemy_pool = EntityPool(partial(EnemyView, self.enemy_arrays))
+        self.coin_pool = EntityPool(partial(CoinView, self.coin_arrays))
+        self.fireball_collectible_pool = EntityPool(
+            partial(FireballCollectibleView, self.fireball_collectible_arrays))
+        self.fireball_projectile_pool = EntityPool(
+            partial(FireballProjectileView, self.fireball_projectile_arrays))
+    
+    def profile_phases(self):
+        """Collisions also include the vectorized overlap tests"""
+        arrays = (self.enemy_arrays, self.coin_arrays,
+                  self.fireball_collectible_arrays, self.fireball_projectile_arrays)
+        return super().profile_phases() + [('collisions', kind, 'overlapping') for kind in arrays]
+    
+    def reset(self, level_index=0, seed=None):
+        """Start a fresh run on the given level; the same seed replays the same world"""
+        super().reset(level_index, seed)
+        self.enemy_arrays.reset(self.enemies)
+        self.coin_arrays.reset(self.coins)
+        self.fireball_collectible_arrays.reset(self.fireball_collectibles)
+        self.fireball_projectile_arrays.reset(self.fireball_projectiles)
+    
+    def step_enemies(self):
+        """Spawn and move enemies; touching one ends the run"""
+        self.spawn_enemies()
+        arrays = self.enemy_arrays
+        arrays.move()
+        
+        # Check collision
+        if len(arrays.overlapping(self.bird.rect)):
+            self.die()
+            return
+        
+        self.retire(arrays, self.enemy_pool, arrays.off_screen(self.screen_width))
+    
+    def step_fireball_collectibles(self):
+        """Move fireball collectibles and pick up the ones the bird touches"""
+        arrays = self.fireball_collectible_arrays
+        arrays.move()
+        
+        touched = arrays.overlapping(self.bird.rect)
+        for row in touched.tolist():
+            arrays.entities[row].collected = True
+            self.fireball_ammo += 1  # Add fireball ammo
+            # Observers play the fireball collect sound
+            self.emit('fireball_collect')
+        
+        gone = arrays.off_screen(self.screen_width)
+        gone[touched] = True
+        self.retire(arrays, self.fireball_collectible_pool, gone)
+    
+    def step_fireball_projectiles(self):
+        """Move fireball projectiles; each one kills the first enemy it hits"""
+        arrays = self.fireball_projectile_arrays
+        arrays.move()
+        
+        gone = arrays.off_screen(self.screen_width)
+        for row, fireball in enumerate(arrays.entities):
+            hit_rows = self.enemy_arrays.overlapping(fireball.rect)
+            if len(hit_rows):
+                # Enemy hit! Remove both fireball and the earliest-spawned enemy hit
+                enemy = self.enemy_arrays.entities[hit_rows[0]]
+                self.enemy_arrays.remove(enemy)
+                self.enemy_pool.release(enemy)
+                gone[row] = True
+                self.score += 10  # Bonus points for killing enemy
+                # Observers play the enemy die sound
+                self.emit('enemy_die')
+        
+        self.retire(arrays, self.fireball_projectile_pool, gone)
+    
+    def step_coins(self):
+        """Move coins and collect the ones the bird touches"""
+        arrays = self.coin_arrays
+        arrays.move()
+        
+        touched = arrays.overlapping(self.bird.rect)
+        for row in touched.tolist():
+            arrays.entities[row].collected = True
+            self.score += 5  # Coins worth 5 points
+            self.coins_collected += 1  # Track coin collection
+            # Observers play the coin collection sound
+            self.emit('coin')
+        
+        gone = arrays.off_screen(self.screen_width)
+        gone[touched] = True
+        self.retire(arrays, self.coin_pool, gone)
+    
+    def retire(self, arrays, pool, gone):
+        """Recycle the entities marked in gone and drop their rows"""
+        if gone.any():
+            for row in np.flatnonzero(gone).tolist():
+                pool.release(arrays.entities[row])
+            arrays.compact(~gone)
+
+class InputRecorder:
+    """Simulation observer that records runs so they can be replayed exactly
+
+    A run is fully determined by its level, seed, config and inputs.
+    Inputs are kept in memory and written when the run ends, as JSON
+    lines: a header {"version", "level", "seed", "config"}, one
+    [frame, "flap" | "shoot"] line per input (frame = steps taken before
+    it), a [frame, "config", config] line for each config reloaded during
+    the run, and a result {"frames", "score", "coins"}.
+    """
+
+    VERSION = 2
+
+    def __init__(self, sim, directory):
+        self.sim = sim
+        self.directory = directory
+        self.inputs = []
+        self.config = sim.config  # Config the current run started with
+        self.last_path = None
+    
+    def __call__(self, event, payload):
+        if event == 'reset':
+            self.inputs = []
+            self.config = self.sim.config
+        elif event == 'config':
+            self.inputs.append([self.sim.frame, 'config', payload])
+        elif event == 'flap':
+            self.inputs.append([self.sim.frame, 'flap'])
+        elif event == 'fireball_shoot':
+            self.inputs.append([self.sim.frame, 'shoot'])
+        elif event == 'gameover':
+            self.save()
+    
+    def save(self):
+        """Write the finished run to a new file in the replay directory"""
+        lines = [{'version': self.VERSION, 'level': self.sim.level_index, 'seed': self.sim.seed,
+                  'config': self.config}]
+        lines += self.inputs
+        lines.append({'frames': self.sim.frame, 'score': self.sim.score,
+                      'coins': self.sim.coins_collected})
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            stem = f"run-{time.strftime('%Y%m%d-%H%M%S')}-{self.sim.seed}"
+            for attempt in itertools.count():
+                # Exclusive create: runs with the same seed ending in the same second get a suffix
+                name = f"{stem}.jsonl" if attempt == 0 else f"{stem}-{attempt}.jsonl"
+                path = os.path.join(self.directory, name)
+                try:
+                    f = open(path, 'x')
+                    break
+                except FileExistsError:
+                    continue
+            with f:
+                f.writelines(json.dumps(line, separators=(',', ':')) + "\n" for line in lines)
+            self.last_path = path
+        except:
+            pass  # Recording must never break the game
+
+def load_replay(path):
+    """Read a recorded run: (header, inputs, result)"""
+    with open(path, 'r') as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    return lines[0], lines[1:-1], lines[-1]
+
+def play_replay(sim, path, frame_margin=10000):
+    """Replay a recorded run at full speed, returns (recorded result, replayed result)
+
+    The run plays on a fresh simulation of sim's kind (objects or numpy),
+    built from the config it was recorded with (older recordings without one
+    use sim's), so sim itself is left as it was.
+    """
+    header, inputs, result = load_replay(path)
+    replay_sim = type(sim)(header.get('config', sim.config))
+    try:
+        replay_sim.reset(header['level'], header['seed'])
+        next_input = 0
+        # A run that diverged might never end, give up well past the recorded length
+        while replay_sim.alive and replay_sim.frame < result['frames'] + frame_margin:
+            while next_input < len(inputs) and inputs[next_input][0] == replay_sim.frame:
+                action = inputs[next_input][1]
+                if action == 'flap':
+                    replay_sim.flap()
+                elif action == 'config':
+                    replay_sim.reload_config(inputs[next_input][2])
+                else:
+                    replay_sim.shoot_fireball()
+                next_input += 1
+            replay_sim.step()
+        replayed = {'frames': replay_sim.frame, 'score': replay_sim.score, 'coins': replay_sim.coins_collected}
+    finally:
+        replay_sim.close()
+    return result, replayed
+
+def make_simulation(config, background_course=False):
+    """Create the simulation selected by config's entity_store ("objects" or "numpy")"""
+    if config.get('entity_store') == 'numpy' and np is not None:
+        return VectorizedSimulation(config, background_course)
+    return Simulation(config, background_course)
+
+
+class FrameProfiler:
+    """Per-phase frame timings, gathered by wrapping the methods a frame runs
+
+    enable() shadows each phase method with a timed wrapper on that one
+    object and disable() removes the wrappers again, so while disabled the
+    only cost is the begin/end_frame calls. Times are exclusive: a phase
+    running inside another (collisions inside enemies) is taken out of its
+    parent, so a frame's phases add up to its total.
+    """
+
+    def __init__(self, window=300, history=36000):
+        self.enabled = False
+        self.window = window
+        self.phases = []  # Phase names in the order they were first enabled
+        self.wrapped = []  # (object, method name) currently shadowed
+        self.recent = {}  # Phase -> last `window` frame times in ms
+        self.recent_totals = deque(maxlen=window)
+        # The last `history` profiled frames (10 minutes at 60 fps): (total, *phase times) in ms
+        self.frames = deque(maxlen=history)
+        self.frame_count = 0  # Profiled frames ever, including those dropped from history
+        self.current = {}
+        self.nested = []  # Time spent in nested phases, one entry per running phase
+        self.frame_start = None
+    
+    def enable(self, targets):
+        """Start timing (phase name, object, method name) targets"""
+        if self.enabled:
+            return
+        for name, obj, method_name in targets:
+            self.wrap(name, obj, method_name)
+            if name not in self.recent:
+                self.phases.append(name)
+                self.recent[name] = deque(maxlen=self.window)
+        self.current = dict.fromkeys(self.phases, 0.0)
+        self.frame_start = None  # The frame in progress is only partly timed
+        self.enabled = True
+    
+    def disable(self):
+        """Stop timing and restore the original methods"""
+        for obj, method_name in self.wrapped:
+            delattr(obj, method_name)
+        self.wrapped = []
+        self.enabled = False
+    
+    def wrap(self, name, obj, method_name):
+        method = getattr(obj, method_name)
+        nested = self.nested
+        profiler = self
+        
+        def timed(*args, **kwargs):
+            nested.append(0.0)
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                profiler.current[name] += elapsed - nested.pop()
+                if nested:
+                    nested[-1] += elapsed
+        
+        setattr(obj, method_name, timed)
+        self.wrapped.append((obj, method_name))
+    
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        for name in self.current:
+            self.current[name] = 0.0
+        self.frame_start = time.perf_counter()
+    
+    def end_frame(self):
+        if not self.enabled or self.frame_start is None:
+            return
+        total = (time.perf_counter() - self.frame_start) * 1000
+        self.recent_totals.append(total)
+        row = [total]
+        for name in self.phases:
+            phase_ms = self.current[name] * 1000
+            self.recent[name].append(phase_ms)
+            row.append(phase_ms)
+        self.frames.append(tuple(row))
+        self.frame_count += 1
+    
+    def summary(self):
+        """Rolling (name, p50, p99) in ms for the frame and each phase"""
+        rows = [('frame', self.recent_totals)] + [(name, self.recent[name]) for name in self.phases]
+        return [(name, percentile(times, 0.5), percentile(times, 0.99)) for name, times in rows]
+    
+    def export(self, path):
+        """Write the profiled frames still in history to path, as JSON if it ends in .json and CSV otherwise"""
+        columns = ['total'] + self.phases
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump({'units': 'ms', 'columns': columns,
+                           'first_frame': self.frame_count - len(self.frames),
+                           'frames': [list(row) for row in self.frames]}, f)
+            return
+        with open(path, 'w') as f:
+            f.write('frame,' + ','.join(f"{column.replace(' ', '_')}_ms" for column in columns) + "\n")
+            for index, row in enumerate(self.frames, self.frame_count - len(self.frames)):
+                f.write(f"{index}," + ','.join(f'{value:.4f}' for value in row) + "\n")
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a sequence, 0.0 when empty"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class SettingsWriter:
+    """Saves small JSON files on a background thread so the game loop never waits on disk
+
+    save() only records the latest data for a path and wakes the writer.
+    The writer flushes at most once per interval, so a burst of saves (a
+    volume slider drag) becomes a single write. Each file is written to a
+    temporary file and renamed over the original, so a crash mid-write
+    never leaves a truncated file. close() flushes what is still pending.
+    """
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.pending = {}  # path -> latest data to write
+        self.closed = False
+        self.last_flush = float('-inf')
+        self.wake = threading.Condition()
+        self.thread = threading.Thread(target=self.run, name="settings-writer", daemon=True)
+        self.thread.start()
+    
+    def save(self, path, data):
+        """Queue data to be written to path as JSON"""
+        with self.wake:
+            self.pending[path] = data
+            self.wake.notify()
+    
+    def close(self):
+        """Write everything still pending and stop the writer thread"""
+        with self.wake:
+            self.closed = True
+            self.wake.notify()
+        self.thread.join()
+    
+    def run(self):
+        while True:
+            batch = self.next_batch()
+            if batch is None:
+                return
+            for path, data in batch.items():
+                self.write(path, data)
+            self.last_flush = time.monotonic()
+    
+    def next_batch(self):
+        """Wait for saves and the end of the flush interval, None once closed and idle"""
+        with self.wake:
+            while not self.pending and not self.closed:
+                self.wake.wait()
+            # Let more saves coalesce until an interval has passed since the last flush
+            while not self.closed:
+                delay = self.last_flush + self.interval - time.monotonic()
+                if delay <= 0:
+                    break
+                self.wake.wait(delay)
+            if not self.pending:
+                return None
+            batch, self.pending = self.pending, {}
+            return batch
+    
+    def write(self, path, data):
+        temp_path = path + '.tmp'
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, path)
+        except:
+            pass
+
+class SoundManager:
+    """Plays sounds on mixer channels reserved per category, with precomputed gains
+
+    Each category (SOUND_CATEGORIES) owns SOUND_VOICES channels that
+    automatic playback never uses. A new sound takes a free voice of its
+    category, or steals the one that started longest ago, so a burst of
+    coins cuts off older coins instead of flaps or hits. Gains are worked
+    out once per volume or mute change and set on the channel, never on
+    the shared Sound, so changing one voice doesn't affect the others.
+    Effects are decoded the first time they play; music is streamed.
+    """
+
+    def __init__(self, sound_paths, volume, muted):
+        self.paths = sound_paths  # name -> file, decoded on first play
+        self.sounds = {}  # name -> decoded Sound, or None if it failed to load
+        self.lengths = {}
+        self.music = None  # Name of the streaming track
+        self.gains = {}
+        self.voices = {}  # category -> list of [channel, sound name, start time, end time]
+        self.enabled = bool(sound_paths) and pygame.mixer.get_init() is not None
+        if self.enabled:
+            total = sum(SOUND_VOICES.values())
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), total))
+            pygame.mixer.set_reserved(total)
+            channel_id = 0
+            for category, count in SOUND_VOICES.items():
+                self.voices[category] = []
+                for _ in range(count):
+                    self.voices[category].append([pygame.mixer.Channel(channel_id), None, 0.0, 0.0])
+                    channel_id += 1
+        self.set_master(volume, muted)
+    
+    def set_master(self, volume, muted):
+        """Recompute every sound's gain and apply it to the voices playing"""
+        for name in self.paths:
+            if muted:
+                gain = 0.0
+            elif name in SOUND_MIN_VOLUMES:
+                # Pickups and hits are louder: at least the minimum or 2x master volume
+                gain = min(1.0, max(SOUND_MIN_VOLUMES[name], volume * 2.0))
+            else:
+                gain = volume
+            self.gains[name] = gain
+        for voices in self.voices.values():
+            for voice in voices:
+                if voice[1] is not None:
+                    voice[0].set_volume(self.gains[voice[1]])
+        if self.music is not None:
+            pygame.mixer.music.set_volume(self.gains[self.music])
+    
+    def sound(self, name):
+        """The decoded Sound for name, loading it on first use"""
+        if name not in self.sounds:
+            try:
+                self.sounds[name] = pygame.mixer.Sound(self.paths[name])
+                self.lengths[name] = self.sounds[name].get_length()
+            except:
+                self.sounds[name] = None
+        return self.sounds[name]
+    
+    def play_music(self, name):
+        """Stream a track from disk on a loop instead of decoding it into memory"""
+        if not self.enabled or name not in self.paths:
+            return
+        try:
+            pygame.mixer.music.load(self.paths[name])
+            self.music = name
+            pygame.mixer.music.set_volume(self.gains[name])
+            pygame.mixer.music.play(-1)
+        except pygame.error:
+            self.music = None
+    
+    def play(self, name, loops=0):
+        """Play a sound on a voice of its category, stealing the oldest if all are busy"""
+        if not self.enabled or name not in self.paths:
+            return
+        sound = self.sound(name)
+        if sound is None:
+            return
+        now = time.monotonic()
+        voices = self.voices[SOUND_CATEGORIES.get(name, 'combat')]
+        voice = None
+        for candidate in voices:
+            if candidate[3] <= now:
+                voice = candidate
+                break
+        if voice is None:
+            voice = min(voices, key=lambda candidate: candidate[2])
+        channel = voice[0]
+        # Only touch the channel volume when this voice last played at another gain
+        gain = self.gains[name]
+        if voice[1] is None or self.gains[voice[1]] != gain:
+            channel.set_volume(gain)
+        channel.play(sound, loops)
+        end = float('inf') if loops < 0 else now + self.lengths[name] * (loops + 1)
+        voice[1:] = [name, now, end]
+
+class StartupTimer:
+    """Checkpoints from the start of importing game.py, for --measure-startup"""
+
+    def __init__(self):
+        self.marks = [("import game.py", IMPORT_FINISHED)]
+    
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+    
+    def report(self):
+        """One line per checkpoint: time spent in that step and total so far, in ms"""
+        lines = [f"{'Startup step':34} {'step ms':>8} {'total ms':>9}"]
+        previous = IMPORT_STARTED
+        for name, when in self.marks:
+            lines.append(f"{name:34} {(when - previous) * 1000:8.1f} {(when - IMPORT_STARTED) * 1000:9.1f}")
+            previous = when
+        return "\n".join(lines)
+
+class FramePacing:
+    """Rendered frame times and simulation steps per frame, for a pacing report
+
+    Jitter is the spread of frame times (standard deviation) and the mean
+    change from one frame to the next. Frames running more than one
+    simulation step were catching up after a slow frame; game time beyond
+    MAX_STEPS_PER_FRAME is dropped, so the game slows down instead.
+    """
+
+    def __init__(self, window=3600):
+        self.frame_times = deque(maxlen=window)
+        self.steps = deque(maxlen=window)
+        self.dropped = 0.0  # Seconds of game time skipped
+        self.dropped_frames = 0
+        self.last_frame = None
+    
+    def frame(self, now, steps, dropped=0.0):
+        """Record a frame presented at now (perf_counter) and the steps run for it"""
+        if self.last_frame is not None:
+            self.frame_times.append(now - self.last_frame)
+            self.steps.append(steps)
+        self.last_frame = now
+        if dropped:
+            self.dropped += dropped
+            self.dropped_frames += 1
+    
+    def report(self):
+        """Text summary of the recorded frames"""
+        if len(self.frame_times) < 2:
+            return "Frame pacing: not enough frames"
+        times = [frame_time * 1000 for frame_time in self.frame_times]
+        count = len(times)
+        mean = sum(times) / count
+        deviation = math.sqrt(sum((t - mean) ** 2 for t in times) / count)
+        change = sum(abs(b - a) for a, b in zip(times, times[1:])) / (count - 1)
+        steps = list(self.steps)
+        share = lambda test: 100 * sum(1 for n in steps if test(n)) / count
+        return "\n".join([
+            f"Frame pacing, last {count} frames: {1000 / mean:.0f} fps rendered, "
+            f"{sum(steps) * 1000 / sum(times):.1f} simulation steps/s",
+            f"Frame time ms: mean {mean:.2f}  p50 {percentile(times, 0.5):.2f}  "
+            f"p99 {percentile(times, 0.99):.2f}  max {max(times):.2f}",
+            f"Jitter ms: std dev {deviation:.2f}  frame to frame {change:.2f}",
+            f"Steps per frame: 0 {share(lambda n: n == 0):.0f}%  1 {share(lambda n: n == 1):.0f}%  "
+            f"2+ {share(lambda n: n >= 2):.0f}%",
+            f"Slowdowns: {self.dropped_frames} frames dropped {self.dropped * 1000:.0f} ms of game time",
+        ])
+
+SIM_RATE = 60  # Simulation steps per second, whatever the display's frame rate
+MAX_STEPS_PER_FRAME = 5  # Catch-up limit after a slow frame
+
+class Game:
+    def __init__(self, config=None):
+        self.startup = StartupTimer()
+        init_pygame()
+        self.startup.mark("pygame.init")
+        
+        # Load configuration (callers such as benchmarks may pass their own)
+        self.config = config if config is not None else load_config()
+        # Edits to config.json apply while the game runs, if the game loaded it itself
+        self.config_path = 'config.json' if config is None and self.config.get('hot_reload', True) else None
+        self.config_mtime = os.path.getmtime(self.config_path) if self.config_path else None
+        self.config_check_tick = 0
+        
+        # Screen setup
+        self.screen_width = self.config['screen_width']
+        self.screen_height = self.config['screen_height']
+        # A scaled window is opt-in; pygame can only vsync a scaled (or OpenGL) window,
+        # so vsync without it leaves frames paced by max_fps alone
+        scaled = self.config.get('scaled', False)
+        self.vsync = scaled and self.config.get('vsync', False)
+        try:
+            if scaled:
+                self.screen = pygame.display.set_mode((self.screen_width, self.screen_height),
+                                                      pygame.SCALED, vsync=1 if self.vsync else 0)
+            else:
+                self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        except pygame.error:
+            # Driver can't vsync (or scale); fall back to a plain window
+            self.vsync = False
+            self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        if self.config.get('vsync', False) and not self.vsync:
+            print("vsync needs a scaled window (\"scaled\": true); frames are paced by max_fps")
+        pygame.display.set_caption("Flappy Bird - Mario Kart Edition")
+        self.startup.mark("open window")
+        
+        # Game state
+        self.state = "loading"  # loading, start, playing, gameover
+        self.quit_requested = False  # Window closed while loading
+        self.clock = pygame.time.Clock()
+        self.high_score = self.load_high_score()
+        # High score and settings are written in the background, at most every settings_flush_ms
+        self.settings_writer = SettingsWriter(self.config.get('settings_flush_ms', 500) / 1000)
+        self.current_level = 0
+        
+        # Game world - rendering and audio observe the headless simulation
+        # The course is generated on a worker thread so spawns never stall a frame
+        self.sim = make_simulation(self.config, background_course=True)
+        self.sim.add_observer(self.on_sim_event)
+        
+        # Optionally record every run for replays and regression tests
+        if self.config.get('replay_dir'):
+            self.sim.add_observer(InputRecorder(self.sim, self.config['replay_dir']))
+        
+        # Assets are loaded in the background once the window is up
+        self.assets_path = "asssets"  # Using existing folder name
+        self.bg_image = None
+        self.loading_stage = ""
+        self.loading_progress = 0.0
+        
+        # Rendering - "dirty" only repaints what changed while playing
+        self.render_mode = self.config.get('render_mode', 'full')
+        self.show_fps = self.config.get('show_fps', False)
+        self.dirty_renderer = None  # Created once the background is loaded
+        self.fill_pixels = 0  # Pixels pushed to the display last frame
+        
+        # Per-phase frame timings (toggle with F4), written out when the game closes
+        self.profiler = FrameProfiler()
+        self.profile_export = self.config.get('profile_export')
+        self.profiler_overlay = None  # Rendered overlay, refreshed a few times a second
+        self.profiler_overlay_frame = 0
+        
+        # The simulation steps SIM_RATE times a second; frames are drawn as fast as
+        # max_fps (0 = uncapped) and vsync allow, part way between the last two steps
+        self.max_fps = self.config.get('max_fps', 0)
+        self.lag = 0.0  # Steps (0-1) the drawn world trails the simulation
+        self.pacing = FramePacing()
+        
+        # Fonts - try to use bold fonts for Mario Kart style
+        try:
+            # Try to use a bold system font
+            self.font_large = pygame.font.Font(None, 96)
+            self.font_large.set_bold(True)
+            self.font_medium = pygame.font.Font(None, 56)
+            self.font_medium.set_bold(True)
+            self.font_small = pygame.font.Font(None, 36)
+        except:
+            # Fallback to default fonts
+            self.font_large = pygame.font.Font(None, 96)
+            self.font_medium = pygame.font.Font(None, 56)
+            self.font_small = pygame.font.Font(None, 36)
+        
+        self.font_tiny = pygame.font.Font(None, 28)
+        
+        # Rendered text is cached across frames and screens
+        self.text_cache = TextCache()
+        
+        # Animation timer for start screen effects
+        self.start_screen_timer = 0
+        self.start_screen_layer = None  # Static start screen, built on first draw
+        self.start_instructions_bottom = 0
+        self.gameover_layer = None  # Darkened last frame and results, built on the first game over draw
         
         # Volume control
         volume_settings = self.load_volume_settings()
         self.volume = volume_settings.get('volume', 0.7)  # 0.0 to 1.0
         self.muted = volume_settings.get('muted', False)
-        self.volume_slider_rect = None
-        self.mute_button_rect = None
+        # Mute button in the top right corner with padding, slider below it matching its width
+        mute_button_rect = pygame.Rect(self.screen_width - 40 - 15, 10, 40, 40)
+        self.mute_button = MuteButton(mute_button_rect)
+        self.volume_slider = VolumeSlider(pygame.Rect(mute_button_rect.x, mute_button_rect.bottom + 5,
+                                                      mute_button_rect.width, 8))
         self.slider_dragging = False
         
         # Level dropdown
         self.dropdown_open = False
-        self.level_dropdown_rect = None
-        self.level_option_rects = []
+        self.level_dropdown = LevelDropdown(self.screen_width, self.font_small, self.text_cache)
+        
+        # Controls on the current screen, hit-tested as one for mouse events
+        self.widgets = WidgetLayer()
         
         # Sounds
-        self.sounds = {}
-        self.load_sounds()
+        self.sound_paths = {}
+        
+        # Show something right away, then load the rest behind a progress bar
+        self.draw_loading_screen()
+        self.startup.mark("first frame (loading screen)")
+        self.load_in_background()
+        if self.render_mode == 'dirty':
+            self.dirty_renderer = DirtyRectRenderer(self.screen, self.make_background())
+        self.state = "start"
+        
+        if self.config.get('show_profiler', False):
+            self.toggle_profiler()
+    
+    def load_in_background(self):
+        """Load assets on a worker thread while the window shows a progress bar
+
+        The worker only reads and decodes files. Each stage is then finished
+        on this thread (converting images for the display, starting the
+        mixer), since pygame's display and mixer aren't safe to use while
+        another thread draws.
+        """
+        stages = [
+            ("sprites", self.load_assets, self.prepare_sprites),
+            ("background", self.load_background, self.prepare_background),
+            ("sounds", self.load_sounds, self.start_sounds),
+        ]
+        loaded = []  # Stages the worker is done with, in order
+        errors = []
+        
+        def load():
+            try:
+                for name, stage, _ in stages:
+                    self.loading_stage = name
+                    stage()
+                    self.startup.mark(f"load {name} (background thread)")
+                    loaded.append(name)
+            except BaseException as error:
+                errors.append(error)
+        
+        loader = threading.Thread(target=load, name="asset-loader", daemon=True)
+        loader.start()
+        finished = 0
+        while loader.is_alive() or finished < len(loaded):
+            while finished < len(loaded):
+                name, _, finish = stages[finished]
+                finish()
+                self.startup.mark(f"prepare {name}")
+                finished += 1
+                self.loading_progress = finished / len(stages)
+            # Keep the window responsive; closing it quits once loading is done
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit_requested = True
+            self.draw_loading_screen()
+            loader.join(1 / 60)
+        if errors:
+            raise errors[0]
+    
+    def draw_loading_screen(self):
+        """Title and a progress bar for the current loading stage"""
+        self.screen.fill((135, 206, 235))  # Sky blue
+        center_x = self.screen_width // 2
+        center_y = self.screen_height // 2
+        self.blit_shadowed_text(self.font_large, "FLAPPY BIRD", (255, 215, 0), (0, 0, 0), ((3, 3),),
+                                center=(center_x, center_y - 80))
+        
+        bar = pygame.Rect(0, 0, 400, 24)
+        bar.center = (center_x, center_y + 20)
+        pygame.draw.rect(self.screen, (255, 255, 255), bar)
+        filled = bar.copy()
+        filled.width = int(bar.width * self.loading_progress)
+        pygame.draw.rect(self.screen, (255, 100, 0), filled)
+        pygame.draw.rect(self.screen, (0, 0, 0), bar, 3)
+        
+        label = f"Loading {self.loading_stage}..." if self.loading_stage else "Loading..."
+        self.blit_shadowed_text(self.font_small, label, (0, 0, 0), (255, 255, 255), ((1, 1),),
+                                center=(center_x, center_y + 65))
+        pygame.display.flip()
     
     def load_assets(self):
         """Load game assets"""
@@ -508,19 +3136,51 @@ class Game:
             self.fireball_image_path = fireball_path
         else:
             self.fireball_image_path = None
+        
+        # Decode every sprite up front so spawning mid-game never touches the disk
+        self.sprites = SpriteAtlas()
+        for path in (self.bird_image_path, self.enemy_image_path,
+                     self.coin_image_path, self.fireball_image_path):
+            if path:
+                self.sprites.decode(path)
+    
+    def prepare_sprites(self):
+        """Convert and scale every sprite for the display (main thread)"""
+        width = self.screen_width
+        fireball_size = self.config.get('fireball_size', 40)
+        for entity in (Bird(0, 0, self.config['bird_size'], 0, 0),
+                       Enemy(0, 0, self.config['enemy_size'], 0, width),
+                       Coin(0, 0, self.config.get('coin_size', 30), 0, width),
+                       FireballCollectible(0, 0, fireball_size, 0, width),
+                       FireballProjectile(0, 0, fireball_size, 0, width)):
+            self.attach_sprite(entity)
     
     def load_background(self):
-        """Load background image"""
+        """Load and scale background image"""
         bg_path = os.path.join(self.assets_path, "images", "map.png")
         if os.path.exists(bg_path):
             try:
-                img = pygame.image.load(bg_path).convert()
+                img = pygame.image.load(bg_path)
                 self.bg_image = pygame.transform.scale(img, (self.screen_width, self.screen_height))
             except:
                 self.bg_image = None
         else:
             self.bg_image = None
     
+    def prepare_background(self):
+        """Convert the background image for the display (main thread)"""
+        if self.bg_image:
+            self.bg_image = self.bg_image.convert()
+    
+    def make_background(self):
+        """Full-screen background surface to repaint dirty areas from"""
+        background = pygame.Surface((self.screen_width, self.screen_height)).convert()
+        if self.bg_image:
+            background.blit(self.bg_image, (0, 0))
+        else:
+            background.fill((135, 206, 235))  # Sky blue
+        return background
+    
     def load_sounds(self):
         """Load game sounds"""
         sound_files = {
@@ -534,18 +3194,18 @@ class Game:
             'enemy_die': 'enemy_die.wav'
         }
         
+        # Effects are decoded when they first play, keeping startup fast
         for sound_name, filename in sound_files.items():
             sound_path = os.path.join(self.assets_path, "sounds", filename)
             if os.path.exists(sound_path):
-                try:
-                    self.sounds[sound_name] = pygame.mixer.Sound(sound_path)
-                except:
-                    pass
+                self.sound_paths[sound_name] = sound_path
+    
+    def start_sounds(self):
+        """Reserve mixer channels and start the music (main thread)"""
+        self.sound_manager = SoundManager(self.sound_paths, self.volume, self.muted)
         
-        # Play background music with volume
-        if 'bg' in self.sounds:
-            self.sounds['bg'].set_volume(self.volume if not self.muted else 0.0)
-            self.sounds['bg'].play(-1)  # Loop background music
+        # Stream background music with volume
+        self.sound_manager.play_music('bg')  # Loop background music
     
     def load_high_score(self):
         """Load high score from file"""
@@ -559,12 +3219,8 @@ class Game:
         return 0
     
     def save_high_score(self):
-        """Save high score to file"""
-        try:
-            with open('high_score.json', 'w') as f:
-                json.dump({'high_score': self.high_score}, f)
-        except:
-            pass
+        """Save high score to file (in the background)"""
+        self.settings_writer.save('high_score.json', {'high_score': self.high_score})
     
     def load_volume_settings(self):
         """Load volume settings from file"""
@@ -581,16 +3237,12 @@ class Game:
         return {'volume': 0.7, 'muted': False}  # Default settings
     
     def save_volume_settings(self):
-        """Save volume settings to file"""
-        try:
-            settings = {
-                'volume': self.volume,
-                'muted': self.muted
-            }
-            with open('settings.json', 'w') as f:
-                json.dump(settings, f)
-        except:
-            pass
+        """Save volume settings to file (in the background)"""
+        settings = {
+            'volume': self.volume,
+            'muted': self.muted
+        }
+        self.settings_writer.save('settings.json', settings)
     
     def set_volume(self, volume):
         """Set volume for all sounds"""
@@ -604,1349 +3256,292 @@ class Game:
             # When volume increases from 0, automatically unmute
             self.muted = False
         
-        actual_volume = 0.0 if self.muted else self.volume
-        
         # Set volume for all sounds
-        for sound in self.sounds.values():
-            sound.set_volume(actual_volume)
+        self.sound_manager.set_master(self.volume, self.muted)
         
         self.save_volume_settings()
     
     def toggle_mute(self):
         """Toggle mute state"""
         self.muted = not self.muted
-        actual_volume = 0.0 if self.muted else self.volume
         
         # Set volume for all sounds
-        for sound in self.sounds.values():
-            sound.set_volume(actual_volume)
+        self.sound_manager.set_master(self.volume, self.muted)
         
         self.save_volume_settings()
     
+    def attach_sprite(self, entity):
+        """Give a newly spawned entity its shared sprite"""
+        if isinstance(entity, Bird):
+            image_path = self.bird_image_path
+        elif isinstance(entity, Enemy):
+            image_path = self.enemy_image_path
+        elif isinstance(entity, Coin):
+            image_path = self.coin_image_path
+        else:
+            image_path = self.fireball_image_path
+        if image_path:
+            self.sprites.apply(entity, image_path)
+    
+    def play_sound(self, sound_name):
+        """Play a sound effect at the current volume"""
+        self.sound_manager.play(sound_name)
+    
+    def on_sim_event(self, event, payload):
+        """React to simulation events with sprites and sounds"""
+        if event == 'spawn':
+            self.attach_sprite(payload)
+        elif event == 'gameover':
+            self.game_over()
+        elif event in SOUND_CATEGORIES:  # Other events (reset, config) make no sound
+            self.play_sound(event)
+    
     def shoot_fireball(self):
         """Shoot a fireball projectile if player has ammo"""
-        if self.fireball_ammo > 0 and self.bird and self.bird.rect:
-            # Give Mario a small upward boost when shooting to help stay afloat
-            # Use 60% of flap strength so shooting provides lift but not as much as flapping
-            shoot_boost = self.level_config['flap_strength'] * 0.6
-            # Apply boost: if falling (negative velocity), set to boost value; if rising, add boost
-            if self.bird.velocity < 0:
-                self.bird.velocity = shoot_boost
-            else:
-                self.bird.velocity += shoot_boost * 0.3  # Smaller boost if already rising
-            self.bird.has_flapped = True  # Ensure gravity is enabled
-            
-            # Create fireball projectile at bird position
-            fireball_size = self.config.get('fireball_size', 40)
-            fireball_speed = 8  # Fast projectile speed
-            fireball = FireballProjectile(
-                self.bird.x + self.bird.size // 2,
-                self.bird.y,
-                fireball_size,
-                fireball_speed,
-                self.screen_width
-            )
-            if self.fireball_image_path:
-                fireball.load_image(self.fireball_image_path)
-            self.fireball_projectiles.append(fireball)
-            self.fireball_ammo -= 1
-            
-            # Play fireball shoot sound with higher volume
-            if 'fireball_shoot' in self.sounds:
-                if self.muted:
-                    fireball_shoot_volume = 0.0
-                else:
-                    fireball_shoot_volume = max(0.6, self.volume * 2.0)  # At least 60% or 2x master volume
-                    fireball_shoot_volume = min(1.0, fireball_shoot_volume)  # Cap at 100%
-                self.sounds['fireball_shoot'].set_volume(fireball_shoot_volume)
-                self.sounds['fireball_shoot'].play()
+        self.sim.shoot_fireball()
+    
+    def toggle_profiler(self):
+        """Start or stop timing each phase of the frame"""
+        if self.profiler.enabled:
+            self.profiler.disable()
+        else:
+            self.profiler.enable(self.profile_phases())
+            self.profiler_overlay = None
+    
+    def profile_phases(self):
+        """(phase name, object, method name) for each part of a frame worth timing"""
+        return [
+            ('events', self, 'handle_events'),
+            ('update', self, 'update'),
+        ] + self.sim.profile_phases() + [
+            ('draw', self, 'draw'),
+            ('world', self, 'draw_world'),
+            ('hud', self, 'draw_hud'),
+            ('volume', self, 'draw_volume_controls'),
+            ('volume', self.widgets, 'draw'),
+            ('menus', self, 'draw_start_screen'),
+            ('menus', self, 'draw_gameover_screen'),
+            ('counters', self, 'draw_fps_counter'),
+            ('counters', self, 'draw_profiler_overlay'),
+            ('present', self, 'present'),
+        ]
     
     def start_game(self):
         """Initialize game objects"""
         self.state = "playing"
-        self.score = 0
-        self.coins_collected = 0  # Reset coins collected
         self.dropdown_open = False  # Close dropdown when starting game
         
-        # Update level config based on selected level
-        self.level_config = self.config['levels'][self.current_level]
-        
-        # Create bird (reset has_flapped flag)
-        bird_x = self.screen_width // 4
-        bird_y = self.screen_height // 2
-        bird_size = self.config['bird_size']
-        self.bird = Bird(bird_x, bird_y, bird_size, 
-                        self.level_config['gravity'], 
-                        self.level_config['flap_strength'])
-        self.bird.has_flapped = False  # Bird won't fall until first flap
-        
-        if self.bird_image_path:
-            self.bird.load_image(self.bird_image_path)
-        
-        # Clear walls, enemies, coins, and fireballs
-        self.walls = []
-        self.enemies = []
-        self.coins = []
-        self.fireball_collectibles = []
-        self.fireball_projectiles = []
-        self.fireball_ammo = 0  # Reset fireball ammo
-        self.wall_timer = 0
-        self.enemy_timer = 0
-        self.coin_timer = 0
-        self.coin_cluster_timer = 0
-        self.fireball_collectible_timer = 0
-        self.last_wall_x = self.screen_width
-    
-    def handle_events(self):
-        """Handle pygame events"""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
-            
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    if self.state == "start":
-                        self.dropdown_open = False  # Close dropdown when starting
-                        self.start_game()
-                    elif self.state == "playing":
-                        # Check if shift is held to shoot fireball
-                        keys = pygame.key.get_pressed()
-                        if keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]:
-                            self.shoot_fireball()
-                        else:
-                            self.bird.flap()
-                            if 'flap' in self.sounds:
-                                self.sounds['flap'].set_volume(0.0 if self.muted else self.volume)
-                                self.sounds['flap'].play()
-                    elif self.state == "gameover":
-                        self.dropdown_open = False  # Close dropdown when restarting
-                        self.start_game()
-                elif event.key == pygame.K_f:  # F key to shoot fireball
-                    if self.state == "playing":
-                        self.shoot_fireball()
-            
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:  # Left mouse button
-                    mouse_x, mouse_y = pygame.mouse.get_pos()
-                    
-                    # Check volume controls (available in all states)
-                    if self.mute_button_rect and self.mute_button_rect.collidepoint(mouse_x, mouse_y):
-                        self.toggle_mute()
-                    elif self.volume_slider_rect and self.volume_slider_rect.collidepoint(mouse_x, mouse_y):
-                        self.slider_dragging = True
-                        # Update volume based on click position
-                        slider_x = mouse_x - self.volume_slider_rect.x
-                        slider_width = self.volume_slider_rect.width
-                        new_volume = max(0.0, min(1.0, slider_x / slider_width))
-                        self.set_volume(new_volume)
-                    # Check dropdown options FIRST to prevent start button from being triggered
-                    elif self.state == "start" and self.level_dropdown_rect and self.dropdown_open:
-                        # Check if clicking on a dropdown option
-                        level_selected = False
-                        for i, option_rect in enumerate(self.level_option_rects):
-                            if option_rect.collidepoint(mouse_x, mouse_y):
-                                self.current_level = i
-                                self.level_config = self.config['levels'][self.current_level]
-                                self.dropdown_open = False
-                                level_selected = True
-                                break
-                        
-                        # If clicked on dropdown button, toggle it
-                        if not level_selected and self.level_dropdown_rect.collidepoint(mouse_x, mouse_y):
-                            self.dropdown_open = False
-                        # If clicked outside dropdown area, close it
-                        elif not level_selected:
-                            clicked_in_dropdown_area = False
-                            for option_rect in self.level_option_rects:
-                                if option_rect.collidepoint(mouse_x, mouse_y):
-                                    clicked_in_dropdown_area = True
-                                    break
-                            
-                            if not clicked_in_dropdown_area:
-                                self.dropdown_open = False
-                    # Check start button (only if dropdown option wasn't clicked)
-                    elif self.state == "start":
-                        button_rect = pygame.Rect(self.screen_width // 2 - 120, 
-                                                 self.screen_height // 2 + 30, 
-                                                 240, 70)
-                        if button_rect.collidepoint(mouse_x, mouse_y):
-                            # Close dropdown if open
-                            if self.dropdown_open:
-                                self.dropdown_open = False
-                            self.start_game()
-                        # Check level dropdown button (only if not clicking start button and dropdown not open)
-                        elif self.level_dropdown_rect and not self.dropdown_open:
-                            # Open dropdown if clicking on button
-                            if self.level_dropdown_rect.collidepoint(mouse_x, mouse_y):
-                                self.dropdown_open = True
-                    # Check level dropdown for gameover state
-                    elif self.state == "gameover" and self.level_dropdown_rect:
-                        if self.dropdown_open:
-                            # Check if clicking on an option
-                            level_selected = False
-                            for i, option_rect in enumerate(self.level_option_rects):
-                                if option_rect.collidepoint(mouse_x, mouse_y):
-                                    self.current_level = i
-                                    self.level_config = self.config['levels'][self.current_level]
-                                    self.dropdown_open = False
-                                    level_selected = True
-                                    break
-                            
-                            # If clicked on dropdown button, toggle it
-                            if not level_selected and self.level_dropdown_rect.collidepoint(mouse_x, mouse_y):
-                                self.dropdown_open = False
-                            # If clicked outside dropdown area, close it
-                            elif not level_selected:
-                                clicked_in_dropdown_area = False
-                                for option_rect in self.level_option_rects:
-                                    if option_rect.collidepoint(mouse_x, mouse_y):
-                                        clicked_in_dropdown_area = True
-                                        break
-                                
-                                if not clicked_in_dropdown_area:
-                                    self.dropdown_open = False
-                        else:
-                            # Open dropdown if clicking on button
-                            if self.level_dropdown_rect.collidepoint(mouse_x, mouse_y):
-                                self.dropdown_open = True
-                    elif self.state == "playing":
-                        self.bird.flap()
-                        if 'flap' in self.sounds:
-                            self.sounds['flap'].set_volume(0.0 if self.muted else self.volume)
-                            self.sounds['flap'].play()
-                    elif self.state == "gameover":
-                        # Close dropdown if open
-                        if self.dropdown_open:
-                            self.dropdown_open = False
-                        self.start_game()
-            
-            if event.type == pygame.MOUSEBUTTONUP:
-                if event.button == 1:
-                    self.slider_dragging = False
-            
-            if event.type == pygame.MOUSEMOTION:
-                if self.slider_dragging and self.volume_slider_rect:
-                    mouse_x, mouse_y = pygame.mouse.get_pos()
-                    slider_x = mouse_x - self.volume_slider_rect.x
-                    slider_width = self.volume_slider_rect.width
-                    new_volume = max(0.0, min(1.0, slider_x / slider_width))
-                    self.set_volume(new_volume)
-        
-        return True
-    
-    def update(self):
-        """Update game logic"""
-        if self.state != "playing":
-            return
-        
-        # Update bird
-        self.bird.update()
-        
-        # Check bird boundaries
-        if self.bird.y < 0 or self.bird.y > self.screen_height:
-            self.game_over()
-            return
-        
-        # Update walls - spawn based on spacing, not just timer
-        should_spawn = False
-        if len(self.walls) == 0:
-            # Spawn first wall
-            should_spawn = True
-        else:
-            # Check if last wall has moved far enough
-            last_wall = max(self.walls, key=lambda w: w.x) if self.walls else None
-            if last_wall and last_wall.x < self.screen_width - self.level_config['wall_spacing']:
-                should_spawn = True
-        
-        if should_spawn:
-            new_wall = Wall(self.screen_width, self.screen_height,
-                          self.level_config['wall_gap_size'],
-                          self.config['wall_width'],
-                          self.level_config['wall_speed'],
-                          self.config['bird_size'] + 20)  # Ensure gap > bird size
-            self.walls.append(new_wall)
-            self.last_wall_x = self.screen_width
-        
-        for wall in self.walls[:]:
-            wall.update()
-            
-            # Check collision
-            top_rect, bottom_rect = wall.get_rects()
-            if self.bird.rect and (top_rect.colliderect(self.bird.rect) or 
-                                  bottom_rect.colliderect(self.bird.rect)):
-                self.game_over()
-                return
-            
-            # Check if bird passed wall
-            if not wall.passed and wall.x + self.config['wall_width'] < self.bird.x:
-                wall.passed = True
-                self.score += 1
-            
-            # Remove off-screen walls
-            if wall.is_off_screen():
-                self.walls.remove(wall)
-        
-        # Update enemies
-        self.enemy_timer += 1
-        if self.enemy_timer >= self.level_config['enemy_spawn_rate']:
-            self.enemy_timer = 0
-            # Spawn enemy from right side, random Y position
-            enemy_y = random.randint(50, self.screen_height - 50)
-            enemy = Enemy(self.screen_width, enemy_y,
-                         self.config['enemy_size'],
-                         self.level_config['enemy_speed'],
-                         self.screen_width)
-            if self.enemy_image_path:
-                enemy.load_image(self.enemy_image_path)
-            self.enemies.append(enemy)
-        
-        for enemy in self.enemies[:]:
-            enemy.update(self.bird.y)
-            
-            # Check collision
-            if self.bird.rect and enemy.rect and self.bird.rect.colliderect(enemy.rect):
-                self.game_over()
-                return
-            
-            # Remove off-screen enemies
-            if enemy.is_off_screen():
-                self.enemies.remove(enemy)
-        
-        # Update coins - spawn single coins more frequently
-        self.coin_timer += 1
-        if self.coin_timer >= 120:  # Spawn coins more frequently (reduced from 200)
-            self.coin_timer = 0
-            
-            # Try to spawn a coin in a safe location (preferably in pipe gaps)
-            coin_size = self.config.get('coin_size', 30)
-            bird_size = self.config['bird_size']
-            # Adaptive clearance padding - smaller gaps need less padding
-            max_attempts = 40  # More attempts to find a good spot
-            coin_spawned = False
-            
-            # First, try to spawn in pipe gaps (safest locations)
-            gap_positions = []
-            for wall in self.walls:
-                if wall.x > self.screen_width - 300:  # Only consider walls that are coming soon
-                    gap_top, gap_bottom = wall.get_gap_area()
-                    gap_height = gap_bottom - gap_top
-                    
-                    # Adaptive clearance padding based on gap size
-                    if gap_height >= 250:
-                        clearance_padding = 25  # Easy level - more padding
-                    elif gap_height >= 230:
-                        clearance_padding = 20  # Medium level - moderate padding
-                    else:
-                        clearance_padding = 15  # Hard level - minimal padding
-                    
-                    # Minimum gap height with adaptive padding
-                    min_gap_height = bird_size + coin_size + (clearance_padding * 2)
-                    
-                    # Gap must be large enough for Mario + coin + clearance
-                    if gap_height >= min_gap_height:
-                        # Calculate safe spawn area within gap (with padding from edges)
-                        safe_top = gap_top + clearance_padding
-                        safe_bottom = gap_bottom - clearance_padding
-                        
-                        # Ensure safe area is still large enough
-                        if safe_bottom - safe_top >= coin_size + bird_size:
-                            # Spawn in center of safe area
-                            safe_center = (safe_top + safe_bottom) // 2
-                            gap_positions.append((safe_center, wall.x, gap_top, gap_bottom, gap_height, clearance_padding))
-            
-            # Try gap positions first
-            for coin_y, wall_x, gap_top, gap_bottom, gap_height, clearance_padding in gap_positions:
-                coin_x = self.screen_width
-                
-                # Coin is already positioned in safe area (between safe_top and safe_bottom)
-                # which accounts for clearance_padding, so we don't need additional safe_margin checks
-                coin_top = coin_y - coin_size // 2
-                coin_bottom = coin_y + coin_size // 2
-                
-                # Verify coin is within the safe area we calculated
-                safe_top = gap_top + clearance_padding
-                safe_bottom = gap_bottom - clearance_padding
-                
-                if coin_top < safe_top or coin_bottom > safe_bottom:
-                    continue  # Coin outside safe area
-                
-                # Check if Mario can collect it safely (Mario above and below coin)
-                # Use the gap boundaries for space calculation
-                mario_top_space = coin_top - gap_top
-                mario_bottom_space = gap_bottom - coin_bottom
-                
-                # Need at least bird_size space on each side for Mario to collect
-                # Reduced requirement - just need bird_size, not bird_size + padding
-                if mario_top_space < bird_size or mario_bottom_space < bird_size:
-                    continue  # Not enough space for Mario to collect
-                
-                # Check if this position is safe from enemies
-                temp_coin_rect = pygame.Rect(coin_x - coin_size // 2, coin_y - coin_size // 2, 
-                                           coin_size, coin_size)
-                
-                too_close_to_enemy = False
-                enemy_safe_margin = 40  # Fixed margin for enemy checking
-                for enemy in self.enemies:
-                    if enemy.rect:
-                        enemy_check_rect = enemy.rect.inflate(enemy_safe_margin * 2, enemy_safe_margin * 2)
-                        if temp_coin_rect.colliderect(enemy_check_rect):
-                            too_close_to_enemy = True
-                            break
-                
-                if too_close_to_enemy:
-                    continue
-                
-                # Check if coin will be blocked by upcoming walls as it moves
-                will_be_blocked = False
-                for wall in self.walls:
-                    if wall.x > coin_x - 400:  # Check walls that will be near the coin's path
-                        top_rect, bottom_rect = wall.get_rects()
-                        # Check multiple positions along coin's path
-                        for check_x in range(int(coin_x), int(coin_x - 300), -20):
-                            future_coin_rect = pygame.Rect(check_x - coin_size // 2, coin_y - coin_size // 2,
-                                                         coin_size, coin_size)
-                            if future_coin_rect.colliderect(top_rect) or future_coin_rect.colliderect(bottom_rect):
-                                will_be_blocked = True
-                                break
-                        if will_be_blocked:
-                            break
-                    
-                    if will_be_blocked:
-                        break
-                
-                if not will_be_blocked:
-                    # Safe position found, spawn coin
-                    coin = Coin(coin_x, coin_y,
-                              coin_size,
-                              self.level_config['wall_speed'],
-                              self.screen_width)
-                    if self.coin_image_path:
-                        coin.load_image(self.coin_image_path)
-                    self.coins.append(coin)
-                    coin_spawned = True
-                    break
-            
-            # If no gap position worked, try random positions with adaptive checks
-            if not coin_spawned:
-                for attempt in range(max_attempts):
-                    coin_y = random.randint(150, self.screen_height - 150)
-                    coin_x = self.screen_width
-                    
-                    coin_top = coin_y - coin_size // 2
-                    coin_bottom = coin_y + coin_size // 2
-                    
-                    # Check collision with walls/pipes with adaptive clearance
-                    too_close_to_wall = False
-                    for wall in self.walls:
-                        top_rect, bottom_rect = wall.get_rects()
-                        gap_top, gap_bottom = wall.get_gap_area()
-                        gap_height = gap_bottom - gap_top
-                        
-                        # Adaptive clearance padding based on gap size
-                        if gap_height >= 250:
-                            adaptive_clearance = 25
-                        elif gap_height >= 230:
-                            adaptive_clearance = 20
-                        else:
-                            adaptive_clearance = 15
-                        
-                        # Check if coin overlaps with pipes
-                        coin_rect = pygame.Rect(coin_x - coin_size // 2, coin_y - coin_size // 2, 
-                                              coin_size, coin_size)
-                        if coin_rect.colliderect(top_rect) or coin_rect.colliderect(bottom_rect):
-                            too_close_to_wall = True
-                            break
-                        
-                        # If coin is in gap, check clearance with adaptive padding
-                        if gap_top < coin_y < gap_bottom:
-                            safe_top = gap_top + adaptive_clearance
-                            safe_bottom = gap_bottom - adaptive_clearance
-                            
-                            if coin_top < safe_top or coin_bottom > safe_bottom:
-                                too_close_to_wall = True
-                                break
-                            
-                            # Check Mario clearance - just need bird_size on each side
-                            mario_top_space = coin_top - gap_top
-                            mario_bottom_space = gap_bottom - coin_bottom
-                            if mario_top_space < bird_size or mario_bottom_space < bird_size:
-                                too_close_to_wall = True
-                                break
-                    
-                    if too_close_to_wall:
-                        continue
-                    
-                    # Check if coin will be blocked by upcoming walls
-                    will_be_blocked = False
-                    for wall in self.walls:
-                        if wall.x > coin_x - 500:  # Check walls in coin's path
-                            top_rect, bottom_rect = wall.get_rects()
-                            gap_top, gap_bottom = wall.get_gap_area()
-                            gap_height = gap_bottom - gap_top
-                            
-                            # Adaptive clearance padding for path checking
-                            if gap_height >= 250:
-                                path_clearance = 25
-                            elif gap_height >= 230:
-                                path_clearance = 20
-                            else:
-                                path_clearance = 15
-                            
-                            # Check multiple positions along coin's path
-                            for check_x in range(int(coin_x), int(coin_x - 400), -20):
-                                future_coin_rect = pygame.Rect(check_x - coin_size // 2, coin_y - coin_size // 2,
-                                                             coin_size, coin_size)
-                                if future_coin_rect.colliderect(top_rect) or future_coin_rect.colliderect(bottom_rect):
-                                    will_be_blocked = True
-                                    break
-                                
-                                # If in gap, check clearance with adaptive padding
-                                if gap_top < coin_y < gap_bottom:
-                                    safe_top = gap_top + path_clearance
-                                    safe_bottom = gap_bottom - path_clearance
-                                    future_top = coin_y - coin_size // 2
-                                    future_bottom = coin_y + coin_size // 2
-                                    if future_top < safe_top or future_bottom > safe_bottom:
-                                        will_be_blocked = True
-                                        break
-                            
-                            if will_be_blocked:
-                                break
-                    
-                    if will_be_blocked:
-                        continue
-                    
-                    # Check collision with enemies
-                    too_close_to_enemy = False
-                    enemy_safe_margin = 40  # Fixed margin for enemy checking
-                    for enemy in self.enemies:
-                        if enemy.rect:
-                            enemy_check_rect = enemy.rect.inflate(enemy_safe_margin * 2, enemy_safe_margin * 2)
-                            coin_rect = pygame.Rect(coin_x - coin_size // 2, coin_y - coin_size // 2, 
-                                                  coin_size, coin_size)
-                            if coin_rect.colliderect(enemy_check_rect):
-                                too_close_to_enemy = True
-                                break
-                    
-                    if too_close_to_enemy:
-                        continue
-                    
-                    # Safe position found, spawn coin
-                    coin = Coin(coin_x, coin_y,
-                              coin_size,
-                              self.level_config['wall_speed'],
-                              self.screen_width)
-                    if self.coin_image_path:
-                        coin.load_image(self.coin_image_path)
-                    self.coins.append(coin)
-                    coin_spawned = True
-                    break
-            
-            # If we couldn't find a safe spot after max attempts, skip this spawn
-            # (Better to skip than spawn in a bad location)
-        
-        # Update coin clusters - spawn clusters less frequently than single coins
-        self.coin_cluster_timer += 1
-        if self.coin_cluster_timer >= 300:  # Spawn clusters every 300 frames
-            self.coin_cluster_timer = 0
-            
-            coin_size = self.config.get('coin_size', 30)
-            bird_size = self.config['bird_size']
-            cluster_size = random.randint(3, 5)  # 3-5 coins per cluster
-            coin_spacing = coin_size + 15  # Spacing between coins in cluster
-            cluster_spawned = False
-            
-            # Try to spawn cluster in pipe gaps
-            gap_positions = []
-            for wall in self.walls:
-                if wall.x > self.screen_width - 300:
-                    gap_top, gap_bottom = wall.get_gap_area()
-                    gap_height = gap_bottom - gap_top
-                    
-                    # Adaptive clearance padding based on gap size
-                    if gap_height >= 250:
-                        clearance_padding = 25  # Easy level - more padding
-                    elif gap_height >= 230:
-                        clearance_padding = 20  # Medium level - moderate padding
-                    else:
-                        clearance_padding = 15  # Hard level - minimal padding
-                    
-                    # Need enough space for cluster (cluster height + Mario clearance)
-                    cluster_height = (cluster_size - 1) * coin_spacing + coin_size
-                    min_gap_for_cluster = bird_size + cluster_height + (clearance_padding * 2)
-                    
-                    if gap_height >= min_gap_for_cluster:
-                        # Calculate safe spawn area
-                        safe_top = gap_top + clearance_padding
-                        safe_bottom = gap_bottom - clearance_padding
-                        
-                        if safe_bottom - safe_top >= cluster_height + bird_size:
-                            # Center of safe area
-                            safe_center = (safe_top + safe_bottom) // 2
-                            gap_positions.append((safe_center, wall.x, gap_top, gap_bottom, gap_height, clearance_padding))
-            
-            # Try to spawn cluster in gaps
-            for cluster_y, wall_x, gap_top, gap_bottom, gap_height, clearance_padding in gap_positions:
-                cluster_x = self.screen_width
-                
-                # Cluster is already positioned in safe area (between safe_top and safe_bottom)
-                # which accounts for clearance_padding
-                safe_top = gap_top + clearance_padding
-                safe_bottom = gap_bottom - clearance_padding
-                
-                # Calculate cluster bounds
-                cluster_height = (cluster_size - 1) * coin_spacing + coin_size
-                cluster_top = cluster_y - cluster_height // 2
-                cluster_bottom = cluster_y + cluster_height // 2
-                
-                # Verify cluster is within the safe area
-                if cluster_top < safe_top or cluster_bottom > safe_bottom:
-                    continue
-                
-                # Check if Mario can collect safely
-                # Use gap boundaries for space calculation
-                mario_top_space = cluster_top - gap_top
-                mario_bottom_space = gap_bottom - cluster_bottom
-                
-                # Need at least bird_size space on each side
-                if mario_top_space < bird_size or mario_bottom_space < bird_size:
-                    continue
-                
-                # Check if cluster position is safe from enemies
-                cluster_rect = pygame.Rect(cluster_x - coin_size // 2, cluster_top,
-                                         coin_size, cluster_height)
-                
-                too_close_to_enemy = False
-                enemy_safe_margin = 40  # Fixed margin for enemy checking
-                for enemy in self.enemies:
-                    if enemy.rect:
-                        enemy_check_rect = enemy.rect.inflate(enemy_safe_margin * 2, enemy_safe_margin * 2)
-                        if cluster_rect.colliderect(enemy_check_rect):
-                            too_close_to_enemy = True
-                            break
-                
-                if too_close_to_enemy:
-                    continue
-                
-                # Check if cluster will be blocked by upcoming walls
-                will_be_blocked = False
-                for wall in self.walls:
-                    if wall.x > cluster_x - 400:
-                        top_rect, bottom_rect = wall.get_rects()
-                        for check_x in range(int(cluster_x), int(cluster_x - 300), -20):
-                            future_cluster_rect = pygame.Rect(check_x - coin_size // 2, cluster_top,
-                                                            coin_size, cluster_height)
-                            if future_cluster_rect.colliderect(top_rect) or future_cluster_rect.colliderect(bottom_rect):
-                                will_be_blocked = True
-                                break
-                        if will_be_blocked:
-                            break
-                
-                if not will_be_blocked:
-                    # Spawn cluster - arrange coins vertically
-                    start_y = cluster_y - (cluster_size - 1) * coin_spacing // 2
-                    for i in range(cluster_size):
-                        coin_y = start_y + i * coin_spacing
-                        coin = Coin(cluster_x, coin_y,
-                                  coin_size,
-                                  self.level_config['wall_speed'],
-                                  self.screen_width)
-                        if self.coin_image_path:
-                            coin.load_image(self.coin_image_path)
-                        self.coins.append(coin)
-                    cluster_spawned = True
-                    break
-            
-            # If no gap position worked, try random positions with adaptive checks
-            if not cluster_spawned:
-                for attempt in range(20):
-                    cluster_y = random.randint(200, self.screen_height - 200)
-                    cluster_x = self.screen_width
-                    
-                    cluster_height = (cluster_size - 1) * coin_spacing + coin_size
-                    cluster_top = cluster_y - cluster_height // 2
-                    cluster_bottom = cluster_y + cluster_height // 2
-                    
-                    # Check collision with walls/pipes with adaptive clearance
-                    too_close_to_wall = False
-                    for wall in self.walls:
-                        top_rect, bottom_rect = wall.get_rects()
-                        gap_top, gap_bottom = wall.get_gap_area()
-                        gap_height = gap_bottom - gap_top
-                        
-                        # Adaptive clearance padding based on gap size
-                        if gap_height >= 250:
-                            adaptive_clearance = 25
-                        elif gap_height >= 230:
-                            adaptive_clearance = 20
-                        else:
-                            adaptive_clearance = 15
-                        
-                        cluster_rect = pygame.Rect(cluster_x - coin_size // 2, cluster_top,
-                                                 coin_size, cluster_height)
-                        if cluster_rect.colliderect(top_rect) or cluster_rect.colliderect(bottom_rect):
-                            too_close_to_wall = True
-                            break
-                        
-                        # If cluster is in gap, check clearance with adaptive padding
-                        if gap_top < cluster_y < gap_bottom:
-                            safe_top = gap_top + adaptive_clearance
-                            safe_bottom = gap_bottom - adaptive_clearance
-                            
-                            if cluster_top < safe_top or cluster_bottom > safe_bottom:
-                                too_close_to_wall = True
-                                break
-                            
-                            # Check Mario clearance - just need bird_size on each side
-                            mario_top_space = cluster_top - gap_top
-                            mario_bottom_space = gap_bottom - cluster_bottom
-                            if mario_top_space < bird_size or mario_bottom_space < bird_size:
-                                too_close_to_wall = True
-                                break
-                    
-                    if too_close_to_wall:
-                        continue
-                    
-                    # Check if cluster will be blocked
-                    will_be_blocked = False
-                    for wall in self.walls:
-                        if wall.x > cluster_x - 500:
-                            top_rect, bottom_rect = wall.get_rects()
-                            gap_top, gap_bottom = wall.get_gap_area()
-                            gap_height = gap_bottom - gap_top
-                            
-                            # Adaptive clearance padding for path checking
-                            if gap_height >= 250:
-                                path_clearance = 25
-                            elif gap_height >= 230:
-                                path_clearance = 20
-                            else:
-                                path_clearance = 15
-                            
-                            for check_x in range(int(cluster_x), int(cluster_x - 400), -20):
-                                future_cluster_rect = pygame.Rect(check_x - coin_size // 2, cluster_top,
-                                                                coin_size, cluster_height)
-                                if future_cluster_rect.colliderect(top_rect) or future_cluster_rect.colliderect(bottom_rect):
-                                    will_be_blocked = True
-                                    break
-                                
-                                if gap_top < cluster_y < gap_bottom:
-                                    safe_top = gap_top + path_clearance
-                                    safe_bottom = gap_bottom - path_clearance
-                                    if cluster_top < safe_top or cluster_bottom > safe_bottom:
-                                        will_be_blocked = True
-                                        break
-                            
-                            if will_be_blocked:
-                                break
-                    
-                    if will_be_blocked:
-                        continue
-                    
-                    # Check enemies (use a reasonable fixed margin for enemy checking)
-                    too_close_to_enemy = False
-                    cluster_rect = pygame.Rect(cluster_x - coin_size // 2, cluster_top,
-                                             coin_size, cluster_height)
-                    enemy_safe_margin = 40  # Fixed margin for enemy checking
-                    for enemy in self.enemies:
-                        if enemy.rect:
-                            enemy_check_rect = enemy.rect.inflate(enemy_safe_margin * 2, enemy_safe_margin * 2)
-                            if cluster_rect.colliderect(enemy_check_rect):
-                                too_close_to_enemy = True
-                                break
-                    
-                    if too_close_to_enemy:
-                        continue
-                    
-                    # Spawn cluster
-                    start_y = cluster_y - (cluster_size - 1) * coin_spacing // 2
-                    for i in range(cluster_size):
-                        coin_y = start_y + i * coin_spacing
-                        coin = Coin(cluster_x, coin_y,
-                                  coin_size,
-                                  self.level_config['wall_speed'],
-                                  self.screen_width)
-                        if self.coin_image_path:
-                            coin.load_image(self.coin_image_path)
-                        self.coins.append(coin)
-                    cluster_spawned = True
-                    break
-        
-        # Update fireball collectibles
-        self.fireball_collectible_timer += 1
-        if self.fireball_collectible_timer >= 400:  # Spawn fireball collectibles less frequently
-            self.fireball_collectible_timer = 0
-            
-            # Try to spawn a fireball collectible in a safe location (preferably in pipe gaps)
-            fireball_size = self.config.get('fireball_size', 40)
-            bird_size = self.config['bird_size']
-            # Adaptive clearance padding - smaller gaps need less padding
-            max_attempts = 40  # More attempts to find a good spot
-            fireball_spawned = False
-            
-            # First, try to spawn in pipe gaps (safest locations)
-            gap_positions = []
-            for wall in self.walls:
-                if wall.x > self.screen_width - 300:  # Only consider walls that are coming soon
-                    gap_top, gap_bottom = wall.get_gap_area()
-                    gap_height = gap_bottom - gap_top
-                    
-                    # Adaptive clearance padding based on gap size
-                    if gap_height >= 250:
-                        clearance_padding = 25  # Easy level - more padding
-                    elif gap_height >= 230:
-                        clearance_padding = 20  # Medium level - moderate padding
-                    else:
-                        clearance_padding = 15  # Hard level - minimal padding
-                    
-                    # Minimum gap height with adaptive padding
-                    min_gap_height = bird_size + fireball_size + (clearance_padding * 2)
-                    
-                    # Gap must be large enough for Mario + fireball + clearance
-                    if gap_height >= min_gap_height:
-                        # Calculate safe spawn area within gap (with padding from edges)
-                        safe_top = gap_top + clearance_padding
-                        safe_bottom = gap_bottom - clearance_padding
-                        
-                        # Ensure safe area is still large enough
-                        if safe_bottom - safe_top >= fireball_size + bird_size:
-                            # Spawn in center of safe area
-                            safe_center = (safe_top + safe_bottom) // 2
-                            gap_positions.append((safe_center, wall.x, gap_top, gap_bottom, gap_height, clearance_padding))
-            
-            # Try gap positions first
-            for fireball_y, wall_x, gap_top, gap_bottom, gap_height, clearance_padding in gap_positions:
-                fireball_x = self.screen_width
-                
-                # Fireball is already positioned in safe area (between safe_top and safe_bottom)
-                # which accounts for clearance_padding, so we don't need additional safe_margin checks
-                fireball_top = fireball_y - fireball_size // 2
-                fireball_bottom = fireball_y + fireball_size // 2
-                
-                # Verify fireball is within the safe area we calculated
-                safe_top = gap_top + clearance_padding
-                safe_bottom = gap_bottom - clearance_padding
-                
-                if fireball_top < safe_top or fireball_bottom > safe_bottom:
-                    continue  # Fireball outside safe area
-                
-                # Check if Mario can collect it safely (Mario above and below fireball)
-                # Use the gap boundaries for space calculation
-                mario_top_space = fireball_top - gap_top
-                mario_bottom_space = gap_bottom - fireball_bottom
-                
-                # Need at least bird_size space on each side for Mario to collect
-                # Reduced requirement - just need bird_size, not bird_size + padding
-                if mario_top_space < bird_size or mario_bottom_space < bird_size:
-                    continue  # Not enough space for Mario to collect
-                
-                # Check if this position is safe from enemies
-                temp_fireball_rect = pygame.Rect(fireball_x - fireball_size // 2, fireball_y - fireball_size // 2,
-                                               fireball_size, fireball_size)
-                
-                too_close_to_enemy = False
-                enemy_safe_margin = 40  # Fixed margin for enemy checking
-                for enemy in self.enemies:
-                    if enemy.rect:
-                        enemy_check_rect = enemy.rect.inflate(enemy_safe_margin * 2, enemy_safe_margin * 2)
-                        if temp_fireball_rect.colliderect(enemy_check_rect):
-                            too_close_to_enemy = True
-                            break
-                
-                if too_close_to_enemy:
-                    continue
-                
-                # Check if fireball will be blocked by upcoming walls as it moves
-                will_be_blocked = False
-                for wall in self.walls:
-                    if wall.x > fireball_x - 400:  # Check walls that will be near the fireball's path
-                        top_rect, bottom_rect = wall.get_rects()
-                        gap_check_top, gap_check_bottom = wall.get_gap_area()
-                        gap_check_height = gap_check_bottom - gap_check_top
-                        
-                        # Adaptive clearance padding for path checking
-                        if gap_check_height >= 250:
-                            path_clearance = 25
-                        elif gap_check_height >= 230:
-                            path_clearance = 20
-                        else:
-                            path_clearance = 15
-                        
-                        # Check multiple positions along fireball's path
-                        for check_x in range(int(fireball_x), int(fireball_x - 300), -20):
-                            future_fireball_rect = pygame.Rect(check_x - fireball_size // 2, fireball_y - fireball_size // 2,
-                                                             fireball_size, fireball_size)
-                            if future_fireball_rect.colliderect(top_rect) or future_fireball_rect.colliderect(bottom_rect):
-                                will_be_blocked = True
-                                break
-                            
-                            # Check clearance in gap with adaptive padding
-                            if gap_check_top < fireball_y < gap_check_bottom:
-                                safe_top = gap_check_top + path_clearance
-                                safe_bottom = gap_check_bottom - path_clearance
-                                future_top = fireball_y - fireball_size // 2
-                                future_bottom = fireball_y + fireball_size // 2
-                                if future_top < safe_top or future_bottom > safe_bottom:
-                                    will_be_blocked = True
-                                    break
-                        if will_be_blocked:
-                            break
-                    
-                    if will_be_blocked:
-                        break
-                
-                if not will_be_blocked:
-                    # Safe position found, spawn fireball collectible
-                    fireball_collectible = FireballCollectible(
-                        fireball_x, fireball_y,
-                        fireball_size,
-                        self.level_config['wall_speed'],
-                        self.screen_width
-                    )
-                    if self.fireball_image_path:
-                        fireball_collectible.load_image(self.fireball_image_path)
-                    self.fireball_collectibles.append(fireball_collectible)
-                    fireball_spawned = True
-                    break
-            
-            # If no gap position worked, try random positions with adaptive checks
-            if not fireball_spawned:
-                for attempt in range(max_attempts):
-                    fireball_y = random.randint(150, self.screen_height - 150)
-                    fireball_x = self.screen_width
-                    
-                    fireball_top = fireball_y - fireball_size // 2
-                    fireball_bottom = fireball_y + fireball_size // 2
-                    
-                    # Check collision with walls/pipes with adaptive clearance
-                    too_close_to_wall = False
-                    for wall in self.walls:
-                        top_rect, bottom_rect = wall.get_rects()
-                        gap_top, gap_bottom = wall.get_gap_area()
-                        gap_height = gap_bottom - gap_top
-                        
-                        # Adaptive clearance padding based on gap size
-                        if gap_height >= 250:
-                            adaptive_clearance = 25
-                        elif gap_height >= 230:
-                            adaptive_clearance = 20
-                        else:
-                            adaptive_clearance = 15
-                        
-                        # Check if fireball overlaps with pipes
-                        fireball_rect = pygame.Rect(fireball_x - fireball_size // 2, fireball_y - fireball_size // 2,
-                                                  fireball_size, fireball_size)
-                        if fireball_rect.colliderect(top_rect) or fireball_rect.colliderect(bottom_rect):
-                            too_close_to_wall = True
-                            break
-                        
-                        # If fireball is in gap, check clearance with adaptive padding
-                        if gap_top < fireball_y < gap_bottom:
-                            safe_top = gap_top + adaptive_clearance
-                            safe_bottom = gap_bottom - adaptive_clearance
-                            
-                            if fireball_top < safe_top or fireball_bottom > safe_bottom:
-                                too_close_to_wall = True
-                                break
-                            
-                            # Check Mario clearance - just need bird_size on each side
-                            mario_top_space = fireball_top - gap_top
-                            mario_bottom_space = gap_bottom - fireball_bottom
-                            if mario_top_space < bird_size or mario_bottom_space < bird_size:
-                                too_close_to_wall = True
-                                break
-                    
-                    if too_close_to_wall:
-                        continue
-                    
-                    # Check if fireball will be blocked by upcoming walls
-                    will_be_blocked = False
-                    for wall in self.walls:
-                        if wall.x > fireball_x - 500:  # Check walls in fireball's path
-                            top_rect, bottom_rect = wall.get_rects()
-                            gap_top, gap_bottom = wall.get_gap_area()
-                            gap_height = gap_bottom - gap_top
-                            
-                            # Adaptive clearance padding for path checking
-                            if gap_height >= 250:
-                                path_clearance = 25
-                            elif gap_height >= 230:
-                                path_clearance = 20
-                            else:
-                                path_clearance = 15
-                            
-                            # Check multiple positions along fireball's path
-                            for check_x in range(int(fireball_x), int(fireball_x - 400), -20):
-                                future_fireball_rect = pygame.Rect(check_x - fireball_size // 2, fireball_y - fireball_size // 2,
-                                                                 fireball_size, fireball_size)
-                                if future_fireball_rect.colliderect(top_rect) or future_fireball_rect.colliderect(bottom_rect):
-                                    will_be_blocked = True
-                                    break
-                                
-                                # If in gap, check clearance with adaptive padding
-                                if gap_top < fireball_y < gap_bottom:
-                                    safe_top = gap_top + path_clearance
-                                    safe_bottom = gap_bottom - path_clearance
-                                    future_top = fireball_y - fireball_size // 2
-                                    future_bottom = fireball_y + fireball_size // 2
-                                    if future_top < safe_top or future_bottom > safe_bottom:
-                                        will_be_blocked = True
-                                        break
-                            
-                            if will_be_blocked:
-                                break
-                    
-                    if will_be_blocked:
-                        continue
-                    
-                    # Check collision with enemies
-                    too_close_to_enemy = False
-                    enemy_safe_margin = 40  # Fixed margin for enemy checking
-                    for enemy in self.enemies:
-                        if enemy.rect:
-                            enemy_check_rect = enemy.rect.inflate(enemy_safe_margin * 2, enemy_safe_margin * 2)
-                            fireball_rect = pygame.Rect(fireball_x - fireball_size // 2, fireball_y - fireball_size // 2,
-                                                      fireball_size, fireball_size)
-                            if fireball_rect.colliderect(enemy_check_rect):
-                                too_close_to_enemy = True
-                                break
-                    
-                    if too_close_to_enemy:
-                        continue
-                    
-                    # Safe position found, spawn fireball collectible
-                    fireball_collectible = FireballCollectible(
-                        fireball_x, fireball_y,
-                        fireball_size,
-                        self.level_config['wall_speed'],
-                        self.screen_width
-                    )
-                    if self.fireball_image_path:
-                        fireball_collectible.load_image(self.fireball_image_path)
-                    self.fireball_collectibles.append(fireball_collectible)
-                    fireball_spawned = True
-                    break
-        
-        for fireball_collectible in self.fireball_collectibles[:]:
-            fireball_collectible.update()
-            
-            # Check collision with bird
-            if self.bird.rect and fireball_collectible.rect and self.bird.rect.colliderect(fireball_collectible.rect) and not fireball_collectible.collected:
-                fireball_collectible.collected = True
-                self.fireball_ammo += 1  # Add fireball ammo
-                # Play fireball collect sound with higher volume
-                if 'fireball_collect' in self.sounds:
-                    if self.muted:
-                        fireball_collect_volume = 0.0
-                    else:
-                        fireball_collect_volume = max(0.6, self.volume * 2.0)  # At least 60% or 2x master volume
-                        fireball_collect_volume = min(1.0, fireball_collect_volume)  # Cap at 100%
-                    self.sounds['fireball_collect'].set_volume(fireball_collect_volume)
-                    self.sounds['fireball_collect'].play()
-                self.fireball_collectibles.remove(fireball_collectible)
-            
-            # Remove off-screen fireball collectibles
-            elif fireball_collectible.is_off_screen():
-                self.fireball_collectibles.remove(fireball_collectible)
+        self.sim.reset(self.current_level)
         
-        # Update fireball projectiles
-        for fireball in self.fireball_projectiles[:]:
-            fireball.update()
+        # The previous screen is still on the display, repaint everything once
+        if self.dirty_renderer:
+            self.dirty_renderer.invalidate()
+    
+    def handle_events(self):
+        """Handle pygame events"""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
             
-            # Check collision with enemies
-            for enemy in self.enemies[:]:
-                if fireball.rect and enemy.rect and fireball.rect.colliderect(enemy.rect):
-                    # Enemy hit! Remove both fireball and enemy
-                    self.fireball_projectiles.remove(fireball)
-                    self.enemies.remove(enemy)
-                    self.score += 10  # Bonus points for killing enemy
-                    # Play enemy die sound with higher volume
-                    if 'enemy_die' in self.sounds:
-                        if self.muted:
-                            enemy_die_volume = 0.0
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    if self.state == "start":
+                        self.dropdown_open = False  # Close dropdown when starting
+                        self.start_game()
+                    elif self.state == "playing":
+                        # Check if shift is held to shoot fireball
+                        keys = pygame.key.get_pressed()
+                        if keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]:
+                            self.shoot_fireball()
                         else:
-                            enemy_die_volume = max(0.6, self.volume * 2.0)  # At least 60% or 2x master volume
-                            enemy_die_volume = min(1.0, enemy_die_volume)  # Cap at 100%
-                        self.sounds['enemy_die'].set_volume(enemy_die_volume)
-                        self.sounds['enemy_die'].play()
-                    break
+                            self.sim.flap()
+                    elif self.state == "gameover":
+                        self.dropdown_open = False  # Close dropdown when restarting
+                        self.start_game()
+                elif event.key == pygame.K_f:  # F key to shoot fireball
+                    if self.state == "playing":
+                        self.shoot_fireball()
+                elif event.key == pygame.K_F3:  # F3 toggles the FPS/fill-rate counter
+                    self.show_fps = not self.show_fps
+                elif event.key == pygame.K_F4:  # F4 toggles the frame profiler
+                    self.toggle_profiler()
             
-            # Remove off-screen fireballs
-            if fireball.is_off_screen():
-                self.fireball_projectiles.remove(fireball)
-        
-        for coin in self.coins[:]:
-            coin.update()
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if event.button == 1:  # Left mouse button
+                    mouse_x, mouse_y = pygame.mouse.get_pos()
+                    target, value = self.widgets.hit((mouse_x, mouse_y))
+                    
+                    # Volume controls are available in all states
+                    if target == 'mute':
+                        self.toggle_mute()
+                    elif target == 'volume':
+                        self.slider_dragging = True
+                        # Update volume based on click position
+                        self.set_volume(self.volume_slider.value_at(mouse_x))
+                    elif self.state == "playing":
+                        self.sim.flap()
+                    # With the dropdown open any click closes it, clicking an option also selects that level
+                    # (checked FIRST so an option over the start button doesn't start the game)
+                    elif self.dropdown_open:
+                        if target == 'level':
+                            self.current_level = value
+                        self.dropdown_open = False
+                    elif target == 'level_dropdown':
+                        self.dropdown_open = True
+                    elif self.state == "start" and self.get_start_button_rect().collidepoint(mouse_x, mouse_y):
+                        self.start_game()
             
-            # Check collision with bird
-            if self.bird.rect and coin.rect and self.bird.rect.colliderect(coin.rect) and not coin.collected:
-                coin.collected = True
-                self.score += 5  # Coins worth 5 points
-                self.coins_collected += 1  # Track coin collection
-                # Play coin collection sound with higher volume
-                if 'coin' in self.sounds:
-                    # Increase coin sound volume significantly (make it much louder)
-                    # Use at least 0.5 volume even if master volume is low, or 2x master volume
-                    if self.muted:
-                        coin_volume = 0.0
-                    else:
-                        coin_volume = max(0.5, self.volume * 2.0)  # At least 50% or 2x master volume
-                        coin_volume = min(1.0, coin_volume)  # Cap at 100%
-                    self.sounds['coin'].set_volume(coin_volume)
-                    self.sounds['coin'].play()
-                self.coins.remove(coin)
+            if event.type == pygame.MOUSEBUTTONUP:
+                if event.button == 1:
+                    self.slider_dragging = False
             
-            # Remove off-screen coins
-            elif coin.is_off_screen():
-                self.coins.remove(coin)
+            if event.type == pygame.MOUSEMOTION:
+                if self.slider_dragging:
+                    mouse_x, mouse_y = pygame.mouse.get_pos()
+                    self.set_volume(self.volume_slider.value_at(mouse_x))
+        
+        return True
+    
+    def update(self):
+        """Advance the simulation while playing"""
+        if self.config_path and pygame.time.get_ticks() // 500 != self.config_check_tick:
+            self.config_check_tick = pygame.time.get_ticks() // 500  # Check twice a second
+            self.reload_config()
+        if self.state != "playing":
+            return
+        self.sim.step()
+    
+    def reload_config(self):
+        """Apply config.json if it changed; an invalid file is reported and the old settings kept"""
+        try:
+            mtime = os.path.getmtime(self.config_path)
+            if mtime == self.config_mtime:
+                return
+            self.config_mtime = mtime
+            config = load_config(self.config_path)
+        except (OSError, ValueError) as e:  # ConfigError and bad JSON are ValueErrors
+            print(f"config.json not reloaded: {e}")
+            return
+        if len(config['levels']) <= max(self.current_level, self.sim.level_index):
+            print("config.json not reloaded: the current level was removed (restart to apply)")
+            return
+        # The window and sprites are sized once at startup
+        resized = [key for key in SCREEN_SCHEMA if config.get(key) != self.config.get(key)]
+        if resized:
+            print(f"config.json: {', '.join(resized)} apply after a restart")
+            for key in resized:
+                if key in self.config:
+                    config[key] = self.config[key]
+                else:
+                    del config[key]
+        self.config = config
+        self.sim.reload_config(config)
+        print("config.json reloaded")
     
     def game_over(self):
         """Handle game over"""
         self.state = "gameover"
-        if self.score > self.high_score:
-            self.high_score = self.score
+        self.gameover_layer = None  # Built from the final frame on the next draw
+        if self.sim.score > self.high_score:
+            self.high_score = self.sim.score
             self.save_high_score()
         
-        if 'gameover' in self.sounds:
-            self.sounds['gameover'].set_volume(0.0 if self.muted else self.volume)
-            self.sounds['gameover'].play()
+        self.play_sound('gameover')
     
-    def draw_level_dropdown(self, y_position):
-        """Draw level selection dropdown"""
-        # Get current level name and calculate text width
-        current_level_name = self.config['levels'][self.current_level]['name']
-        level_text = self.font_small.render(f"Level: {current_level_name}", True, (255, 255, 255))
-        text_width = level_text.get_width()
-        
-        # Calculate dropdown width dynamically based on current text + arrow space
-        # Padding values for visual balance
-        left_padding = 15  # Padding on left side
-        arrow_spacing = 15  # Equal space before and after arrow
-        arrow_size = 8  # Size of arrow
-        # Total space needed: left padding + text + arrow spacing + arrow + arrow spacing
-        total_right_space = arrow_spacing + arrow_size + arrow_spacing
-        
-        dropdown_width = text_width + left_padding + total_right_space
-        dropdown_height = 40
-        dropdown_x = self.screen_width // 2 - dropdown_width // 2
-        dropdown_y = y_position
-        
-        # Main dropdown button
-        self.level_dropdown_rect = pygame.Rect(dropdown_x, dropdown_y, dropdown_width, dropdown_height)
-        
-        # Button background
-        button_color = (60, 60, 60) if not self.dropdown_open else (80, 80, 80)
-        pygame.draw.rect(self.screen, button_color, self.level_dropdown_rect)
-        pygame.draw.rect(self.screen, (255, 255, 255), self.level_dropdown_rect, 2)
+    def render_text(self, font, text, color):
+        """Cached font.render(text, True, color)"""
+        return self.text_cache.render(font, text, color)
+    
+    def blit_shadowed_text(self, font, text, color, shadow_color, shadow_offsets, surface=None, **position):
+        """Blit cached text with drop shadows (to the screen by default); position places the text rect"""
+        if surface is None:
+            surface = self.screen
+        text_rect = self.render_text(font, text, color).get_rect(**position)
+        shadowed = self.text_cache.shadowed(font, text, color, shadow_color, shadow_offsets)
+        return surface.blit(shadowed, text_rect.topleft)
+    
+    def update_widgets(self):
+        """Bring the UI controls up to date with the game state and show the ones on this screen"""
+        self.mute_button.set_state(self.muted)
+        self.volume_slider.set_state((self.volume, self.muted))
+        if self.state == "playing":
+            self.widgets.show([self.mute_button, self.volume_slider])
+            return
         
-        # Current level text - positioned with left padding
-        text_start_x = dropdown_x + left_padding
-        text_center_x = text_start_x + text_width // 2
-        level_text_rect = level_text.get_rect(centerx=text_center_x, centery=self.level_dropdown_rect.centery)
-        self.screen.blit(level_text, level_text_rect)
-        
-        # Dropdown arrow - positioned with equal space before and after
-        # Text ends at: text_start_x + text_width
-        # Arrow center: text_end + arrow_spacing + arrow_size/2
-        text_end_x = text_start_x + text_width
-        arrow_x = text_end_x + arrow_spacing + arrow_size // 2
-        arrow_y = dropdown_y + dropdown_height // 2
-        
-        if self.dropdown_open:
-            # Arrow pointing up (v)
-            arrow_points = [
-                (arrow_x, arrow_y - arrow_size // 2),
-                (arrow_x - arrow_size, arrow_y + arrow_size // 2),
-                (arrow_x + arrow_size, arrow_y + arrow_size // 2)
-            ]
-        else:
-            # Arrow pointing down (^)
-            arrow_points = [
-                (arrow_x, arrow_y + arrow_size // 2),
-                (arrow_x - arrow_size, arrow_y - arrow_size // 2),
-                (arrow_x + arrow_size, arrow_y - arrow_size // 2)
-            ]
-        pygame.draw.polygon(self.screen, (255, 255, 255), arrow_points)
-        
-        # Draw dropdown options if open
-        if self.dropdown_open:
-            # Calculate max width needed for all options
-            max_option_width = dropdown_width
-            for level in self.config['levels']:
-                option_text_test = self.font_small.render(level['name'], True, (255, 255, 255))
-                option_width = option_text_test.get_width() + left_padding + total_right_space
-                max_option_width = max(max_option_width, option_width)
-            
-            # Use the wider of dropdown width or max option width
-            final_dropdown_width = max(dropdown_width, max_option_width)
-            
-            # If width changed, recalculate positions
-            if final_dropdown_width > dropdown_width:
-                dropdown_x = self.screen_width // 2 - final_dropdown_width // 2
-                # Update dropdown rect
-                self.level_dropdown_rect = pygame.Rect(dropdown_x, dropdown_y, final_dropdown_width, dropdown_height)
-                # Redraw button background with new width
-                pygame.draw.rect(self.screen, button_color, self.level_dropdown_rect)
-                pygame.draw.rect(self.screen, (255, 255, 255), self.level_dropdown_rect, 2)
-                # Redraw text with left padding
-                text_start_x = dropdown_x + left_padding
-                text_center_x = text_start_x + text_width // 2
-                level_text_rect = level_text.get_rect(centerx=text_center_x, centery=self.level_dropdown_rect.centery)
-                self.screen.blit(level_text, level_text_rect)
-                # Redraw arrow with equal spacing before and after
-                text_end_x = text_start_x + text_width
-                arrow_x = text_end_x + arrow_spacing + arrow_size // 2
-                arrow_points = [
-                    (arrow_x, arrow_y - arrow_size // 2),
-                    (arrow_x - arrow_size, arrow_y + arrow_size // 2),
-                    (arrow_x + arrow_size, arrow_y + arrow_size // 2)
-                ]
-                pygame.draw.polygon(self.screen, (255, 255, 255), arrow_points)
-            else:
-                final_dropdown_width = dropdown_width
-            
-            option_height = 35
-            self.level_option_rects = []
-            
-            for i, level in enumerate(self.config['levels']):
-                option_y = dropdown_y + dropdown_height + (i * option_height)
-                option_rect = pygame.Rect(dropdown_x, option_y, final_dropdown_width, option_height)
-                self.level_option_rects.append(option_rect)
-                
-                # Highlight selected level
-                if i == self.current_level:
-                    pygame.draw.rect(self.screen, (100, 150, 200), option_rect)
-                else:
-                    pygame.draw.rect(self.screen, (40, 40, 40), option_rect)
-                
-                pygame.draw.rect(self.screen, (200, 200, 200), option_rect, 1)
-                
-                # Level name text - centered
-                level_name = level['name']
-                option_text = self.font_small.render(level_name, True, (255, 255, 255))
-                option_text_rect = option_text.get_rect(centerx=option_rect.centerx, centery=option_rect.centery)
-                self.screen.blit(option_text, option_text_rect)
+        if self.state == "start":
+            dropdown_y = self.screen_height // 2 - 20
         else:
-            self.level_option_rects = []
+            # Positioned with proper spacing above restart text (accounting for dropdown height when open)
+            dropdown_y = self.screen_height // 2 + 85
+        level_names = tuple(level['name'] for level in self.config['levels'])
+        self.level_dropdown.set_state((dropdown_y, level_names, self.current_level, self.dropdown_open))
+        self.widgets.show([self.level_dropdown, self.mute_button, self.volume_slider])
+    
+    def draw_level_dropdown(self):
+        """Draw level selection dropdown"""
+        return self.level_dropdown.draw(self.screen)
     
     def draw_volume_controls(self):
-        """Draw volume control UI (mute button and slider)"""
-        # Mute button (top right corner with padding)
-        button_size = 40
-        padding = 15  # Space from right edge
-        button_x = self.screen_width - button_size - padding
-        button_y = 10
-        self.mute_button_rect = pygame.Rect(button_x, button_y, button_size, button_size)
+        """Draw volume control UI (mute button and slider), returns the rects drawn"""
+        return [self.mute_button.draw(self.screen), self.volume_slider.draw(self.screen)]
+    
+    def draw_start_screen(self):
+        """Draw Mario Kart themed start screen"""
+        # Static layers are rendered once, only animated and interactive parts are drawn per frame
+        if self.start_screen_layer is None or self.start_screen_layer.get_size() != self.screen.get_size():
+            self.start_screen_layer = self.build_start_screen_layer()
+        self.screen.blit(self.start_screen_layer, (0, 0))
         
-        # Draw mute button background
-        button_color = (200, 50, 50) if self.muted else (100, 150, 100)
-        pygame.draw.rect(self.screen, button_color, self.mute_button_rect)
-        pygame.draw.rect(self.screen, (0, 0, 0), self.mute_button_rect, 3)
+        # Pulsing effect for button
+        button_x, button_y, button_width, button_height = self.get_start_button_rect()
+        pulse = int(math.sin(self.start_screen_timer * 0.1) * 5)
+        if pulse > 0:
+            highlight_rect = pygame.Rect(button_x - pulse, button_y - pulse, 
+                                       button_width + pulse * 2, button_height + pulse * 2)
+            pygame.draw.rect(self.screen, (255, 255, 0, 50), highlight_rect, 3)
         
-        # Draw mute/unmute icon (standard speaker icon)
-        icon_x = button_x + button_size // 2
-        icon_y = button_y + button_size // 2
-        icon_color = (255, 255, 255)
+        # Level dropdown - drawn AFTER start button so it appears on top when open
+        self.draw_level_dropdown()
         
-        if self.muted:
-            # Draw muted icon: speaker cone + X
-            # Speaker cone (triangle pointing right)
-            speaker_base_left = icon_x - 10
-            speaker_base_top = icon_y - 6
-            speaker_base_bottom = icon_y + 6
-            speaker_apex_x = icon_x - 2
-            speaker_apex_y = icon_y
-            
-            # Draw speaker cone
-            speaker_points = [
-                (speaker_base_left, speaker_base_top),
-                (speaker_base_left, speaker_base_bottom),
-                (speaker_apex_x, speaker_apex_y)
-            ]
-            pygame.draw.polygon(self.screen, icon_color, speaker_points)
-            
-            # Draw small circle at apex (speaker center)
-            pygame.draw.circle(self.screen, icon_color, (speaker_apex_x, speaker_apex_y), 2)
-            
-            # Draw X symbol (diagonal lines)
-            x_start_x = icon_x + 2
-            x_start_y = icon_y - 5
-            x_end_x = icon_x + 8
-            x_end_y = icon_y + 5
-            
-            # First diagonal line
-            pygame.draw.line(self.screen, icon_color, 
-                           (x_start_x, x_start_y), (x_end_x, x_end_y), 3)
-            # Second diagonal line
-            pygame.draw.line(self.screen, icon_color, 
-                           (x_start_x, x_end_y), (x_end_x, x_start_y), 3)
-        else:
-            # Draw unmuted icon: speaker cone + sound waves
-            # Speaker cone (triangle pointing right)
-            speaker_base_left = icon_x - 10
-            speaker_base_top = icon_y - 6
-            speaker_base_bottom = icon_y + 6
-            speaker_apex_x = icon_x - 2
-            speaker_apex_y = icon_y
-            
-            # Draw speaker cone
-            speaker_points = [
-                (speaker_base_left, speaker_base_top),
-                (speaker_base_left, speaker_base_bottom),
-                (speaker_apex_x, speaker_apex_y)
-            ]
-            pygame.draw.polygon(self.screen, icon_color, speaker_points)
-            
-            # Draw small circle at apex (speaker center)
-            pygame.draw.circle(self.screen, icon_color, (speaker_apex_x, speaker_apex_y), 2)
-            
-            # Draw sound waves (curved lines emanating from speaker) - smaller for balance
-            wave_start_x = icon_x
-            wave_center_y = icon_y
-            
-            # First wave (smallest)
-            wave1_rect = pygame.Rect(wave_start_x - 1, wave_center_y - 2, 4, 4)
-            pygame.draw.arc(self.screen, icon_color, wave1_rect, -math.pi/4, math.pi/4, 2)
+        # High score with golden trophy style (moved down to make room for instructions)
+        if self.high_score > 0:
+            hs_y = self.start_instructions_bottom + 40  # Increased spacing below instructions panel
+            # Trophy icon (simple star)
+            star_points = []
+            star_size = 20
+            center_x, center_y = self.screen_width // 2 - 80, hs_y
+            for i in range(10):
+                angle = i * math.pi / 5
+                if i % 2 == 0:
+                    r = star_size
+                else:
+                    r = star_size // 2
+                x = center_x + r * math.cos(angle - math.pi / 2)
+                y = center_y + r * math.sin(angle - math.pi / 2)
+                star_points.append((x, y))
+            pygame.draw.polygon(self.screen, (255, 215, 0), star_points)
+            pygame.draw.polygon(self.screen, (255, 255, 255), star_points, 2)
             
-            # Second wave (medium)
-            wave2_rect = pygame.Rect(wave_start_x + 1, wave_center_y - 3, 5, 6)
-            pygame.draw.arc(self.screen, icon_color, wave2_rect, -math.pi/3, math.pi/3, 2)
+            hs_text_str = f"Best Score: {self.high_score}"
             
-            # Third wave (largest)
-            wave3_rect = pygame.Rect(wave_start_x + 3, wave_center_y - 4, 6, 8)
-            pygame.draw.arc(self.screen, icon_color, wave3_rect, -math.pi/2.5, math.pi/2.5, 2)
-        
-        # Volume slider (below mute button, matching button width exactly)
-        slider_y = button_y + button_size + 5
-        slider_width = button_size  # Match button width exactly
-        slider_x = button_x  # Align left edge with button (right edges will match)
-        slider_height = 8
-        self.volume_slider_rect = pygame.Rect(slider_x, slider_y, slider_width, slider_height)
-        
-        # Draw slider track
-        pygame.draw.rect(self.screen, (100, 100, 100), self.volume_slider_rect)
-        pygame.draw.rect(self.screen, (0, 0, 0), self.volume_slider_rect, 2)
-        
-        # Draw filled portion based on volume
-        fill_width = int(slider_width * self.volume)
-        if fill_width > 0:
-            fill_rect = pygame.Rect(slider_x, slider_y, fill_width, slider_height)
-            fill_color = (100, 200, 100) if not self.muted else (150, 150, 150)
-            pygame.draw.rect(self.screen, fill_color, fill_rect)
+            # Bright golden yellow with a strong shadow for better readability
+            self.blit_shadowed_text(self.font_small, hs_text_str, (255, 240, 100), (0, 0, 0), ((3, 3),),
+                                    center=(self.screen_width // 2, hs_y))
         
-        # Draw slider handle
-        handle_x = slider_x + int(slider_width * self.volume)
-        handle_y = slider_y + slider_height // 2
-        handle_radius = 8
-        handle_color = (200, 200, 200) if not self.muted else (100, 100, 100)
-        pygame.draw.circle(self.screen, handle_color, (handle_x, handle_y), handle_radius)
-        pygame.draw.circle(self.screen, (0, 0, 0), (handle_x, handle_y), handle_radius, 2)
+        # Draw volume controls
+        self.draw_volume_controls()
     
-    def draw_start_screen(self):
-        """Draw Mario Kart themed start screen"""
+    def get_start_button_rect(self):
+        """START button area on the start screen"""
+        return pygame.Rect(self.screen_width // 2 - 120, self.screen_height // 2 + 30, 240, 70)
+    
+    def build_start_screen_layer(self):
+        """Render the static start screen: background, title, START button and instructions"""
+        layer = pygame.Surface((self.screen_width, self.screen_height)).convert()
+        
         # Background
         if self.bg_image:
-            self.screen.blit(self.bg_image, (0, 0))
+            layer.blit(self.bg_image, (0, 0))
         else:
             # Mario Kart style gradient background
             for y in range(self.screen_height):
@@ -1954,14 +3549,14 @@ class Game:
                 r = int(135 + (200 - 135) * color_ratio)
                 g = int(206 + (230 - 206) * color_ratio)
                 b = int(235 + (255 - 235) * color_ratio)
-                pygame.draw.line(self.screen, (r, g, b), (0, y), (self.screen_width, y))
+                pygame.draw.line(layer, (r, g, b), (0, y), (self.screen_width, y))
         
         # Draw decorative checkered border at top
         checker_size = 20
         for x in range(0, self.screen_width, checker_size * 2):
-            pygame.draw.rect(self.screen, (255, 255, 0), 
+            pygame.draw.rect(layer, (255, 255, 0), 
                            (x, 0, checker_size, checker_size))
-            pygame.draw.rect(self.screen, (255, 0, 0), 
+            pygame.draw.rect(layer, (255, 0, 0), 
                            (x + checker_size, 0, checker_size, checker_size))
         
         # Main title with Mario Kart colors - centered properly
@@ -1984,9 +3579,9 @@ class Game:
             word_width = word_widths[word_idx]
             
             # Render shadow for entire word first (properly aligned)
-            word_shadow_surf = self.font_large.render(word, True, (0, 0, 0))
+            word_shadow_surf = self.render_text(self.font_large, word, (0, 0, 0))
             word_shadow_rect = word_shadow_surf.get_rect(midleft=(current_x + 3, title_y + 3))
-            self.screen.blit(word_shadow_surf, word_shadow_rect)
+            layer.blit(word_shadow_surf, word_shadow_rect)
             
             # Render each character with alternating colors
             char_x_offset = 0
@@ -1994,15 +3589,15 @@ class Game:
                 char_width = self.font_large.size(char)[0]
                 
                 # Shadow for each character (aligned with word shadow)
-                char_shadow = self.font_large.render(char, True, (0, 0, 0))
+                char_shadow = self.render_text(self.font_large, char, (0, 0, 0))
                 char_shadow_rect = char_shadow.get_rect(midleft=(current_x + char_x_offset + 3, title_y + 3))
-                self.screen.blit(char_shadow, char_shadow_rect)
+                layer.blit(char_shadow, char_shadow_rect)
                 
                 # Main character - alternating yellow and red
                 char_color = (255, 220, 0) if char_index % 2 == 0 else (255, 0, 0)
-                char_surf = self.font_large.render(char, True, char_color)
+                char_surf = self.render_text(self.font_large, char, char_color)
                 char_rect = char_surf.get_rect(midleft=(current_x + char_x_offset, title_y))
-                self.screen.blit(char_surf, char_rect)
+                layer.blit(char_surf, char_rect)
                 
                 char_x_offset += char_width
                 char_index += 1
@@ -2020,9 +3615,9 @@ class Game:
         sub_start_x = self.screen_width // 2 - sub_total_width // 2
         
         # Render subtitle shadow for entire text (properly aligned)
-        subtitle_shadow_surf = self.font_medium.render(subtitle_text, True, (0, 0, 0))
+        subtitle_shadow_surf = self.render_text(self.font_medium, subtitle_text, (0, 0, 0))
         subtitle_shadow_rect = subtitle_shadow_surf.get_rect(center=(self.screen_width // 2 + 3, subtitle_y + 3))
-        self.screen.blit(subtitle_shadow_surf, subtitle_shadow_rect)
+        layer.blit(subtitle_shadow_surf, subtitle_shadow_rect)
         
         # Render each word with colors
         sub_current_x = sub_start_x
@@ -2032,78 +3627,51 @@ class Game:
             word_color = (0, 150, 255) if word_idx == 0 else (255, 240, 0)
             
             # Render word shadow
-            word_shadow = self.font_medium.render(word, True, (0, 0, 0))
+            word_shadow = self.render_text(self.font_medium, word, (0, 0, 0))
             word_shadow_rect = word_shadow.get_rect(midleft=(sub_current_x + 3, subtitle_y + 3))
-            self.screen.blit(word_shadow, word_shadow_rect)
+            layer.blit(word_shadow, word_shadow_rect)
             
             # Render word with color
-            word_surf = self.font_medium.render(word, True, word_color)
+            word_surf = self.render_text(self.font_medium, word, word_color)
             word_rect = word_surf.get_rect(midleft=(sub_current_x, subtitle_y))
-            self.screen.blit(word_surf, word_rect)
+            layer.blit(word_surf, word_rect)
             
             sub_current_x += word_width + 20
         
         # Mario Kart styled START button with checkered pattern
-        button_x = self.screen_width // 2 - 120
-        button_y = self.screen_height // 2 + 30
-        button_width = 240
-        button_height = 70
-        
-        button_rect = pygame.Rect(button_x, button_y, button_width, button_height)
+        button_rect = self.get_start_button_rect()
+        button_x, button_y, button_width, button_height = button_rect
         
         # Button shadow
         shadow_rect = pygame.Rect(button_x + 5, button_y + 5, button_width, button_height)
-        pygame.draw.rect(self.screen, (0, 0, 0, 100), shadow_rect)
+        pygame.draw.rect(layer, (0, 0, 0, 100), shadow_rect)
         
         # Button background - solid black
-        pygame.draw.rect(self.screen, (0, 0, 0), button_rect)
+        pygame.draw.rect(layer, (0, 0, 0), button_rect)
         
         # Button border (thick, white for contrast)
-        pygame.draw.rect(self.screen, (255, 255, 255), button_rect, 5)
+        pygame.draw.rect(layer, (255, 255, 255), button_rect, 5)
         
         # Inner border (gray for subtle detail)
-        pygame.draw.rect(self.screen, (100, 100, 100), button_rect, 2)
+        pygame.draw.rect(layer, (100, 100, 100), button_rect, 2)
         
         # Button text "START" with strong shadow for visibility
         button_text = "START"
         button_center_x = button_rect.centerx
         button_center_y = button_rect.centery
         
-        # Render multiple shadow layers (properly aligned)
-        shadow_offsets = [(4, 4), (3, 3), (2, 2)]
-        for offset_x, offset_y in shadow_offsets:
-            button_text_shadow = self.font_medium.render(button_text, True, (0, 0, 0))
-            button_text_shadow_rect = button_text_shadow.get_rect(center=(button_center_x + offset_x, 
-                                                                         button_center_y + offset_y))
-            self.screen.blit(button_text_shadow, button_text_shadow_rect)
-        
-        # Main button text - bright white
-        button_text_surf = self.font_medium.render(button_text, True, (255, 255, 255))
-        button_text_rect = button_text_surf.get_rect(center=(button_center_x, button_center_y))
-        self.screen.blit(button_text_surf, button_text_rect)
-        
-        # Pulsing effect for button
-        pulse = int(math.sin(self.start_screen_timer * 0.1) * 5)
-        if pulse > 0:
-            highlight_rect = pygame.Rect(button_x - pulse, button_y - pulse, 
-                                       button_width + pulse * 2, button_height + pulse * 2)
-            pygame.draw.rect(self.screen, (255, 255, 0, 50), highlight_rect, 3)
-        
-        # Level dropdown - drawn AFTER start button so it appears on top when open
-        dropdown_y = self.screen_height // 2 - 20
-        self.draw_level_dropdown(dropdown_y)
+        # Bright white text over multiple shadow layers (properly aligned)
+        self.blit_shadowed_text(self.font_medium, button_text, (255, 255, 255), (0, 0, 0),
+                                ((4, 4), (3, 3), (2, 2)), surface=layer,
+                                center=(button_center_x, button_center_y))
         
         # Instructions section
-        inst_y = button_y + button_height + 40
+        inst_y = button_rect.bottom + 40
         
         # Main instruction
         inst_text_str = "Press SPACE or Click START to Play!"
-        inst_shadow = self.font_small.render(inst_text_str, True, (0, 0, 0))
-        inst_shadow_rect = inst_shadow.get_rect(center=(self.screen_width // 2 + 3, inst_y + 3))
-        self.screen.blit(inst_shadow, inst_shadow_rect)
-        inst_text = self.font_small.render(inst_text_str, True, (255, 255, 255))
-        inst_rect = inst_text.get_rect(center=(self.screen_width // 2, inst_y))
-        self.screen.blit(inst_text, inst_rect)
+        self.blit_shadowed_text(self.font_small, inst_text_str, (255, 255, 255), (0, 0, 0), ((3, 3),),
+                                surface=layer, center=(self.screen_width // 2, inst_y))
         
         # Game instructions panel
         instructions_y = inst_y + 50
@@ -2121,8 +3689,8 @@ class Game:
         panel_surface = pygame.Surface((440, panel_height))
         panel_surface.set_alpha(150)  # Reduced from 200 to 150 for more transparency
         panel_surface.fill((0, 0, 0))
-        self.screen.blit(panel_surface, (panel_rect.x, panel_rect.y))
-        pygame.draw.rect(self.screen, (255, 255, 255), panel_rect, 2)
+        layer.blit(panel_surface, (panel_rect.x, panel_rect.y))
+        pygame.draw.rect(layer, (255, 255, 255), panel_rect, 2)
         
         # Draw each instruction line
         for i, instruction in enumerate(instructions):
@@ -2132,49 +3700,15 @@ class Game:
                 line_font = self.font_small
             else:
                 line_color = (255, 255, 255)  # White for instructions
-                line_font = pygame.font.Font(None, 28)  # Slightly smaller font
-            
-            line_shadow = line_font.render(instruction, True, (0, 0, 0))
-            line_shadow_rect = line_shadow.get_rect(center=(self.screen_width // 2 + 2, line_y + 2))
-            self.screen.blit(line_shadow, line_shadow_rect)
+                line_font = self.font_tiny  # Slightly smaller font
             
-            line_text = line_font.render(instruction, True, line_color)
-            line_rect = line_text.get_rect(center=(self.screen_width // 2, line_y))
-            self.screen.blit(line_text, line_rect)
+            self.blit_shadowed_text(line_font, instruction, line_color, (0, 0, 0), ((2, 2),),
+                                    surface=layer, center=(self.screen_width // 2, line_y))
         
-        # High score with golden trophy style (moved down to make room for instructions)
-        if self.high_score > 0:
-            hs_y = panel_y + panel_height + 40  # Increased spacing below instructions panel
-            # Trophy icon (simple star)
-            star_points = []
-            star_size = 20
-            center_x, center_y = self.screen_width // 2 - 80, hs_y
-            for i in range(10):
-                angle = i * math.pi / 5
-                if i % 2 == 0:
-                    r = star_size
-                else:
-                    r = star_size // 2
-                x = center_x + r * math.cos(angle - math.pi / 2)
-                y = center_y + r * math.sin(angle - math.pi / 2)
-                star_points.append((x, y))
-            pygame.draw.polygon(self.screen, (255, 215, 0), star_points)
-            pygame.draw.polygon(self.screen, (255, 255, 255), star_points, 2)
-            
-            hs_text_str = f"Best Score: {self.high_score}"
-            
-            # Strong shadow for high score (properly aligned)
-            hs_shadow = self.font_small.render(hs_text_str, True, (0, 0, 0))
-            hs_shadow_rect = hs_shadow.get_rect(center=(self.screen_width // 2 + 3, hs_y + 3))
-            self.screen.blit(hs_shadow, hs_shadow_rect)
-            
-            # Bright golden yellow for better readability
-            hs_text = self.font_small.render(hs_text_str, True, (255, 240, 100))
-            hs_rect = hs_text.get_rect(center=(self.screen_width // 2, hs_y))
-            self.screen.blit(hs_text, hs_rect)
+        # High score sits below the instructions panel
+        self.start_instructions_bottom = panel_y + panel_height
         
-        # Draw volume controls
-        self.draw_volume_controls()
+        return layer
     
     def draw_game(self):
         """Draw game screen"""
@@ -2184,120 +3718,165 @@ class Game:
         else:
             self.screen.fill((135, 206, 235))  # Sky blue
         
-        # Draw walls
-        for wall in self.walls:
-            wall.draw(self.screen)
-        
-        # Draw enemies
-        for enemy in self.enemies:
-            enemy.draw(self.screen)
-        
-        # Draw coins
-        for coin in self.coins:
-            coin.draw(self.screen)
-        
-        # Draw fireball collectibles
-        for fireball_collectible in self.fireball_collectibles:
-            fireball_collectible.draw(self.screen)
+        entities = self.world_entities()
+        self.draw_world(entities, self.draw_offsets(entities))
         
-        # Draw fireball projectiles
-        for fireball in self.fireball_projectiles:
-            fireball.draw(self.screen)
+        self.draw_hud()
         
-        # Draw bird
-        self.bird.draw(self.screen)
+        # Draw volume controls
+        self.draw_volume_controls()
+    
+    def draw_game_dirty(self):
+        """Draw game screen, repainting only the areas that changed"""
+        entities = self.world_entities()
+        offsets = self.draw_offsets(entities)
+        # Controls that changed (e.g. a slider drag) get the background restored under them like moving entities
+        self.dirty_renderer.begin_frame([entity.get_draw_rect(offset) for entity, offset in zip(entities, offsets)] +
+                                        self.widgets.changed_rects())
+        
+        self.draw_world(entities, offsets)
+        
+        for rect in self.draw_hud():
+            self.dirty_renderer.add(rect)
+        
+        # Controls stay on screen between frames, only the ones that changed or were painted over are redrawn
+        for rect in self.widgets.draw(self.screen, self.dirty_renderer.painted_rects()):
+            self.dirty_renderer.add_static(rect)
+    
+    def draw_world(self, entities, offsets):
+        """Draw world entities, back to front"""
+        for entity, offset in zip(entities, offsets):
+            entity.draw(self.screen, offset)
+    
+    def draw_offsets(self, entities):
+        """Pixel offsets that draw each entity where it was self.lag steps ago (interpolation)"""
+        lag = self.lag
+        if not lag:
+            return [(0, 0)] * len(entities)
+        return [entity.draw_offset(lag) for entity in entities]
+    
+    def world_entities(self):
+        """Everything in the game world in draw order: walls, enemies, pickups, fireballs, bird"""
+        return (self.sim.walls + self.sim.enemies + self.sim.coins +
+                self.sim.fireball_collectibles + self.sim.fireball_projectiles + [self.sim.bird])
+    
+    def draw_hud(self):
+        """Draw score, coins, ammo and high score, returns the rects drawn"""
+        rects = []
         
-        # Draw score with black text for readability
-        score_text = self.font_medium.render(f"Score: {self.score}", True, (0, 0, 0))
-        # Add white shadow for contrast
-        score_shadow = self.font_medium.render(f"Score: {self.score}", True, (255, 255, 255))
-        self.screen.blit(score_shadow, (21, 21))
-        self.screen.blit(score_text, (20, 20))
+        # Draw score with black text and a white shadow for contrast
+        rects.append(self.blit_shadowed_text(self.font_medium, f"Score: {self.sim.score}",
+                                             (0, 0, 0), (255, 255, 255), ((1, 1),), topleft=(20, 20)))
         
         # Draw coins collected
-        coins_text = self.font_small.render(f"Coins: {self.coins_collected}", True, (0, 0, 0))
-        # Add white shadow for contrast
-        coins_shadow = self.font_small.render(f"Coins: {self.coins_collected}", True, (255, 255, 255))
-        self.screen.blit(coins_shadow, (21, 71))
-        self.screen.blit(coins_text, (20, 70))
+        rects.append(self.blit_shadowed_text(self.font_small, f"Coins: {self.sim.coins_collected}",
+                                             (0, 0, 0), (255, 255, 255), ((1, 1),), topleft=(20, 70)))
         
         # Draw fireball ammo count
-        if self.fireball_ammo > 0:
-            ammo_text = self.font_small.render(f"Fireballs: {self.fireball_ammo}", True, (0, 0, 0))
-            ammo_shadow = self.font_small.render(f"Fireballs: {self.fireball_ammo}", True, (255, 255, 255))
-            self.screen.blit(ammo_shadow, (21, 101))
-            self.screen.blit(ammo_text, (20, 100))
+        if self.sim.fireball_ammo > 0:
+            rects.append(self.blit_shadowed_text(self.font_small, f"Fireballs: {self.sim.fireball_ammo}",
+                                                 (0, 0, 0), (255, 255, 255), ((1, 1),), topleft=(20, 100)))
         
         # Draw high score with black text for readability (closer spacing)
-        hs_text = self.font_small.render(f"High Score: {self.high_score}", True, (0, 0, 0))
-        # Add white shadow for contrast
-        hs_shadow = self.font_small.render(f"High Score: {self.high_score}", True, (255, 255, 255))
-        hs_y_pos = 130 if self.fireball_ammo > 0 else 100
-        self.screen.blit(hs_shadow, (21, hs_y_pos + 1))
-        self.screen.blit(hs_text, (20, hs_y_pos))
+        hs_y_pos = 130 if self.sim.fireball_ammo > 0 else 100
+        rects.append(self.blit_shadowed_text(self.font_small, f"High Score: {self.high_score}",
+                                             (0, 0, 0), (255, 255, 255), ((1, 1),), topleft=(20, hs_y_pos)))
+        return rects
+    
+    def draw_fps_counter(self):
+        """Draw FPS and last frame's fill rate (share of the screen pushed to the display)"""
+        fill_percent = 100 * self.fill_pixels / (self.screen_width * self.screen_height)
+        counter_text = f"FPS: {self.clock.get_fps():.0f}  Fill: {fill_percent:.0f}%  ({self.render_mode})"
+        return self.blit_shadowed_text(self.font_tiny, counter_text, (255, 255, 255), (0, 0, 0), ((1, 1),),
+                                       bottomleft=(10, self.screen_height - 10))
+    
+    def draw_profiler_overlay(self):
+        """Draw rolling p50/p99 per frame phase in the top-right corner, returns its rect"""
+        # Re-render the numbers twice a second; blitting the cached panel is cheap
+        if self.profiler_overlay is None or self.profiler_overlay_frame >= 30:
+            rows = self.profiler.summary()
+            line_height = self.font_tiny.get_linesize()
+            panel = pygame.Surface((250, (len(rows) + 1) * line_height + 10), pygame.SRCALPHA)
+            panel.fill((0, 0, 0, 170))
+            columns = (("phase", 8), ("p50 ms", 130), ("p99 ms", 190))
+            for text, x in columns:
+                panel.blit(self.font_tiny.render(text, True, (255, 255, 0)), (x, 5))
+            for row_index, (name, p50, p99) in enumerate(rows, 1):
+                y = 5 + row_index * line_height
+                for text, (_, x) in zip((name, f"{p50:.2f}", f"{p99:.2f}"), columns):
+                    panel.blit(self.font_tiny.render(text, True, (255, 255, 255)), (x, y))
+            self.profiler_overlay = panel
+            self.profiler_overlay_frame = 0
+        self.profiler_overlay_frame += 1
+        return self.screen.blit(self.profiler_overlay, (self.screen_width - 265, 60))
+    
+    def draw_gameover_screen(self):
+        """Draw game over screen"""
+        # The backdrop and results only change once per game, only the controls are drawn per frame
+        if self.gameover_layer is None or self.gameover_layer.get_size() != self.screen.get_size():
+            self.gameover_layer = self.build_gameover_layer()
+        self.screen.blit(self.gameover_layer, (0, 0))
+        
+        # Level dropdown - drawn AFTER restart text so it appears on top when open
+        self.draw_level_dropdown()
         
         # Draw volume controls
         self.draw_volume_controls()
     
-    def draw_gameover_screen(self):
-        """Draw game over screen"""
-        # Semi-transparent overlay
+    def build_gameover_layer(self):
+        """Render the static game over screen: the final frame darkened, results and restart hint"""
+        # Redraw the final frame rather than copying the screen, which may show the FPS counter or profiler
+        self.draw_game()
+        layer = self.screen.copy()
+        
+        # Semi-transparent overlay, blended into the captured frame once
         overlay = pygame.Surface((self.screen_width, self.screen_height))
         overlay.set_alpha(180)
         overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
+        layer.blit(overlay, (0, 0))
         
         # Game Over text
-        gameover_text = self.font_large.render("GAME OVER", True, (255, 0, 0))
+        gameover_text = self.render_text(self.font_large, "GAME OVER", (255, 0, 0))
         gameover_rect = gameover_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2 - 100))
-        self.screen.blit(gameover_text, gameover_rect)
+        layer.blit(gameover_text, gameover_rect)
         
-        # Score with white text (visible on dark overlay)
-        score_text = self.font_medium.render(f"Score: {self.score}", True, (255, 255, 255))
-        score_rect = score_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2 - 40))
-        # Add black shadow for contrast
-        score_shadow = self.font_medium.render(f"Score: {self.score}", True, (0, 0, 0))
-        score_shadow_rect = score_shadow.get_rect(center=(self.screen_width // 2 + 2, self.screen_height // 2 - 38))
-        self.screen.blit(score_shadow, score_shadow_rect)
-        self.screen.blit(score_text, score_rect)
+        # Score with white text and black shadow (visible on dark overlay)
+        self.blit_shadowed_text(self.font_medium, f"Score: {self.sim.score}",
+                                (255, 255, 255), (0, 0, 0), ((2, 2),), surface=layer,
+                                center=(self.screen_width // 2, self.screen_height // 2 - 40))
         
         # Coins collected with gold text (visible on dark overlay)
-        coins_text = self.font_medium.render(f"Coins Collected: {self.coins_collected}", True, (255, 215, 0))
-        coins_rect = coins_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
-        # Add black shadow for contrast
-        coins_shadow = self.font_medium.render(f"Coins Collected: {self.coins_collected}", True, (0, 0, 0))
-        coins_shadow_rect = coins_shadow.get_rect(center=(self.screen_width // 2 + 2, self.screen_height // 2 + 2))
-        self.screen.blit(coins_shadow, coins_shadow_rect)
-        self.screen.blit(coins_text, coins_rect)
+        self.blit_shadowed_text(self.font_medium, f"Coins Collected: {self.sim.coins_collected}",
+                                (255, 215, 0), (0, 0, 0), ((2, 2),), surface=layer,
+                                center=(self.screen_width // 2, self.screen_height // 2))
         
         # High score with yellow text (visible on dark overlay)
-        hs_text = self.font_medium.render(f"High Score: {self.high_score}", True, (255, 255, 0))
-        hs_rect = hs_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2 + 40))
-        # Add black shadow for contrast
-        hs_shadow = self.font_medium.render(f"High Score: {self.high_score}", True, (0, 0, 0))
-        hs_shadow_rect = hs_shadow.get_rect(center=(self.screen_width // 2 + 2, self.screen_height // 2 + 42))
-        self.screen.blit(hs_shadow, hs_shadow_rect)
-        self.screen.blit(hs_text, hs_rect)
-        
-        # Restart instruction - drawn FIRST so dropdown appears on top (higher z-index)
-        restart_text = self.font_small.render("Press SPACE to Restart", True, (255, 255, 255))
+        self.blit_shadowed_text(self.font_medium, f"High Score: {self.high_score}",
+                                (255, 255, 0), (0, 0, 0), ((2, 2),), surface=layer,
+                                center=(self.screen_width // 2, self.screen_height // 2 + 40))
+        
+        # Restart instruction - part of the layer so the dropdown always appears on top (higher z-index)
+        restart_text = self.render_text(self.font_small, "Press SPACE to Restart", (255, 255, 255))
         # Position restart text further down to avoid overlap with open dropdown
         # Dropdown when open: button (40px) + 3 options (35px each = 105px) = 145px total
         # Dropdown ends at: dropdown_y (85) + 145 = 230px from center
         # Add gap of 25px for better spacing, so restart at: 230 + 25 = 255px from center
         restart_rect = restart_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2 + 255))
-        self.screen.blit(restart_text, restart_rect)
-        
-        # Level dropdown - drawn AFTER restart text so it appears on top when open
-        # Positioned with proper spacing above restart text (accounting for dropdown height when open)
-        dropdown_y = self.screen_height // 2 + 85
-        self.draw_level_dropdown(dropdown_y)
-        
-        # Draw volume controls
-        self.draw_volume_controls()
+        layer.blit(restart_text, restart_rect)
+        return layer
     
     def draw(self):
         """Draw current screen based on game state"""
+        self.update_widgets()
+        if self.state == "playing" and self.dirty_renderer:
+            self.draw_game_dirty()
+            if self.show_fps:
+                self.dirty_renderer.add(self.draw_fps_counter())
+            if self.profiler.enabled:
+                self.dirty_renderer.add(self.draw_profiler_overlay())
+            self.fill_pixels = self.present()
+            return
+        
         if self.state == "start":
             self.draw_start_screen()
         elif self.state == "playing":
@@ -2305,23 +3884,90 @@ class Game:
         elif self.state == "gameover":
             self.draw_gameover_screen()
         
+        if self.show_fps:
+            self.draw_fps_counter()
+        if self.profiler.enabled:
+            self.draw_profiler_overlay()
+        
+        self.fill_pixels = self.present()
+    
+    def present(self):
+        """Push the frame to the display, returns the pixel count updated"""
+        if self.state == "playing" and self.dirty_renderer:
+            return self.dirty_renderer.end_frame()
         pygame.display.flip()
+        return self.screen_width * self.screen_height
     
-    def run(self):
-        """Main game loop"""
-        running = True
-        while running:
-            running = self.handle_events()
-            self.update()
-            # Update animation timer for start screen
-            if self.state == "start":
-                self.start_screen_timer += 1
-            self.draw()
-            self.clock.tick(60)  # 60 FPS
+    def run(self, measure_startup=False, pacing_report=False):
+        """Main game loop; measure_startup prints the startup breakdown after the first frame and exits,
+        pacing_report prints frame pacing statistics when the game closes"""
+        running = not self.quit_requested
+        step_time = 1 / SIM_RATE
+        accumulator = 0.0  # Real time not yet simulated
+        previous = time.perf_counter()
+        try:
+            while running:
+                self.profiler.begin_frame()
+                running = self.handle_events()
+                
+                # Fixed timestep: run as many steps as the real time since the last frame covers
+                now = time.perf_counter()
+                accumulator += now - previous
+                previous = now
+                steps = 0
+                while accumulator >= step_time and steps < MAX_STEPS_PER_FRAME:
+                    self.update()
+                    # Update animation timer for start screen
+                    if self.state == "start":
+                        self.start_screen_timer += 1
+                    accumulator -= step_time
+                    steps += 1
+                dropped = 0.0
+                if accumulator >= step_time:
+                    # Too far behind (a stall, a dragged window): slow down rather than
+                    # fall further behind trying to catch up
+                    dropped = accumulator - accumulator % step_time
+                    accumulator -= dropped
+                # Draw the world between the last two steps so motion stays smooth
+                self.lag = 1 - accumulator / step_time if self.state == "playing" else 0.0
+                
+                self.draw()
+                self.profiler.end_frame()
+                self.pacing.frame(time.perf_counter(), steps, dropped)
+                if measure_startup:
+                    self.startup.mark("first frame (start screen)")
+                    print(self.startup.report())
+                    running = False
+                self.clock.tick(self.max_fps)
+        finally:
+            # Write settings still waiting on the writer thread, even after a crash or Ctrl+C
+            self.settings_writer.close()
+            self.sim.close()
+        
+        # Keep the session's frame timings if the profiler was used
+        if self.profiler.frames and self.profile_export:
+            try:
+                self.profiler.export(self.profile_export)
+            except:
+                pass
+        
+        if pacing_report:
+            print(self.pacing.report())
         
         pygame.quit()
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Flappy Bird - Mario Kart Edition")
+    parser.add_argument('--measure-startup', action='store_true',
+                        help="Print a breakdown of the time to first frame and exit")
+    parser.add_argument('--pacing-report', action='store_true',
+                        help="Print frame time and jitter statistics when the game closes")
+    return parser.parse_args(argv)
+
+IMPORT_FINISHED = time.perf_counter()
+
 if __name__ == "__main__":
+    args = parse_args()
     game = Game()
-    game.run()
+    game.run(measure_startup=args.measure_startup, pacing_report=args.pacing_report)
 
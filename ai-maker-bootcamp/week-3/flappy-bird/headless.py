@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Flappy Bird - Mario Kart Edition
+Headless runner: steps the game world without a window or audio
+"""
+
+import os
+import sys
+import argparse
+import time
+
+# Use SDL's dummy drivers so no window or audio device is needed
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from game import make_simulation, load_config, InputRecorder, play_replay
+
+
+def heuristic_agent(sim):
+    """Simple scripted player: aim for the middle of the next gap"""
+    bird = sim.bird
+    target_y = sim.screen_height // 2
+    upcoming = [wall for wall in sim.walls if wall.x + wall.wall_width > bird.x - bird.size // 2]
+    if upcoming:
+        next_wall = min(upcoming, key=lambda w: w.x)
+        gap_top, gap_bottom = next_wall.get_gap_area()
+        target_y = (gap_top + gap_bottom) / 2
+
+    flap = bird.y > target_y + 15 and bird.velocity >= 0
+    shoot = sim.fireball_ammo > 0 and sim.frame % 25 == 0
+    return flap, shoot
+
+
+def play(sim, level_index, max_frames, agent=heuristic_agent, seed=None):
+    """Play one run until the bird dies or max_frames is reached"""
+    sim.reset(level_index, seed)
+    while sim.alive and sim.frame < max_frames:
+        flap, shoot = agent(sim)
+        if shoot:
+            sim.shoot_fireball()
+        elif flap:
+            sim.flap()
+        sim.step()
+    return sim.frame, sim.score
+
+
+def replay(sim, paths):
+    """Replay recorded runs and check they end the same way, returns True if all match"""
+    all_match = True
+    for path in paths:
+        start_time = time.perf_counter()
+        recorded, replayed = play_replay(sim, path)
+        elapsed = time.perf_counter() - start_time
+        match = recorded == replayed
+        all_match = all_match and match
+        print(f"{'OK      ' if match else 'MISMATCH'} {os.path.basename(path)}: "
+              f"recorded {recorded}, replayed {replayed} "
+              f"({replayed['frames'] / elapsed:.0f} frames/sec)")
+    return all_match
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the game headlessly with a scripted player")
+    parser.add_argument('--level', type=int, default=1, help="Level number from config.json (1 = Easy)")
+    parser.add_argument('--runs', type=int, default=10, help="Number of runs to play")
+    parser.add_argument('--max-frames', type=int, default=10000, help="Frame limit per run")
+    parser.add_argument('--entity-store', choices=['objects', 'numpy'],
+                        help="Override config.json's entity_store (numpy needs NumPy installed)")
+    parser.add_argument('--seed', type=int, help="Seed of the first run (run i uses seed + i)")
+    parser.add_argument('--record', metavar='DIR', help="Record every finished run to DIR")
+    parser.add_argument('--replay', metavar='FILE', nargs='+',
+                        help="Replay recorded runs instead of playing, exits 1 if any diverge")
+    args = parser.parse_args()
+
+    config = load_config()
+    if args.entity_store:
+        config['entity_store'] = args.entity_store
+    level_count = len(config['levels'])
+    if not 1 <= args.level <= level_count:
+        parser.error(f"argument --level: no level {args.level} in config.json (levels 1-{level_count})")
+    level_index = args.level - 1
+    sim = make_simulation(config)
+    if args.replay:
+        sys.exit(0 if replay(sim, args.replay) else 1)
+    if args.record:
+        sim.add_observer(InputRecorder(sim, args.record))
+
+    total_frames = 0
+    scores = []
+    start_time = time.perf_counter()
+    for run in range(args.runs):
+        seed = None if args.seed is None else args.seed + run
+        frames, score = play(sim, level_index, args.max_frames, seed=seed)
+        total_frames += frames
+        scores.append(score)
+    elapsed = time.perf_counter() - start_time
+
+    level_name = config['levels'][level_index]['name']
+    print(f"Level: {level_name} ({type(sim).__name__})")
+    print(f"Runs: {args.runs}, frames: {total_frames}")
+    print(f"Scores: min {min(scores)}, avg {sum(scores) / len(scores):.1f}, max {max(scores)}")
+    print(f"Speed: {total_frames / elapsed:.0f} frames/sec")
+
+
+if __name__ == "__main__":
+    main()
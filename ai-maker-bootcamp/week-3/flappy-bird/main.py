@@ -4,12 +4,13 @@ Flappy Bird - Mario Kart Edition
 Main entry point for the game
 """
 
-from game import Game
+from game import Game, parse_args
 
 if __name__ == "__main__":
     try:
+        args = parse_args()
         game = Game()
-        game.run()
+        game.run(measure_startup=args.measure_startup, pacing_report=args.pacing_report)
     except KeyboardInterrupt:
         print("\nGame interrupted by user.")
     except Exception as e:
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Config validation: malformed config.json files are reported as ConfigError
+(never a raw exception), and configs that would crash the simulation later
+are rejected up front
+
+Usage: python -m unittest discover tests
+"""
+
+import os
+import sys
+import copy
+import json
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+
+from game import validate_config, ConfigError
+
+with open(os.path.join(GAME_DIR, 'config.json')) as f:
+    CONFIG = json.load(f)
+
+
+def config_with(**changes):
+    """Copy of config.json with top-level keys replaced"""
+    config = copy.deepcopy(CONFIG)
+    config.update(changes)
+    return config
+
+
+def config_with_level(**changes):
+    """Copy of config.json with keys of the first level replaced"""
+    config = copy.deepcopy(CONFIG)
+    config['levels'][0].update(changes)
+    return config
+
+
+class ValidateConfigTest(unittest.TestCase):
+    def assertInvalid(self, config, message):
+        with self.assertRaises(ConfigError) as context:
+            validate_config(config)
+        self.assertIn(message, str(context.exception))
+    
+    def test_shipped_config_is_valid(self):
+        validate_config(copy.deepcopy(CONFIG))
+    
+    def test_config_must_be_an_object(self):
+        self.assertInvalid([CONFIG], "config: expected an object")
+    
+    def test_spawning_must_be_an_object(self):
+        self.assertInvalid(config_with(spawning=5), "spawning: expected an object")
+        self.assertInvalid(config_with(spawning=[]), "spawning: expected an object")
+    
+    def test_wrong_type_skips_cross_field_checks(self):
+        self.assertInvalid(config_with(spawning={'coin_cluster_min': "3"}), "spawning.coin_cluster_min: wrong type")
+        self.assertInvalid(config_with_level(coin_cluster_min="3"), "levels[0].coin_cluster_min: wrong type")
+    
+    def test_cluster_min_above_max(self):
+        self.assertInvalid(config_with(spawning={'coin_cluster_min': 6, 'coin_cluster_max': 5}),
+                           "coin_cluster_min is larger than coin_cluster_max")
+    
+    def test_gap_clearance_steps_are_whole_numbers(self):
+        for clearance in ([["a", 1], [0, 1]], [[250, "x"], [0, 1]], [[250, 1.5], [0, 1]], [[250]], []):
+            with self.subTest(clearance=clearance):
+                self.assertInvalid(config_with(spawning={'gap_clearance': clearance}), "spawning.gap_clearance")
+    
+    def test_gap_clearance_largest_gap_first(self):
+        self.assertInvalid(config_with(spawning={'gap_clearance': [[0, 15], [250, 25]]}), "spawning.gap_clearance")
+    
+    def test_wall_gap_must_fit_the_screen(self):
+        self.assertInvalid(config_with_level(wall_gap_size=500), "levels[0]: wall gaps of 500px")
+    
+    def test_zero_speeds(self):
+        self.assertInvalid(config_with_level(wall_speed=0), "levels[0].wall_speed: must be greater than 0")
+        self.assertInvalid(config_with_level(enemy_speed=0), "levels[0].enemy_speed: must be greater than 0")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Flappy Bird - Mario Kart Edition
+Level tuning runner: plays many seeded headless games per parameter set
+across a pool of worker processes and reports survival and score spreads
+"""
+
+import os
+import argparse
+import itertools
+import json
+import multiprocessing
+import time
+
+# Use SDL's dummy drivers so no window or audio device is needed
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from game import make_simulation, load_config, validate_config, percentile, LEVEL_SCHEMA, SPAWN_DEFAULTS
+from headless import play
+
+FPS = 60  # Frames per second of game time, for survival times
+CHUNK_SIZE = 25  # Games per task: big enough to hide pool overhead, small enough to balance
+
+
+def parse_sweep(assignments):
+    """["gravity=0.5,0.6", "wall_gap_size=220"] -> list of override dicts (cartesian product)"""
+    names = []
+    choices = []
+    for assignment in assignments:
+        name, _, values = assignment.partition('=')
+        if not values:
+            raise ValueError(f"expected NAME=VALUE[,VALUE...], got {assignment!r}")
+        if name not in LEVEL_SCHEMA and name not in SPAWN_DEFAULTS:
+            raise ValueError(f"unknown level parameter {name!r}")
+        try:
+            choices.append([json.loads(value) for value in values.split(',')])
+        except json.JSONDecodeError:
+            raise ValueError(f"{name}: values must be JSON (e.g. 0.5), got {values!r}")
+        names.append(name)
+    return [dict(zip(names, combination)) for combination in itertools.product(*choices)]
+
+
+def play_chunk(task):
+    """Worker: play a chunk of seeded games with one set of level overrides"""
+    config, level_index, overrides, seeds, max_frames = task
+    config['levels'][level_index] = dict(config['levels'][level_index], **overrides)
+    sim = make_simulation(config)
+    return [play(sim, level_index, max_frames, seed=seed) for seed in seeds]
+
+
+def summarize(results, max_frames):
+    """Survival time (seconds) and score percentiles for one batch of (frames, score)"""
+    survival = [frames / FPS for frames, _ in results]
+    scores = [score for _, score in results]
+    return {
+        'runs': len(results),
+        'survival_s': {'p10': percentile(survival, 0.1), 'p50': percentile(survival, 0.5),
+                       'p90': percentile(survival, 0.9), 'mean': sum(survival) / len(survival)},
+        'score': {'p50': percentile(scores, 0.5), 'p90': percentile(scores, 0.9),
+                  'p99': percentile(scores, 0.99), 'max': max(scores)},
+        'timeouts': sum(1 for frames, _ in results if frames >= max_frames),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep level parameters over many headless games")
+    parser.add_argument('--levels', type=int, nargs='+',
+                        help="Level numbers from config.json (default: all)")
+    parser.add_argument('--set', dest='sweep', metavar='NAME=VALUES', action='append', default=[],
+                        help="Level parameter to sweep, e.g. --set gravity=0.5,0.6 (repeatable)")
+    parser.add_argument('--runs', type=int, default=200, help="Games per level and parameter set")
+    parser.add_argument('--max-frames', type=int, default=20000, help="Frame limit per game")
+    parser.add_argument('--seed', type=int, default=1,
+                        help="Seed of the first game; every parameter set plays the same seeds")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument('--entity-store', choices=['objects', 'numpy'],
+                        help="Override config.json's entity_store")
+    parser.add_argument('--output', help="Also write the summaries to this JSON file")
+    args = parser.parse_args()
+
+    config = load_config()
+    if args.entity_store:
+        config['entity_store'] = args.entity_store
+    config['replay_dir'] = None
+    level_count = len(config['levels'])
+    for level in args.levels or []:
+        if not 1 <= level <= level_count:
+            parser.error(f"argument --levels: no level {level} in config.json (levels 1-{level_count})")
+    level_indices = [level - 1 for level in args.levels] if args.levels else range(level_count)
+    try:
+        parameter_sets = parse_sweep(args.sweep)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Every (level, parameter set) batch is split into chunks of seeds
+    batches = [(level_index, overrides) for level_index in level_indices for overrides in parameter_sets]
+    for level_index, overrides in batches:  # Catch bad values before starting the workers
+        try:
+            validate_config(dict(config, levels=[dict(config['levels'][level_index], **overrides)]))
+        except ValueError as e:  # ConfigError
+            parser.error(str(e))
+    tasks = []
+    for batch, (level_index, overrides) in enumerate(batches):
+        for first in range(0, args.runs, CHUNK_SIZE):
+            seeds = range(args.seed + first, args.seed + min(args.runs, first + CHUNK_SIZE))
+            tasks.append((batch, (config, level_index, overrides, seeds, args.max_frames)))
+
+    start_time = time.perf_counter()
+    results = [[] for _ in batches]
+    # Workers are closed and joined rather than terminated: a worker killed
+    # with SIGTERM can hang in pygame's shutdown handler
+    pool = multiprocessing.Pool(args.jobs)
+    try:
+        # map keeps task order, so each batch gets its games in seed order
+        for (batch, _), chunk in zip(tasks, pool.map(play_chunk, [task for _, task in tasks], chunksize=1)):
+            results[batch].extend(chunk)
+    finally:
+        pool.close()
+        pool.join()
+    elapsed = time.perf_counter() - start_time
+
+    summaries = []
+    print(f"{'Level':8} {'Parameters':32} {'Survival s p10/p50/p90':>23} {'Score p50/p90/p99':>18} "
+          f"{'max':>5} {'timeouts':>8}")
+    for (level_index, overrides), batch_results in zip(batches, results):
+        summary = summarize(batch_results, args.max_frames)
+        summary.update(level=config['levels'][level_index]['name'], parameters=overrides)
+        summaries.append(summary)
+        survival, score = summary['survival_s'], summary['score']
+        parameters = ', '.join(f"{name}={value}" for name, value in overrides.items()) or "(config.json)"
+        print(f"{summary['level']:8} {parameters:32} "
+              f"{survival['p10']:7.1f}/{survival['p50']:7.1f}/{survival['p90']:7.1f} "
+              f"{score['p50']:6}/{score['p90']:5}/{score['p99']:5} {score['max']:5} {summary['timeouts']:8}")
+
+    total_frames = sum(frames for batch_results in results for frames, _ in batch_results)
+    print(f"{len(batches) * args.runs} games, {total_frames} frames in {elapsed:.1f} s "
+          f"({total_frames / elapsed:.0f} frames/sec on {args.jobs} workers)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'runs': args.runs, 'max_frames': args.max_frames, 'seed': args.seed,
+                       'summaries': summaries}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()